@@ -0,0 +1,3 @@
+"""
+Benchmarks
+""" 
\ No newline at end of file
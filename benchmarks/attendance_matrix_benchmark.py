@@ -0,0 +1,81 @@
+"""
+Attendance matrix benchmark
+
+Seeds a temporary database with a year of attendance marks (present on
+about nine working days in ten, absent otherwise), loads it into the
+employees x days bitset and times each vectorized statistic.
+
+    python -m benchmarks.attendance_matrix_benchmark --employees 50000 --days 365
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from src.database.database import Database
+from src.database.attendance_matrix import (load_attendance_matrix, attendance_rates,
+                                            attendance_trend, department_rollup,
+                                            longest_absence_streaks)
+from benchmarks.ingest_benchmark import seed_employees
+
+
+def seed_attendance(db_path: str, employees: int, start: date, days: int) -> int:
+    db = Database(db_path)
+    rng = random.Random(0)
+    # Seeding is not a change to replicate
+    db.set_change_capture(False)
+    rows = ((employee_id, start + timedelta(days=offset), rng.random() < 0.9)
+            for offset in range(days)
+            if (start + timedelta(days=offset)).weekday() < 5
+            for employee_id in range(1, employees + 1))
+    db.cursor.executemany('''
+        INSERT INTO attendance (employee_id, date, present) VALUES (?, ?, ?)
+    ''', rows)
+    count = db.cursor.rowcount
+    db.set_change_capture(True)
+    db.conn.commit()
+    db.close()
+    return count
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--employees', type=int, default=50000)
+    parser.add_argument('--days', type=int, default=365)
+    args = parser.parse_args()
+
+    end = date.today()
+    start = end - timedelta(days=args.days - 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        seed_employees(db_path, args.employees)
+        count = seed_attendance(db_path, args.employees, start, args.days)
+
+        db = Database(db_path, readonly=True)
+        matrix, load_ms = timed(load_attendance_matrix, db, start, end)
+        db.close()
+
+    _, rates_ms = timed(attendance_rates, matrix)
+    _, streaks_ms = timed(longest_absence_streaks, matrix)
+    _, rollup_ms = timed(department_rollup, matrix)
+    trend, trend_ms = timed(attendance_trend, matrix)
+
+    print(f'attendance rows:    {count:,}')
+    print(f'matrix size:        {matrix.nbytes / 1024 / 1024:.1f} MiB')
+    print(f'load matrix:        {load_ms:.0f} ms')
+    print(f'per-employee rates: {rates_ms:.1f} ms')
+    print(f'absence streaks:    {streaks_ms:.1f} ms')
+    print(f'department rollup:  {rollup_ms:.1f} ms')
+    print(f'trend line:         {trend_ms:.1f} ms ({trend.slope:+.3f} pts/day)')
+
+
+if __name__ == '__main__':
+    main()
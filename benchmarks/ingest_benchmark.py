@@ -0,0 +1,73 @@
+"""
+Badge check-in ingestion benchmark
+
+Simulates a shift change: several kiosks submit bursts of check-ins (with
+repeated scans) against a temporary database and the sustained events per
+second and p50/p99 ingest latency are reported.
+
+    python -m benchmarks.ingest_benchmark --employees 20000 --events 200000
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from src.database.database import Database
+from src.database.ingest import AttendanceIngestor
+
+
+def seed_employees(db_path: str, count: int):
+    db = Database(db_path)
+    db.cursor.executemany('''
+        INSERT INTO employees (name, gender, email, department)
+        VALUES (?, ?, ?, ?)
+    ''', ((f'Employee {i}', ('Male', 'Female')[i % 2], f'employee{i}@example.com',
+           ('HR', 'Finance', 'IT', 'Marketing', 'Operations')[i % 5])
+          for i in range(count)))
+    db.conn.commit()
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--employees', type=int, default=20000)
+    parser.add_argument('--events', type=int, default=200000)
+    parser.add_argument('--kiosks', type=int, default=8)
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        seed_employees(db_path, args.employees)
+
+        ingestor = AttendanceIngestor(db_path, batch_size=args.batch_size)
+        ingestor.start()
+
+        def kiosk(seed):
+            rng = random.Random(seed)
+            for _ in range(args.events // args.kiosks):
+                ingestor.submit(rng.randint(1, args.employees))
+
+        kiosks = [threading.Thread(target=kiosk, args=(i,)) for i in range(args.kiosks)]
+        started = time.perf_counter()
+        for thread in kiosks:
+            thread.start()
+        for thread in kiosks:
+            thread.join()
+        ingestor.stop()
+        elapsed = time.perf_counter() - started
+
+    stats = ingestor.stats()
+    print(f"events submitted:   {stats['submitted']}")
+    print(f"duplicates dropped: {stats['duplicates']}")
+    print(f"rows written:       {stats['written']} in {stats['batches']} batches")
+    print(f"throughput:         {stats['submitted'] / elapsed:,.0f} events/s")
+    print(f"written rows:       {stats['written'] / elapsed:,.0f} rows/s")
+    print(f"p50 ingest latency: {stats['p50_ms']:.2f} ms")
+    print(f"p99 ingest latency: {stats['p99_ms']:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
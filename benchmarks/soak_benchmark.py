@@ -0,0 +1,138 @@
+"""
+Memory soak test
+
+Opens the main window offscreen on a seeded temporary database and fires
+the 5-second refresh timers as if the application had run for hours, with
+attendance being marked elsewhere once a simulated minute. RSS, the Python
+heap and QObject counts per tab are sampled every five simulated minutes.
+Exits with status 1 unless all of them stay within budget after warm-up
+and none is still growing at the end.
+
+    python -m benchmarks.soak_benchmark --hours 8 --employees 200
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QEvent
+
+from src.database.database import Database
+from src.main import EmployeeManagementSystem
+from src.ui.dashboard_tab import DashboardTab
+from src.ui.diagnostics import count_qobjects
+from src.utils.memory import MemoryTracker
+from benchmarks.ingest_benchmark import seed_employees
+
+# Simulated seconds per refresh tick, as in the application
+TICK_SECONDS = 5
+
+# Ticks between memory samples and between attendance changes
+SAMPLE_TICKS = 60
+CHANGE_TICKS = 12
+
+# Simulated hours before the post-warm-up baseline is taken
+WARMUP_HOURS = 0.5
+
+# QObjects a tab may gain after warm-up, e.g. a worker thread still running
+OBJECT_SLACK = 10
+
+MIB = 1024 * 1024
+
+
+def run_tick(app: QApplication, window: EmployeeManagementSystem, dashboard: DashboardTab):
+    window.timer.timeout.emit()
+    dashboard.timer.timeout.emit()
+    # deleteLater() takes effect here, as it would in the running event loop
+    app.sendPostedEvents(None, QEvent.DeferredDelete)
+    app.processEvents()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--hours', type=float, default=4)
+    parser.add_argument('--employees', type=int, default=200)
+    parser.add_argument('--rss-budget', type=float, default=20, help='MiB after warm-up')
+    parser.add_argument('--heap-budget', type=float, default=2, help='MiB after warm-up')
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'soak.db')
+        seed_employees(db_path, args.employees)
+        writer = Database(db_path)
+
+        window = EmployeeManagementSystem(db_path)
+        dashboard = window.pages[DashboardTab]
+        # Ticks are driven by hand; idle maintenance is left out of the picture
+        for timer in (window.timer, dashboard.timer, window.maintenance.timer):
+            timer.stop()
+        pages = {page_class.__name__: page for page_class, page in window.pages.items()}
+
+        tracker = MemoryTracker()
+        ticks = int(args.hours * 3600 / TICK_SECONDS)
+        warmup_ticks = int(WARMUP_HOURS * 3600 / TICK_SECONDS)
+        baseline = None
+        peaks = {}
+        started = time.perf_counter()
+        print(f"{'hour':>5} {'rss MiB':>8} {'heap MiB':>9}  " +
+              '  '.join(f'{name:>13}' for name in pages))
+        for tick in range(1, ticks + 1):
+            if tick % CHANGE_TICKS == 0:
+                writer.mark_attendance(rng.randint(1, args.employees), date.today(),
+                                       rng.random() < 0.8)
+            run_tick(app, window, dashboard)
+            if tick % SAMPLE_TICKS:
+                continue
+
+            sample = tracker.sample({name: count_qobjects(page)
+                                     for name, page in pages.items()})
+            values = {'rss': sample.rss, 'heap': sample.heap, **sample.objects}
+            if baseline is None:
+                if tick >= warmup_ticks:
+                    baseline = values
+            else:
+                # Largest rise over the post-warm-up baseline, per series
+                for name, value in values.items():
+                    peaks[name] = max(peaks.get(name, 0), value - baseline[name])
+            if tick % (SAMPLE_TICKS * 12) == 0:
+                print(f'{tick * TICK_SECONDS / 3600:5.1f} {sample.rss / MIB:8.1f} '
+                      f'{sample.heap / MIB:9.2f}  ' +
+                      '  '.join(f'{count:>13,}' for count in sample.objects.values()))
+
+        elapsed = time.perf_counter() - started
+        growing = tracker.growing()
+        top = tracker.top_allocations(5)
+        tracker.close()
+        window.close()
+        writer.close()
+        window.db.close()
+
+    print(f'{ticks:,} ticks in {elapsed:.1f} s ({elapsed / ticks * 1000:.1f} ms per tick)')
+    failures = []
+    if peaks.get('rss', 0) > args.rss_budget * MIB:
+        failures.append(f"RSS grew {peaks['rss'] / MIB:.1f} MiB after warm-up")
+    if peaks.get('heap', 0) > args.heap_budget * MIB:
+        failures.append(f"Python heap grew {peaks['heap'] / MIB:.2f} MiB after warm-up")
+    for name in pages:
+        if peaks.get(name, 0) > OBJECT_SLACK:
+            failures.append(f'{name} gained {peaks[name]:,} QObjects after warm-up')
+    if growing:
+        failures.append('still growing: ' + ', '.join(sorted(growing)))
+    if failures:
+        print('FAILED: ' + '; '.join(failures))
+        for line in top:
+            print(f'  {line}')
+        sys.exit(1)
+    print('memory stayed bounded')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Multi-site synchronization benchmark
+
+Seeds one site with employees and a month of attendance, brings a second,
+empty site up to date, then lets both sites change a few rows at a time
+and exchanges the deltas. Export and apply times and delta sizes should
+follow the number of changes rather than the database size; at the end
+both files must hold the same rows.
+
+    python -m benchmarks.sync_benchmark --employees 10000 --changes 1000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from src.database.database import Database
+from src.database.sync import Synchronizer, read_delta, write_delta
+from benchmarks.ingest_benchmark import seed_employees
+
+
+def seed_attendance(db_path: str, employees: int, days: int):
+    db = Database(db_path)
+    start = date.today() - timedelta(days=days)
+    db.cursor.executemany('''
+        INSERT INTO attendance (employee_id, date, present) VALUES (?, ?, ?)
+    ''', ((employee_id, start + timedelta(days=offset), (employee_id + offset) % 4 != 0)
+          for offset in range(days) for employee_id in range(1, employees + 1)))
+    db.conn.commit()
+    db.close()
+
+
+def make_changes(db: Database, rng: random.Random, count: int, tag: str):
+    """Rename, mark attendance for and add employees, a third each"""
+    db.cursor.execute('SELECT id FROM employees')
+    ids = [row[0] for row in db.cursor.fetchall()]
+    for i in range(count // 3):
+        db.cursor.execute('UPDATE employees SET name = ? WHERE id = ?',
+                          (f'Employee {tag}{i}', rng.choice(ids)))
+    db.conn.commit()
+    db.mark_attendance_bulk(date.today(), {rng.choice(ids): rng.random() < 0.5
+                                           for _ in range(count // 3)})
+    db.add_employees([(f'New {tag}{i}', 'Female', f'new.{tag}{i}@example.com', 'IT')
+                      for i in range(count - 2 * (count // 3))])
+
+
+def transfer(source: Database, target: Database, path: str):
+    """Export the changes target lacks to a file and apply it; returns timings"""
+    sender, receiver = Synchronizer(source), Synchronizer(target)
+    started = time.perf_counter()
+    delta = sender.export_changes(receiver.peer_seq(sender.site_id), receiver.site_id)
+    write_delta(delta, path)
+    exported = time.perf_counter()
+    result = receiver.apply_changes(read_delta(path))
+    applied = time.perf_counter()
+    changes = sum(len(section['changes']) for section in delta['tables'].values())
+    return changes, os.path.getsize(path), exported - started, applied - exported, result
+
+
+def snapshot(db: Database):
+    """Rows of both sites in an id-independent form"""
+    db.cursor.execute('SELECT id, name, gender, email, department FROM employees')
+    employees = {row[0]: row[1:] for row in db.cursor.fetchall()}
+    db.cursor.execute('SELECT employee_id, date + 0, present FROM attendance')
+    attendance = sorted((employees[employee_id][2], day, present)
+                        for employee_id, day, present in db.cursor.fetchall())
+    return sorted(employees.values()), attendance
+
+
+def report(label: str, changes: int, size: int, export_s: float, apply_s: float, result):
+    print(f'{label:<22} {changes:>9,} changes {size / 1024:>9,.0f} KiB  '
+          f'export {export_s * 1000:>7.0f} ms  apply {apply_s * 1000:>7.0f} ms  '
+          f'({result.applied} applied, {result.merged} merged, {result.stale} stale)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--employees', type=int, default=10000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--changes', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path_a = os.path.join(tmp, 'site_a.db')
+        path_b = os.path.join(tmp, 'site_b.db')
+        delta_path = os.path.join(tmp, 'delta.json.gz')
+        seed_employees(path_a, args.employees)
+        seed_attendance(path_a, args.employees, args.days)
+        a, b = Database(path_a), Database(path_b)
+
+        report('initial A -> B', *transfer(a, b, delta_path))
+        for round_ in range(1, args.rounds + 1):
+            make_changes(a, rng, args.changes, f'a{round_}.')
+            make_changes(b, rng, args.changes, f'b{round_}.')
+            report(f'round {round_} A -> B', *transfer(a, b, delta_path))
+            report(f'round {round_} B -> A', *transfer(b, a, delta_path))
+
+        converged = snapshot(a) == snapshot(b)
+        a.close()
+        b.close()
+    print(f'sites converged:       {converged}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Widget styling benchmark
+
+Builds the same set of widgets twice - once styled the old way, with a
+stylesheet on every widget, and once through the application theme - and
+reports construction plus polish time for each.
+
+    python -m benchmarks.theme_benchmark --rows 2000
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QPushButton,
+                             QLineEdit, QCheckBox, QTableWidget)
+
+from src.utils.theme import install_theme, set_role
+
+# Per-widget stylesheets as they were set before the theme existed
+LEGACY_BUTTON_STYLE = """
+    QPushButton {
+        background-color: #3498db;
+        color: white;
+        border: none;
+        padding: 10px 20px;
+        font-size: 14px;
+        border-radius: 5px;
+        min-height: 40px;
+    }
+    QPushButton:hover {
+        background-color: #2980b9;
+    }
+    QPushButton:pressed {
+        background-color: #2472a4;
+    }
+"""
+
+LEGACY_INPUT_STYLE = """
+    QLineEdit, QComboBox {
+        padding: 10px;
+        font-size: 14px;
+        border: 1px solid #bdc3c7;
+        border-radius: 5px;
+        min-height: 40px;
+    }
+    QLineEdit:focus, QComboBox:focus {
+        border: 2px solid #3498db;
+    }
+"""
+
+LEGACY_CHECKBOX_STYLE = """
+    QCheckBox {
+        font-size: 12px;
+    }
+    QCheckBox::indicator {
+        width: 16px;
+        height: 16px;
+    }
+"""
+
+
+def build(app: QApplication, rows: int, themed: bool) -> float:
+    """Build a form plus an attendance-style table and return the seconds taken"""
+    started = time.perf_counter()
+    root = QWidget()
+    layout = QVBoxLayout(root)
+    for _ in range(rows // 20):
+        button = QPushButton('Save')
+        line_edit = QLineEdit()
+        if themed:
+            set_role(button, 'button')
+            set_role(line_edit, 'input')
+        else:
+            button.setStyleSheet(LEGACY_BUTTON_STYLE)
+            line_edit.setStyleSheet(LEGACY_INPUT_STYLE)
+        layout.addWidget(button)
+        layout.addWidget(line_edit)
+
+    table = QTableWidget(rows, 1)
+    layout.addWidget(table)
+    for row in range(rows):
+        checkbox = QCheckBox()
+        if themed:
+            set_role(checkbox, 'check')
+        else:
+            checkbox.setStyleSheet(LEGACY_CHECKBOX_STYLE)
+        table.setCellWidget(row, 0, checkbox)
+
+    root.show()
+    for widget in root.findChildren(QWidget):
+        widget.ensurePolished()
+    app.processEvents()
+    elapsed = time.perf_counter() - started
+    root.deleteLater()
+    app.processEvents()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    app = QApplication([])
+    before = min(build(app, args.rows, themed=False) for _ in range(args.repeat))
+    install_theme(app)
+    after = min(build(app, args.rows, themed=True) for _ in range(args.repeat))
+
+    print(f'per-widget stylesheets: {before * 1000:8.1f} ms')
+    print(f'application theme:      {after * 1000:8.1f} ms')
+    print(f'speedup:                {before / after:8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Timesheet computation benchmark
+
+Seeds a temporary database with a month of shifts and one clock-in/clock-out
+entry per employee and working day (random lateness and overtime), then
+times loading the intervals and computing the timesheet separately.
+
+    python -m benchmarks.timesheet_benchmark --employees 10000 --days 31
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from src.database.database import Database
+from src.database.time_tracking import (SHIFT_START_HOURS, build_timesheet,
+                                        load_intervals)
+from benchmarks.ingest_benchmark import seed_employees
+
+
+def seed_time_entries(db_path: str, employees: int, start: date, days: int):
+    db = Database(db_path)
+    rng = random.Random(0)
+    shift_types = list(SHIFT_START_HOURS)
+    shift_id = 0
+    shifts, entries = [], []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        if day.weekday() >= 5:
+            continue
+        midnight = datetime.combine(day, datetime.min.time())
+        for employee_id in range(1, employees + 1):
+            shift_type = shift_types[employee_id % len(shift_types)]
+            shift_id += 1
+            shifts.append((shift_id, employee_id, shift_type, day))
+            clock_in = midnight + timedelta(hours=SHIFT_START_HOURS[shift_type],
+                                            minutes=rng.randint(-10, 20))
+            clock_out = clock_in + timedelta(hours=7.5 + rng.random() * 2)
+            entries.append((employee_id, shift_id, clock_in, clock_out))
+    db.cursor.executemany('''
+        INSERT INTO shifts (id, employee_id, shift_type, assigned_date) VALUES (?, ?, ?, ?)
+    ''', shifts)
+    db.cursor.executemany('''
+        INSERT INTO time_entries (employee_id, shift_id, clock_in, clock_out)
+        VALUES (?, ?, ?, ?)
+    ''', entries)
+    db.conn.commit()
+    db.close()
+    return len(entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--employees', type=int, default=10000)
+    parser.add_argument('--days', type=int, default=31)
+    args = parser.parse_args()
+
+    start = date.today().replace(day=1) - timedelta(days=args.days)
+    end = start + timedelta(days=args.days - 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        seed_employees(db_path, args.employees)
+        count = seed_time_entries(db_path, args.employees, start, args.days)
+
+        db = Database(db_path, readonly=True)
+        started = time.perf_counter()
+        employee_ids, intervals = load_intervals(db, start, end)
+        loaded = time.perf_counter()
+        timesheet = build_timesheet(start, end, employee_ids, intervals)
+        computed = time.perf_counter()
+        db.close()
+
+    print(f'time entries:      {count:,}')
+    print(f'load intervals:    {(loaded - started) * 1000:.0f} ms')
+    print(f'compute timesheet: {(computed - loaded) * 1000:.0f} ms')
+    print(f'total:             {(computed - started) * 1000:.0f} ms')
+    print(f'hours worked:      {timesheet.daily_hours.sum():,.0f}')
+    print(f'overtime hours:    {timesheet.weekly_overtime.sum():,.0f}')
+    print(f'late arrivals:     {timesheet.late_count.sum():,}')
+
+
+if __name__ == '__main__':
+    main()
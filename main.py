@@ -9,6 +9,6 @@ from PyQt5.QtWidgets import QApplication
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
-    window = EmployeeManagementSystem()
+    window = EmployeeManagementSystem(diagnostics='--diagnostics' in sys.argv[1:])
     window.show()
     sys.exit(app.exec_()) 
\ No newline at end of file
@@ -0,0 +1,3 @@
+"""
+Headless JSON API
+""" 
\ No newline at end of file
@@ -0,0 +1,440 @@
+import argparse
+import asyncio
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from src.database.database import Database
+from src.utils.records import (ACTIVITY_COLUMNS, ATTENDANCE_COLUMNS, EMPLOYEE_COLUMNS,
+                               SHIFT_COLUMNS, SHIFT_TYPES, STATS_COLUMNS, as_dicts,
+                               json_default)
+
+# Largest request body accepted, in bytes
+MAX_BODY = 1 << 20
+
+# Pending writes before clients have to wait for the writer to catch up
+WRITE_QUEUE_SIZE = 1000
+
+# Largest value an SQLite INTEGER column holds
+MAX_ID = 2 ** 63 - 1
+
+# Most rows a list endpoint returns; larger limits are lowered to it
+MAX_LIMIT = 1000
+
+
+class HttpError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+    def __init__(self, method: str, path: str, query: Dict[str, List[str]],
+                 headers: Dict[str, str], body: bytes):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+
+    def param(self, name: str, convert=str, default=None):
+        """Return a query parameter converted with `convert`"""
+        values = self.query.get(name)
+        if not values:
+            return default
+        try:
+            return convert(values[-1])
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f'Invalid value for {name}')
+
+    def json(self) -> Dict[str, Any]:
+        try:
+            data = json.loads(self.body or b'{}')
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, 'Body must be valid JSON')
+        if not isinstance(data, dict):
+            raise HttpError(HTTPStatus.BAD_REQUEST, 'Body must be a JSON object')
+        return data
+
+
+def _parse_date(value: str) -> date:
+    return date.fromisoformat(value)
+
+
+def _parse_id(value) -> int:
+    """Accept a positive JSON integer or a string of digits"""
+    if isinstance(value, str) and value.isdecimal():
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int) or not 0 < value <= MAX_ID:
+        raise ValueError(f'not an id: {value!r}')
+    return value
+
+
+def _parse_limit(value: str) -> int:
+    """Accept a positive row count; SQLite would read a negative one as no limit"""
+    limit = int(value)
+    if limit < 1:
+        raise ValueError(f'not a limit: {value!r}')
+    return min(limit, MAX_LIMIT)
+
+
+def _parse_present(value) -> bool:
+    """Accept a JSON boolean, 0 or 1"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    raise ValueError(f'not a boolean: {value!r}')
+
+
+def _converted(name: str, value, convert):
+    try:
+        return convert(value)
+    except (TypeError, ValueError):
+        raise HttpError(HTTPStatus.BAD_REQUEST, f'Invalid value for {name}')
+
+
+def _required(data: Dict[str, Any], *fields: str) -> list:
+    missing = [field for field in fields if data.get(field) in (None, '')]
+    if missing:
+        raise HttpError(HTTPStatus.BAD_REQUEST, f'Missing fields: {", ".join(missing)}')
+    return [data[field] for field in fields]
+
+
+# Operations run on a worker thread against that thread's own Database
+def _data_version(db: Database) -> str:
+    """Changes whenever an activity is logged or the day rolls over"""
+    db.cursor.execute('SELECT COALESCE(MAX(id), 0) FROM activity_log')
+    return f'{date.today().isoformat()}-{db.cursor.fetchone()[0]}'
+
+
+def _assign_shift(db: Database, employee_id: int, shift_type: str) -> bool:
+    if not db.get_employee_by_id(employee_id):
+        return False
+    db.assign_shift(employee_id, shift_type)
+    return True
+
+
+def _mark_attendance(db: Database, employee_id: int, day: date, present: bool) -> bool:
+    if not db.get_employee_by_id(employee_id):
+        return False
+    db.mark_attendance(employee_id, day, present)
+    return True
+
+
+class ApiServer:
+    """Local asyncio HTTP/JSON service over a Database file
+
+    Reads run on a pool of read-only connections in a thread pool, so slow
+    queries never hold up other clients. Writes are queued to a single writer
+    task that owns the only read-write connection. The stats endpoints carry
+    an ETag and answer conditional GETs with 304 Not Modified.
+    """
+
+    def __init__(self, db_path: str = 'employee_management.db', host: str = '127.0.0.1',
+                 port: int = 8080, readers: int = 8):
+        self.db_path = db_path
+        self.host = host
+        self.port = port
+        self.readers = readers
+        self.local = threading.local()
+        self.stats_cache = {}  # path -> (etag, payload)
+        self.server = None
+        self.read_executor = None
+        self.write_executor = None
+        self.write_queue = None
+        self.writer_task = None
+        self.routes = [
+            ('GET', r'/employees', self.list_employees),
+            ('POST', r'/employees', self.add_employee),
+            ('GET', r'/employees/(\d+)', self.get_employee),
+            ('PUT', r'/employees/(\d+)', self.update_employee),
+            ('DELETE', r'/employees/(\d+)', self.delete_employee),
+            ('GET', r'/shifts', self.list_shifts),
+            ('POST', r'/shifts', self.assign_shift),
+            ('GET', r'/attendance', self.list_attendance),
+            ('POST', r'/attendance', self.mark_attendance),
+            ('GET', r'/stats', self.dashboard_stats),
+            ('GET', r'/stats/attendance', self.attendance_stats),
+            ('GET', r'/activities', self.recent_activities),
+        ]
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        # The writer connects first so the schema exists before the readers open
+        self.write_executor = ThreadPoolExecutor(1, thread_name_prefix='api-writer')
+        await loop.run_in_executor(self.write_executor, self.open_connection, False)
+        self.read_executor = ThreadPoolExecutor(self.readers, thread_name_prefix='api-reader',
+                                                initializer=self.open_connection,
+                                                initargs=(True,))
+        self.write_queue = asyncio.Queue(WRITE_QUEUE_SIZE)
+        self.writer_task = asyncio.create_task(self.run_writer())
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.writer_task is not None:
+            self.writer_task.cancel()
+        # Connections are thread-local and close as the pool threads exit
+        for executor in (self.read_executor, self.write_executor):
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+
+    def open_connection(self, readonly: bool):
+        self.local.db = Database(self.db_path, readonly=readonly)
+
+    def call(self, fn, args):
+        return fn(self.local.db, *args)
+
+    async def read(self, fn, *args):
+        """Run fn(db, *args) on one of the read-only connections"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.read_executor, self.call, fn, args)
+
+    async def write(self, fn, *args):
+        """Queue fn(db, *args) for the writer and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        await self.write_queue.put((fn, args, future))
+        return await future
+
+    async def run_writer(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            fn, args, future = await self.write_queue.get()
+            try:
+                result = await loop.run_in_executor(self.write_executor, self.call, fn, args)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+    # HTTP handling
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    self.send(writer, HTTPStatus.BAD_REQUEST, {'error': 'Malformed request line'},
+                              keep_alive=False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (version == 'HTTP/1.1' and
+                              headers.get('connection', '').lower() != 'close')
+                try:
+                    length = int(headers.get('content-length', 0))
+                except ValueError:
+                    length = -1
+                if not 0 <= length <= MAX_BODY:
+                    self.send(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                              {'error': 'Invalid request body size'}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                url = urlsplit(target)
+                request = Request(method.upper(), url.path.rstrip('/') or '/',
+                                  parse_qs(url.query), headers, body)
+                status, payload, extra = await self.dispatch(request)
+                self.send(writer, status, payload, extra, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, request: Request):
+        allowed = []
+        for method, pattern, handler in self.routes:
+            match = re.fullmatch(pattern, request.path)
+            if not match:
+                continue
+            if method != request.method:
+                allowed.append(method)
+                continue
+            try:
+                result = await handler(request, *match.groups())
+            except HttpError as e:
+                return e.status, {'error': e.message}, {}
+            except Exception as e:
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)}, {}
+            if len(result) == 2:
+                return result + ({},)
+            return result
+        if allowed:
+            return (HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'Method not allowed'},
+                    {'Allow': ', '.join(allowed)})
+        return HTTPStatus.NOT_FOUND, {'error': 'Not found'}, {}
+
+    def send(self, writer: asyncio.StreamWriter, status: HTTPStatus, payload: Any,
+             extra: Optional[Dict[str, str]] = None, keep_alive: bool = True):
+        body = b''
+        if payload is not None and status != HTTPStatus.NOT_MODIFIED:
+            body = json.dumps(payload, default=json_default).encode()
+        headers = {
+            'Content-Type': 'application/json',
+            'Content-Length': str(len(body)),
+            'Connection': 'keep-alive' if keep_alive else 'close',
+        }
+        headers.update(extra or {})
+        head = f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+        head += ''.join(f'{name}: {value}\r\n' for name, value in headers.items())
+        writer.write(head.encode('latin-1') + b'\r\n' + body)
+
+    # Endpoints
+    async def list_employees(self, request):
+        employees = await self.read(Database.get_all_employees)
+        return HTTPStatus.OK, as_dicts(EMPLOYEE_COLUMNS, employees)
+
+    async def get_employee(self, request, employee_id):
+        employee = await self.read(Database.get_employee_by_id,
+                                   _converted('employee_id', employee_id, _parse_id))
+        if not employee:
+            raise HttpError(HTTPStatus.NOT_FOUND, 'Employee not found')
+        return HTTPStatus.OK, dict(zip(EMPLOYEE_COLUMNS, employee))
+
+    async def add_employee(self, request):
+        name, gender, email, department = _required(
+            request.json(), 'name', 'gender', 'email', 'department')
+        if gender not in ('Male', 'Female'):
+            raise HttpError(HTTPStatus.BAD_REQUEST, 'Gender must be Male or Female')
+        if not await self.write(Database.add_employee, name, gender, email, department):
+            raise HttpError(HTTPStatus.CONFLICT, 'Email already exists')
+        return HTTPStatus.CREATED, {'status': 'created'}
+
+    async def update_employee(self, request, employee_id):
+        data = request.json()
+        changes = {field: data[field] for field in ('name', 'gender', 'email', 'department')
+                   if data.get(field) not in (None, '')}
+        employee_id = _converted('employee_id', employee_id, _parse_id)
+        updated, conflicts = await self.write(
+            Database.update_employees_bulk, [dict(changes, id=employee_id)])
+        if conflicts:
+            raise HttpError(HTTPStatus.CONFLICT, next(iter(conflicts.values())))
+        if not updated:
+            raise HttpError(HTTPStatus.NOT_FOUND, 'Employee not found')
+        return HTTPStatus.OK, {'updated': updated}
+
+    async def delete_employee(self, request, employee_id):
+        deleted = await self.write(Database.delete_employees,
+                                   [_converted('employee_id', employee_id, _parse_id)])
+        if not deleted:
+            raise HttpError(HTTPStatus.NOT_FOUND, 'Employee not found')
+        return HTTPStatus.OK, {'deleted': deleted}
+
+    async def list_shifts(self, request):
+        after = None
+        after_date = request.param('after_date', _parse_date)
+        after_id = request.param('after_id', _parse_id)
+        if after_date is not None and after_id is not None:
+            after = (after_date, after_id)
+        shifts = await self.read(
+            Database.get_shifts,
+            request.param('start', _parse_date), request.param('end', _parse_date),
+            request.param('employee_id', _parse_id), request.param('shift_type'),
+            after, request.param('limit', _parse_limit, 100))
+        return HTTPStatus.OK, as_dicts(SHIFT_COLUMNS, shifts)
+
+    async def assign_shift(self, request):
+        employee_id, shift_type = _required(request.json(), 'employee_id', 'shift_type')
+        employee_id = _converted('employee_id', employee_id, _parse_id)
+        if shift_type not in SHIFT_TYPES:
+            raise HttpError(HTTPStatus.BAD_REQUEST,
+                            f'Shift type must be one of {", ".join(SHIFT_TYPES)}')
+        if not await self.write(_assign_shift, employee_id, shift_type):
+            raise HttpError(HTTPStatus.NOT_FOUND, 'Employee not found')
+        return HTTPStatus.CREATED, {'status': 'created'}
+
+    async def list_attendance(self, request):
+        day = request.param('date', _parse_date, date.today())
+        attendance = await self.read(Database.get_attendance_by_date, day)
+        return HTTPStatus.OK, as_dicts(ATTENDANCE_COLUMNS, attendance)
+
+    async def mark_attendance(self, request):
+        data = request.json()
+        employee_id, present = _required(data, 'employee_id', 'present')
+        employee_id = _converted('employee_id', employee_id, _parse_id)
+        present = _converted('present', present, _parse_present)
+        try:
+            day = _parse_date(data['date']) if data.get('date') else date.today()
+        except (TypeError, ValueError):
+            raise HttpError(HTTPStatus.BAD_REQUEST, 'Invalid value for date')
+        if not await self.write(_mark_attendance, employee_id, day, present):
+            raise HttpError(HTTPStatus.NOT_FOUND, 'Employee not found')
+        return HTTPStatus.CREATED, {'status': 'created'}
+
+    async def recent_activities(self, request):
+        activities = await self.read(Database.get_recent_activities,
+                                     request.param('limit', _parse_limit, 10))
+        return HTTPStatus.OK, as_dicts(ACTIVITY_COLUMNS, activities)
+
+    async def cached_stats(self, request, fn):
+        """Serve stats with an ETag, recomputing only when the data changed"""
+        etag = f'"{await self.read(_data_version)}"'
+        if request.headers.get('if-none-match') == etag:
+            return HTTPStatus.NOT_MODIFIED, None, {'ETag': etag}
+        cached = self.stats_cache.get(request.path)
+        if cached and cached[0] == etag:
+            payload = cached[1]
+        else:
+            payload = await self.read(fn)
+            self.stats_cache[request.path] = (etag, payload)
+        return HTTPStatus.OK, payload, {'ETag': etag, 'Cache-Control': 'no-cache'}
+
+    async def dashboard_stats(self, request):
+        return await self.cached_stats(request, Database.get_dashboard_stats)
+
+    async def attendance_stats(self, request):
+        def attendance_stats(db):
+            return as_dicts(STATS_COLUMNS, db.get_attendance_stats())
+        return await self.cached_stats(request, attendance_stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Employee Management JSON API')
+    parser.add_argument('--db', default='employee_management.db', help='database file')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--readers', type=int, default=8,
+                        help='number of read-only connections')
+    args = parser.parse_args()
+
+    server = ApiServer(args.db, args.host, args.port, args.readers)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
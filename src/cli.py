@@ -0,0 +1,434 @@
+"""Command-line interface for scripts and cron jobs
+
+Imports only the database layer, never PyQt5 or matplotlib, so it starts in
+well under 100 ms. Pass --json for machine-readable output.
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+from datetime import date, datetime
+from typing import Dict, List
+
+from src.database.archive import attach_archive
+from src.database.database import EMPLOYEE_FIELDS, Database, open_readonly
+from src.utils.records import (ATTENDANCE_COLUMNS, EMPLOYEE_COLUMNS, SHIFT_COLUMNS,
+                               SHIFT_TYPES, STATS_COLUMNS, as_dicts, json_default)
+
+# Table and columns of each export; archived rows are included
+EXPORTS = {
+    'employees': ('employees', EMPLOYEE_COLUMNS),
+    'shifts': ('shifts', ('id', 'employee_id', 'shift_type', 'assigned_date')),
+    'attendance': ('attendance', ('id', 'employee_id', 'date', 'present')),
+    'activities': ('activity_log', ('id', 'action_type', 'description', 'timestamp')),
+}
+
+# Rows fetched per round trip while exporting
+EXPORT_CHUNK = 1000
+
+
+class CliError(Exception):
+    pass
+
+
+def _parse_bool(value: str) -> bool:
+    if value.strip().lower() in ('1', 'true', 'yes', 'present'):
+        return True
+    if value.strip().lower() in ('0', 'false', 'no', 'absent', ''):
+        return False
+    raise ValueError(f'not a boolean: {value}')
+
+
+def _format(value) -> str:
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return '' if value is None else str(value)
+
+
+def output(args, result):
+    """Print a result as JSON or as an aligned text table"""
+    if args.json:
+        json.dump(result, sys.stdout, default=json_default, indent=2)
+        sys.stdout.write('\n')
+    elif isinstance(result, list):
+        if not result:
+            return
+        columns = list(result[0])
+        cells = [[_format(row[column]) for column in columns] for row in result]
+        widths = [max(len(column), *(len(row[i]) for row in cells))
+                  for i, column in enumerate(columns)]
+        print('  '.join(column.ljust(width) for column, width in zip(columns, widths)).rstrip())
+        for row in cells:
+            print('  '.join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+    elif isinstance(result, dict):
+        for key, value in result.items():
+            print(f'{key}: {_format(value)}')
+    else:
+        print(result)
+
+
+def open_db(args, write: bool = False, history: bool = False) -> Database:
+    # Reads use a read-only connection; a file written by an older version
+    # is upgraded read-write once first, as reading it unconverted would
+    # return empty or wrong results. history=True attaches the archive for
+    # commands reading date ranges.
+    try:
+        if not write and os.path.exists(args.db):
+            db = open_readonly(args.db)
+        else:
+            db = Database(args.db)
+        if history:
+            try:
+                attach_archive(db)
+            except sqlite3.Error:
+                db.close()
+                raise
+        return db
+    except sqlite3.Error as e:
+        raise CliError(f'Cannot open {args.db}: {e}. Files from older versions are '
+                       'upgraded on first use, which needs write access.')
+
+
+def detect_format(path: str, fmt: str) -> str:
+    if fmt:
+        return fmt
+    return 'json' if path.lower().endswith('.json') else 'csv'
+
+
+def read_records(path: str, fmt: str) -> List[Dict[str, str]]:
+    stream = sys.stdin if path == '-' else open(path, newline='')
+    with stream:
+        if detect_format(path, fmt) == 'json':
+            records = json.load(stream)
+            if not isinstance(records, list):
+                raise CliError('JSON input must be a list of objects')
+            return records
+        return list(csv.DictReader(stream))
+
+
+# Command handlers take the parsed arguments and return what to print
+
+def employees_list(args):
+    db = open_db(args)
+    try:
+        rows = db.get_all_employees()
+    finally:
+        db.close()
+    if args.department:
+        rows = [row for row in rows if row[4] == args.department]
+    return as_dicts(EMPLOYEE_COLUMNS, rows)
+
+
+def employees_show(args):
+    db = open_db(args)
+    try:
+        employee = db.get_employee_by_id(args.id)
+    finally:
+        db.close()
+    if employee is None:
+        raise CliError(f'No employee with id {args.id}')
+    return dict(zip(EMPLOYEE_COLUMNS, employee))
+
+
+def employees_add(args):
+    db = open_db(args, write=True)
+    try:
+        if not db.add_employee(args.name, args.gender, args.email, args.department):
+            raise CliError(f'Email {args.email} is already in use')
+        db.cursor.execute('SELECT * FROM employees WHERE email = ?', (args.email,))
+        return dict(zip(EMPLOYEE_COLUMNS, db.cursor.fetchone()))
+    finally:
+        db.close()
+
+
+def employees_update(args):
+    update = {field: getattr(args, field) for field in EMPLOYEE_FIELDS
+              if getattr(args, field) is not None}
+    if not update:
+        raise CliError('Nothing to update')
+    db = open_db(args, write=True)
+    try:
+        if db.get_employee_by_id(args.id) is None:
+            raise CliError(f'No employee with id {args.id}')
+        _, conflicts = db.update_employees_bulk([dict(update, id=args.id)])
+        if conflicts:
+            raise CliError(conflicts[args.id])
+        return dict(zip(EMPLOYEE_COLUMNS, db.get_employee_by_id(args.id)))
+    finally:
+        db.close()
+
+
+def employees_delete(args):
+    db = open_db(args, write=True)
+    try:
+        return {'deleted': db.delete_employees(args.ids)}
+    finally:
+        db.close()
+
+
+def shifts_list(args):
+    db = open_db(args, history=True)
+    try:
+        rows = db.get_shifts(args.start, args.end, args.employee, args.type,
+                             limit=args.limit)
+    finally:
+        db.close()
+    return as_dicts(SHIFT_COLUMNS, rows)
+
+
+def shifts_assign(args):
+    db = open_db(args, write=True)
+    try:
+        if db.get_employee_by_id(args.employee_id) is None:
+            raise CliError(f'No employee with id {args.employee_id}')
+        db.assign_shift(args.employee_id, args.shift_type)
+        return {'employee_id': args.employee_id, 'shift_type': args.shift_type,
+                'assigned_date': date.today()}
+    finally:
+        db.close()
+
+
+def attendance_list(args):
+    db = open_db(args)
+    try:
+        rows = db.get_attendance_by_date(args.date)
+    finally:
+        db.close()
+    return [dict(row, present=bool(row['present']))
+            for row in as_dicts(ATTENDANCE_COLUMNS, rows)]
+
+
+def attendance_mark(args):
+    db = open_db(args, write=True)
+    try:
+        marked = db.mark_attendance_bulk(
+            args.date, {employee_id: not args.absent for employee_id in args.employee_ids})
+    finally:
+        db.close()
+    return {'date': args.date, 'marked': marked,
+            'unknown': len(set(args.employee_ids)) - marked}
+
+
+def time_clock(args):
+    db = open_db(args, write=True)
+    try:
+        if db.get_employee_by_id(args.employee_id) is None:
+            raise CliError(f'No employee with id {args.employee_id}')
+        if args.action == 'in':
+            if db.clock_in(args.employee_id) is None:
+                raise CliError(f'Employee {args.employee_id} is already clocked in')
+        elif not db.clock_out(args.employee_id):
+            raise CliError(f'Employee {args.employee_id} is not clocked in')
+    finally:
+        db.close()
+    return {'employee_id': args.employee_id, f'clocked_{args.action}': datetime.now()}
+
+
+def time_report(args):
+    # NumPy is only needed here, so it is not imported at startup
+    from src.database.time_tracking import compute_timesheet
+    db = open_db(args, history=True)
+    try:
+        timesheet = compute_timesheet(db, args.start, args.end)
+        names = dict((row[0], row[1]) for row in db.get_all_employees())
+    finally:
+        db.close()
+    hours = timesheet.daily_hours.sum(axis=1)
+    overtime = timesheet.weekly_overtime.sum(axis=1)
+    late = timesheet.late_minutes.sum(axis=1)
+    return [{'id': int(employee_id), 'name': names.get(int(employee_id), ''),
+             'hours': round(float(hours[i]), 2), 'overtime': round(float(overtime[i]), 2),
+             'late_arrivals': int(timesheet.late_count[i]),
+             'late_minutes': round(float(late[i])),
+             'open_entries': int(timesheet.open_entries[i])}
+            for i, employee_id in enumerate(timesheet.employee_ids)
+            if hours[i] or timesheet.open_entries[i] or args.all]
+
+
+def stats(args):
+    db = open_db(args)
+    try:
+        result = db.get_dashboard_stats()
+        if args.days:
+            result['attendance'] = as_dicts(STATS_COLUMNS, db.get_attendance_stats()[:args.days])
+    finally:
+        db.close()
+    if not args.json:
+        # Text output keeps to one line per value
+        result['gender_stats'] = ', '.join(
+            f'{gender} {share:.1f}%' for gender, share in result['gender_stats'].items())
+        result['attendance_rate'] = f"{result['attendance_rate']:.1f}%"
+        for row in result.pop('attendance', []):
+            result[row['date'].isoformat()] = f"{row['present_count']}/{row['total_employees']}"
+    return result
+
+
+def import_records(args):
+    records = read_records(args.file, args.format)
+    db = open_db(args, write=True)
+    try:
+        if args.table == 'employees':
+            rows = [tuple(str(record.get(field) or '').strip() for field in EMPLOYEE_FIELDS)
+                    for record in records]
+            imported = db.add_employees([row for row in rows if all(row)])
+        else:
+            by_day = {}
+            for record in records:
+                try:
+                    day = date.fromisoformat(str(record['date']).strip())
+                    present = record.get('present', True)
+                    if isinstance(present, str):
+                        present = _parse_bool(present)
+                    by_day.setdefault(day, {})[int(record['employee_id'])] = bool(present)
+                except (KeyError, ValueError) as e:
+                    raise CliError(f'Invalid attendance record {record}: {e}')
+            imported = sum(db.mark_attendance_bulk(day, changes)
+                           for day, changes in sorted(by_day.items()))
+    finally:
+        db.close()
+    return {'table': args.table, 'records': len(records), 'imported': imported,
+            'skipped': len(records) - imported}
+
+
+def export_records(args):
+    table, columns = EXPORTS[args.table]
+    fmt = detect_format(args.output, args.format)
+    db = open_db(args, history=True)
+    stream = sys.stdout if args.output == '-' else open(args.output, 'w', newline='')
+    try:
+        db.cursor.execute(f'''
+            SELECT {', '.join(columns)} FROM {db.history(table)} ORDER BY id
+        ''')
+        if fmt == 'csv':
+            writer = csv.writer(stream)
+            writer.writerow(columns)
+        else:
+            stream.write('[')
+        count = 0
+        while True:
+            rows = db.cursor.fetchmany(EXPORT_CHUNK)
+            if not rows:
+                break
+            for row in rows:
+                if fmt == 'csv':
+                    writer.writerow([_format(value) for value in row])
+                else:
+                    stream.write(',\n ' if count else '\n ')
+                    json.dump(dict(zip(columns, row)), stream, default=json_default)
+                count += 1
+        if fmt == 'json':
+            stream.write('\n]\n' if count else ']\n')
+    finally:
+        db.close()
+        if stream is not sys.stdout:
+            stream.close()
+    # Keep stdout clean when the export itself went there
+    return None if args.output == '-' else {'table': args.table, 'rows': count,
+                                            'file': args.output}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m src.cli',
+                                     description='Employee Management command line')
+    parser.add_argument('--db', default='employee_management.db', help='database file')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    employees = commands.add_parser('employees', help='list and edit employees')
+    actions = employees.add_subparsers(dest='action', required=True)
+    action = actions.add_parser('list')
+    action.add_argument('--department')
+    action.set_defaults(handler=employees_list)
+    action = actions.add_parser('show')
+    action.add_argument('id', type=int)
+    action.set_defaults(handler=employees_show)
+    action = actions.add_parser('add')
+    action.add_argument('name')
+    action.add_argument('gender', choices=('Male', 'Female'))
+    action.add_argument('email')
+    action.add_argument('department')
+    action.set_defaults(handler=employees_add)
+    action = actions.add_parser('update')
+    action.add_argument('id', type=int)
+    action.add_argument('--name')
+    action.add_argument('--gender', choices=('Male', 'Female'))
+    action.add_argument('--email')
+    action.add_argument('--department')
+    action.set_defaults(handler=employees_update)
+    action = actions.add_parser('delete')
+    action.add_argument('ids', type=int, nargs='+')
+    action.set_defaults(handler=employees_delete)
+
+    shifts = commands.add_parser('shifts', help='list and assign shifts')
+    actions = shifts.add_subparsers(dest='action', required=True)
+    action = actions.add_parser('list')
+    action.add_argument('--from', dest='start', type=date.fromisoformat)
+    action.add_argument('--to', dest='end', type=date.fromisoformat)
+    action.add_argument('--employee', type=int)
+    action.add_argument('--type', choices=SHIFT_TYPES)
+    action.add_argument('--limit', type=int, default=100)
+    action.set_defaults(handler=shifts_list)
+    action = actions.add_parser('assign')
+    action.add_argument('employee_id', type=int)
+    action.add_argument('shift_type', choices=SHIFT_TYPES)
+    action.set_defaults(handler=shifts_assign)
+
+    attendance = commands.add_parser('attendance', help='show and mark attendance')
+    actions = attendance.add_subparsers(dest='action', required=True)
+    action = actions.add_parser('list')
+    action.add_argument('--date', type=date.fromisoformat, default=date.today())
+    action.set_defaults(handler=attendance_list)
+    action = actions.add_parser('mark')
+    action.add_argument('employee_ids', type=int, nargs='+')
+    action.add_argument('--date', type=date.fromisoformat, default=date.today())
+    action.add_argument('--absent', action='store_true', help='mark as absent')
+    action.set_defaults(handler=attendance_mark)
+
+    time_parser = commands.add_parser('time', help='clock in/out and hours worked')
+    actions = time_parser.add_subparsers(dest='action', required=True)
+    for name in ('in', 'out'):
+        action = actions.add_parser(name, help=f'clock an employee {name} now')
+        action.add_argument('employee_id', type=int)
+        action.set_defaults(handler=time_clock)
+    action = actions.add_parser('report', help='hours, overtime and lateness')
+    action.add_argument('--from', dest='start', type=date.fromisoformat,
+                        default=date.today().replace(day=1))
+    action.add_argument('--to', dest='end', type=date.fromisoformat, default=date.today())
+    action.add_argument('--all', action='store_true', help='include employees without hours')
+    action.set_defaults(handler=time_report)
+
+    command = commands.add_parser('stats', help='dashboard statistics')
+    command.add_argument('--days', type=int, default=0,
+                         help='also show daily attendance for this many days')
+    command.set_defaults(handler=stats)
+
+    command = commands.add_parser('import', help='import employees or attendance')
+    command.add_argument('table', choices=('employees', 'attendance'))
+    command.add_argument('file', help="CSV or JSON file, '-' for stdin")
+    command.add_argument('--format', choices=('csv', 'json'))
+    command.set_defaults(handler=import_records)
+
+    command = commands.add_parser('export', help='export a table as CSV or JSON')
+    command.add_argument('table', choices=tuple(EXPORTS))
+    command.add_argument('-o', '--output', default='-', help="output file, '-' for stdout")
+    command.add_argument('--format', choices=('csv', 'json'))
+    command.set_defaults(handler=export_records)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        result = args.handler(args)
+    except (CliError, OSError, ValueError) as e:
+        print(f'error: {e}', file=sys.stderr)
+        return 1
+    if result is not None:
+        output(args, result)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
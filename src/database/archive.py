@@ -0,0 +1,258 @@
+import argparse
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, datetime, time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.database.database import Database, converted_column
+
+# Tables that can be archived and the column their age is judged by. Time
+# entries go before shifts, so the shifts they link to can follow them.
+ARCHIVE_TABLES = {
+    'attendance': 'date',
+    'time_entries': 'clock_in',
+    'shifts': 'assigned_date',
+    'activity_log': 'timestamp',
+}
+
+# Old rows that stay in the hot file: entries not clocked out yet, and shifts
+# entries there still link to (deleting those would unlink the entries)
+ARCHIVE_KEEP = {
+    'time_entries': 'clock_out IS NULL',
+    'shifts': 'EXISTS (SELECT 1 FROM main.time_entries t WHERE t.shift_id = shifts.id)',
+}
+
+# Rows moved per transaction
+BATCH_SIZE = 5000
+
+
+def default_archive_path(db_path: str) -> str:
+    root, ext = os.path.splitext(db_path)
+    return f'{root}_archive{ext or ".db"}'
+
+
+class Archiver:
+    """Move cold rows into a separate archive database file
+
+    The hot file keeps only recent attendance, time entries, shifts and
+    activity log rows, so the day-to-day queries never touch history. The
+    archive is attached to the connection only while archiving or
+    reporting; while attached, TEMP views (all_attendance, all_time_entries,
+    all_shifts, all_activity_log) span both files, and the date-range
+    readers of the Database read those instead of the hot tables.
+    """
+
+    def __init__(self, db: Database, archive_path: Optional[str] = None):
+        self.db = db
+        self.archive_path = archive_path or default_archive_path(db.db_path)
+        self.attached = False
+
+    def attach(self):
+        if self.attached:
+            return
+        self.db.conn.commit()
+        if self.db.readonly:
+            uri = f'{Path(self.archive_path).resolve().as_uri()}?mode=ro'
+            self.db.cursor.execute('ATTACH DATABASE ? AS archive', (uri,))
+        else:
+            self.db.cursor.execute('ATTACH DATABASE ? AS archive', (self.archive_path,))
+        self.attached = True
+        if not self.db.readonly:
+            self.sync_schema()
+        elif self.needs_sync():
+            self.detach()
+            raise sqlite3.OperationalError(
+                f'{self.archive_path} needs upgrading, which needs write access')
+        self.create_views()
+
+    def detach(self):
+        if not self.attached:
+            return
+        self.db.conn.commit()
+        self.db.history_views = {}
+        for table in ARCHIVE_TABLES:
+            self.db.cursor.execute(f'DROP VIEW IF EXISTS temp.all_{table}')
+        self.db.cursor.execute('DETACH DATABASE archive')
+        self.attached = False
+
+    @contextmanager
+    def attached_archive(self):
+        """Attach the archive for the duration of a with block"""
+        was_attached = self.attached
+        self.attach()
+        try:
+            yield self
+        finally:
+            if not was_attached:
+                self.detach()
+
+    def columns(self, schema: str, table: str) -> List[tuple]:
+        self.db.cursor.execute(f'PRAGMA {schema}.table_info({table})')
+        return self.db.cursor.fetchall()
+
+    def needs_sync(self) -> bool:
+        """Whether sync_schema would change the attached archive"""
+        for table in ARCHIVE_TABLES:
+            archived = {col[1]: col[2] for col in self.columns('archive', table)}
+            if any(archived.get(col[1]) != col[2] for col in self.columns('main', table)):
+                return True
+        return False
+
+    def sync_schema(self):
+        """Create archive tables, adding any columns the hot tables gained"""
+        for table, age_column in ARCHIVE_TABLES.items():
+            hot = self.columns('main', table)
+            archived = {col[1]: col[2] for col in self.columns('archive', table)}
+            hot_types = {col[1]: col[2] for col in hot}
+            if any(archived.get(name, hot_types[name]) != hot_types[name]
+                   for name in hot_types):
+                # Archive written before the date/time encoding changed
+                self.rebuild_archive_table(table, age_column, hot, archived)
+            elif not archived:
+                self.create_archive_table(table, age_column, hot)
+            else:
+                for col in hot:
+                    if col[1] not in archived:
+                        self.db.cursor.execute(
+                            f'ALTER TABLE archive.{table} ADD COLUMN {col[1]} {col[2]}')
+        self.db.conn.commit()
+
+    def create_archive_table(self, table: str, age_column: str, hot: List[tuple]):
+        # Same columns, but no foreign keys: employees stay in the hot file
+        definitions = ', '.join(
+            f'{col[1]} INTEGER PRIMARY KEY' if col[5] else f'{col[1]} {col[2]}'
+            for col in hot)
+        self.db.cursor.execute(f'CREATE TABLE archive.{table} ({definitions})')
+        self.db.cursor.execute(f'''
+            CREATE INDEX IF NOT EXISTS archive.idx_{table}_{age_column}
+            ON {table} ({age_column})
+        ''')
+
+    def rebuild_archive_table(self, table: str, age_column: str, hot: List[tuple],
+                              archived: Dict[str, str]):
+        self.db.cursor.execute(f'ALTER TABLE archive.{table} RENAME TO _{table}_old')
+        self.db.cursor.execute(f'DROP INDEX IF EXISTS archive.idx_{table}_{age_column}')
+        self.create_archive_table(table, age_column, hot)
+        columns = [col[1] for col in hot if col[1] in archived]
+        values = [converted_column(table, column) for column in columns]
+        self.db.cursor.execute(f'''
+            INSERT INTO archive.{table} ({', '.join(columns)})
+            SELECT {', '.join(values)} FROM archive._{table}_old
+        ''')
+        self.db.cursor.execute(f'DROP TABLE archive._{table}_old')
+
+    def create_views(self):
+        for table in ARCHIVE_TABLES:
+            columns = ', '.join(col[1] for col in self.columns('main', table))
+            self.db.cursor.execute(f'''
+                CREATE TEMP VIEW IF NOT EXISTS all_{table} AS
+                SELECT {columns} FROM main.{table}
+                UNION ALL
+                SELECT {columns} FROM archive.{table}
+            ''')
+            self.db.history_views[table] = f'all_{table}'
+
+    def archive(self, cutoff: date, batch_size: int = BATCH_SIZE) -> Dict[str, int]:
+        """Move rows dated before cutoff into the archive in batches
+
+        Each batch is copied and deleted in one transaction. Copies use
+        INSERT OR REPLACE, so a run interrupted between the two files can
+        simply be repeated. Returns the number of rows moved per table.
+        """
+        moved = {}
+        with self.attached_archive():
+            for table, age_column in ARCHIVE_TABLES.items():
+                hot = self.columns('main', table)
+                columns = ', '.join(col[1] for col in hot)
+                # Timestamps are epoch seconds; compare them with local midnight
+                if any(col[1] == age_column and col[2] == 'EPOCH' for col in hot):
+                    limit = datetime.combine(cutoff, time.min)
+                else:
+                    limit = cutoff
+                condition = f'{age_column} < ?'
+                if table in ARCHIVE_KEEP:
+                    condition += f' AND NOT {ARCHIVE_KEEP[table]}'
+                moved[table] = 0
+                while True:
+                    self.db.cursor.execute(f'''
+                        SELECT MAX(id), COUNT(*) FROM (
+                            SELECT id FROM main.{table}
+                            WHERE {condition}
+                            ORDER BY id
+                            LIMIT ?
+                        )
+                    ''', (limit, batch_size))
+                    last_id, count = self.db.cursor.fetchone()
+                    if not count:
+                        break
+                    try:
+                        # Archived rows still exist for the other sites
+                        self.db.set_change_capture(False)
+                        self.db.cursor.execute(f'''
+                            INSERT OR REPLACE INTO archive.{table} ({columns})
+                            SELECT {columns} FROM main.{table}
+                            WHERE {condition} AND id <= ?
+                        ''', (limit, last_id))
+                        self.db.cursor.execute(f'''
+                            DELETE FROM main.{table}
+                            WHERE {condition} AND id <= ?
+                        ''', (limit, last_id))
+                        self.db.set_change_capture(True)
+                        self.db.conn.commit()
+                    except sqlite3.Error:
+                        self.db.conn.rollback()
+                        raise
+                    moved[table] += count
+            if any(moved.values()):
+                summary = ', '.join(f'{count} {table}' for table, count in moved.items())
+                self.db.log_activity('data_archived',
+                                     f'Archived rows before {cutoff}: {summary}')
+        return moved
+
+
+def attach_archive(db: Database, archive_path: Optional[str] = None) -> Optional[Archiver]:
+    """Attach the archive of db, if it has one, for the life of the connection
+
+    The date-range readers then include archived rows. A read-only
+    connection cannot bring an archive from an older version up to date;
+    as open_readonly does for the main file, that is done read-write once.
+    """
+    archiver = Archiver(db, archive_path)
+    if not os.path.exists(archiver.archive_path):
+        return None
+    try:
+        archiver.attach()
+    except sqlite3.OperationalError:
+        if not db.readonly:
+            raise
+        writer = Database(db.db_path, setup_schema=False)
+        try:
+            Archiver(writer, archiver.archive_path).attach()
+        finally:
+            writer.close()
+        archiver.attach()
+    return archiver
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Archive old attendance, time entries, shifts and activity')
+    parser.add_argument('--db', default='employee_management.db', help='database file')
+    parser.add_argument('--archive', help='archive file (default: <db>_archive.db)')
+    parser.add_argument('--before', required=True, type=date.fromisoformat,
+                        help='archive rows dated before this day (YYYY-MM-DD)')
+    args = parser.parse_args()
+
+    db = Database(args.db)
+    try:
+        moved = Archiver(db, args.archive).archive(args.before)
+    finally:
+        db.close()
+    for table, count in moved.items():
+        print(f'{table}: {count} rows archived')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+from datetime import date, timedelta
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+# Number of set bits for every possible byte value
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+# Employees unpacked at once by the streak/trend functions
+BLOCK_ROWS = 4096
+
+
+class Trend(NamedTuple):
+    days: np.ndarray       # datetime64[D], one entry per day in the range
+    rates: np.ndarray      # daily attendance rate in percent
+    slope: float           # change in rate (percentage points) per day
+    intercept: float       # fitted rate on the first day
+
+
+class AttendanceMatrix:
+    """Employees x days attendance bitset.
+
+    Bit ``d`` of row ``i`` is set when ``employee_ids[i]`` was marked
+    present on ``start + d``. Unmarked days count as absent, the same way
+    the dashboard treats them. Rows are packed eight days per byte, so a
+    year for 50k employees takes about 2.3 MB.
+    """
+
+    def __init__(self, start: date, days: int, employee_ids: np.ndarray,
+                 names: np.ndarray, department_codes: np.ndarray,
+                 departments: List[str], present: np.ndarray):
+        self.start = start
+        self.days = days
+        self.employee_ids = employee_ids
+        self.names = names  # object array, one name per row
+        self.department_codes = department_codes
+        self.departments = departments
+        self.present = present
+
+    @property
+    def end(self) -> date:
+        return self.start + timedelta(days=self.days - 1)
+
+    @property
+    def nbytes(self) -> int:
+        return (self.present.nbytes + self.employee_ids.nbytes +
+                self.department_codes.nbytes)
+
+    def row_of(self, employee_id: int) -> Optional[int]:
+        """Return the matrix row of an employee, or None if not loaded"""
+        i = int(np.searchsorted(self.employee_ids, employee_id))
+        if i < len(self.employee_ids) and self.employee_ids[i] == employee_id:
+            return i
+        return None
+
+    def unpacked(self, rows: slice = slice(None)) -> np.ndarray:
+        """Return a boolean (employees, days) view of the selected rows"""
+        bits = np.unpackbits(self.present[rows], axis=1, count=self.days)
+        return bits.view(bool)
+
+    def select(self, department: str) -> 'AttendanceMatrix':
+        """Return the sub-matrix for a single department"""
+        if department not in self.departments:
+            mask = np.zeros(len(self.employee_ids), dtype=bool)
+        else:
+            code = self.departments.index(department)
+            mask = self.department_codes == code
+        return AttendanceMatrix(self.start, self.days, self.employee_ids[mask],
+                                self.names[mask], self.department_codes[mask],
+                                self.departments, self.present[mask])
+
+
+def load_attendance_matrix(db, start: date, end: date) -> AttendanceMatrix:
+    """Load attendance between start and end (inclusive) in one pass
+
+    There is one mark per employee and day, so only the present marks are
+    read: one row per day listing the employees present, straight off the
+    (date, employee_id, present) index.
+    """
+    days = (end - start).days + 1
+    if days <= 0:
+        raise ValueError('end must not be before start')
+
+    cursor = db.conn.cursor()
+    cursor.execute('SELECT id, name, department FROM employees ORDER BY id')
+    employees = cursor.fetchall()
+    departments = sorted({dept for _, _, dept in employees})
+    dept_index = {dept: i for i, dept in enumerate(departments)}
+    employee_ids = np.fromiter((emp_id for emp_id, _, _ in employees),
+                               dtype=np.int64, count=len(employees))
+    names = np.empty(len(employees), dtype=object)
+    names[:] = [name for _, name, _ in employees]
+    department_codes = np.fromiter((dept_index[dept] for _, _, dept in employees),
+                                   dtype=np.int16, count=len(employees))
+    present = np.zeros((len(employees), (days + 7) // 8), dtype=np.uint8)
+
+    # Dates are stored as day numbers, so the column offset is a subtraction.
+    # Parsing one id list per day is far cheaper than a tuple per mark.
+    cursor.execute(f'''
+        SELECT date - ?, group_concat(employee_id, ' ')
+        FROM {db.history('attendance')}
+        WHERE date BETWEEN ? AND ? AND present
+        GROUP BY date
+    ''', (start, start, end))
+    for col, ids in cursor:
+        _set_day(present, employee_ids, col,
+                 np.fromstring(ids, dtype=np.int64, sep=' '))
+    cursor.close()
+
+    return AttendanceMatrix(start, days, employee_ids, names, department_codes,
+                            departments, present)
+
+
+def _set_day(present: np.ndarray, employee_ids: np.ndarray, col: int,
+             ids: np.ndarray):
+    """Set the bit of one day for the employees present on it"""
+    if len(employee_ids) == 0:
+        return
+    rows = np.minimum(np.searchsorted(employee_ids, ids), len(employee_ids) - 1)
+    rows = rows[employee_ids[rows] == ids]
+    present[rows, col >> 3] |= np.uint8(0x80 >> (col & 7))
+
+
+def present_days(matrix: AttendanceMatrix) -> np.ndarray:
+    """Number of days each employee was present"""
+    return _POPCOUNT[matrix.present].sum(axis=1, dtype=np.int64)
+
+
+def attendance_rates(matrix: AttendanceMatrix) -> np.ndarray:
+    """Attendance rate (percent) for every employee over the whole range"""
+    return present_days(matrix) * (100.0 / matrix.days)
+
+
+def longest_absence_streaks(matrix: AttendanceMatrix) -> np.ndarray:
+    """Longest run of consecutive absent days for every employee"""
+    result = np.zeros(len(matrix.employee_ids), dtype=np.int64)
+    for first in range(0, len(result), BLOCK_ROWS):
+        rows = slice(first, first + BLOCK_ROWS)
+        absent = ~matrix.unpacked(rows)
+        # Running count of absences, reset to zero on every present day
+        counts = np.cumsum(absent, axis=1, dtype=np.int32)
+        resets = np.where(absent, 0, counts)
+        np.maximum.accumulate(resets, axis=1, out=resets)
+        result[rows] = (counts - resets).max(axis=1, initial=0)
+    return result
+
+
+def daily_present_counts(matrix: AttendanceMatrix) -> np.ndarray:
+    """Number of employees present on each day of the range"""
+    counts = np.zeros(matrix.days, dtype=np.int64)
+    for first in range(0, len(matrix.employee_ids), BLOCK_ROWS):
+        counts += matrix.unpacked(slice(first, first + BLOCK_ROWS)).sum(axis=0)
+    return counts
+
+
+def department_rollup(matrix: AttendanceMatrix) -> Dict[str, Dict[str, float]]:
+    """Headcount and attendance rate for every department"""
+    codes = matrix.department_codes.astype(np.intp)
+    ndept = len(matrix.departments)
+    headcount = np.bincount(codes, minlength=ndept)
+    present = np.bincount(codes, weights=present_days(matrix), minlength=ndept)
+    return {
+        dept: {
+            'headcount': int(headcount[i]),
+            'attendance_rate': float(present[i] / (headcount[i] * matrix.days)) * 100
+                               if headcount[i] > 0 else 0.0,
+        }
+        for i, dept in enumerate(matrix.departments)
+    }
+
+
+def attendance_trend(matrix: AttendanceMatrix,
+                     department: Optional[str] = None) -> Trend:
+    """Daily attendance rate over the range with a least-squares trend line"""
+    if department is not None:
+        matrix = matrix.select(department)
+    days = np.arange(np.datetime64(matrix.start, 'D'),
+                     np.datetime64(matrix.end, 'D') + 1)
+    headcount = len(matrix.employee_ids)
+    if headcount == 0:
+        return Trend(days, np.zeros(matrix.days), 0.0, 0.0)
+
+    rates = daily_present_counts(matrix) * (100.0 / headcount)
+    if matrix.days < 2:
+        return Trend(days, rates, 0.0, float(rates[0]))
+    slope, intercept = np.polyfit(np.arange(matrix.days), rates, 1)
+    return Trend(days, rates, float(slope), float(intercept))
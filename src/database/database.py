@@ -1,14 +1,120 @@
+import hashlib
 import sqlite3
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+from pathlib import Path
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+# Editable employee columns, in the order used by update_employees_bulk
+EMPLOYEE_FIELDS = ('name', 'gender', 'email', 'department')
+
+# Dates are stored as DAYNUM (days since 1970-01-01) and times as EPOCH
+# (seconds since 1970-01-01 UTC). The adapters and converters below map them
+# to and from Python date/datetime objects on every connection.
+EPOCH_DATE = date(1970, 1, 1)
+
+# SQL for today's day number in local time, used as a column default
+TODAY_DAYNUM = "CAST(julianday('now', 'localtime') - 2440587.5 AS INTEGER)"
+
+# How the TEXT date/time columns of older files are converted to integers
+LEGACY_CONVERSIONS = {
+    # CURRENT_TIMESTAMP wrote UTC
+    ('employees', 'created_at'): "CAST(strftime('%s', {column}) AS INTEGER)",
+    ('shifts', 'assigned_date'): "CAST(julianday({column}) - 2440587.5 AS INTEGER)",
+    ('attendance', 'date'): "CAST(julianday({column}) - 2440587.5 AS INTEGER)",
+    # log_activity wrote local time
+    ('activity_log', 'timestamp'): "CAST(strftime('%s', {column}, 'utc') AS INTEGER)",
+}
+
+# Tables replicated between sites and the data columns of each. Every write
+# to them is recorded in sync_log by triggers (see create_sync_triggers).
+SYNC_TABLES = {
+    'employees': ('name', 'gender', 'email', 'department', 'created_at'),
+    'shifts': ('employee_id', 'shift_type', 'assigned_date'),
+    'attendance': ('employee_id', 'date', 'present'),
+}
+
+# SQL for the current time in milliseconds, the resolution of change versions
+SYNC_CLOCK_MS = "CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER)"
+
+# Rows read per step while computing the sync baseline digest
+BASELINE_FETCH_SIZE = 10000
+
+# Tables and indexes missing from files created by older versions until they
+# are opened read-write once
+SCHEMA_OBJECTS = ('employees', 'shifts', 'attendance', 'activity_log', 'time_entries',
+                  'maintenance_log', 'sync_state', 'sync_log', 'sync_aliases',
+                  'sync_peers', 'idx_attendance_employee_date', 'idx_time_entries_range')
+
+def converted_column(table: str, column: str) -> str:
+    """SQL reading a column, converting legacy TEXT dates and times"""
+    conversion = LEGACY_CONVERSIONS.get((table, column))
+    if not conversion:
+        return column
+    return (f"CASE WHEN typeof({column}) = 'text' "
+            f"THEN {conversion.format(column=column)} ELSE {column} END")
+
+def adapt_date(value: date) -> int:
+    return (value - EPOCH_DATE).days
+
+def adapt_datetime(value: datetime) -> int:
+    return int(value.timestamp())
+
+def convert_daynum(value: bytes) -> date:
+    try:
+        return EPOCH_DATE + timedelta(days=int(value))
+    except ValueError:
+        return date.fromisoformat(value.decode()[:10])
+
+def convert_epoch(value: bytes) -> datetime:
+    try:
+        return datetime.fromtimestamp(int(value))
+    except ValueError:
+        return datetime.fromisoformat(value.decode())
+
+def to_date(value: Union[date, str]) -> date:
+    """Accept a date or an ISO 'YYYY-MM-DD' string"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    return value
+
+sqlite3.register_adapter(date, adapt_date)
+sqlite3.register_adapter(datetime, adapt_datetime)
+sqlite3.register_converter('DAYNUM', convert_daynum)
+sqlite3.register_converter('EPOCH', convert_epoch)
 
 class Database:
-    def __init__(self):
-        self.conn = sqlite3.connect('employee_management.db')
-        self.cursor = self.conn.cursor()
-        self.create_tables()
+    def __init__(self, db_path: str = 'employee_management.db', readonly: bool = False,
+                 setup_schema: bool = True):
+        self.db_path = db_path
+        self.readonly = readonly
+        # Views the date-range readers use instead of a table, set while an
+        # archive is attached (see Archiver.attach)
+        self.history_views = {}
+        if readonly:
+            # Read-only connections never create or migrate the schema
+            uri = f'{Path(db_path).resolve().as_uri()}?mode=ro'
+            self.conn = sqlite3.connect(uri, uri=True,
+                                        detect_types=sqlite3.PARSE_DECLTYPES)
+            self.cursor = self.conn.cursor()
+        else:
+            self.conn = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES)
+            self.cursor = self.conn.cursor()
+            # setup_schema=False is for extra connections to a file that
+            # another connection of the process has already set up
+            if setup_schema:
+                # Only takes effect on new files; lets maintenance return free
+                # pages to the file system a few at a time
+                self.cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+                # WAL lets readers on other connections run alongside a writer
+                self.cursor.execute('PRAGMA journal_mode = WAL')
+                self.create_tables()
+                self.migrate_schema()
+        # Must be enabled per connection for the ON DELETE CASCADE rules
+        self.cursor.execute('PRAGMA foreign_keys = ON')
 
-    def create_tables(self):
+    def create_tables(self, commit: bool = True, triggers: bool = True):
         # Employees table
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS employees (
@@ -17,18 +123,18 @@ class Database:
                 gender TEXT NOT NULL CHECK(gender IN ('Male', 'Female')),
                 email TEXT UNIQUE NOT NULL,
                 department TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at EPOCH DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
             )
         ''')
 
         # Shifts table
-        self.cursor.execute('''
+        self.cursor.execute(f'''
             CREATE TABLE IF NOT EXISTS shifts (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 employee_id INTEGER,
                 shift_type TEXT NOT NULL,
-                assigned_date DATE DEFAULT CURRENT_DATE,
-                FOREIGN KEY (employee_id) REFERENCES employees (id)
+                assigned_date DAYNUM DEFAULT ({TODAY_DAYNUM}),
+                FOREIGN KEY (employee_id) REFERENCES employees (id) ON DELETE CASCADE
             )
         ''')
 
@@ -37,9 +143,9 @@ class Database:
             CREATE TABLE IF NOT EXISTS attendance (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 employee_id INTEGER,
-                date DATE NOT NULL,
+                date DAYNUM NOT NULL,
                 present BOOLEAN NOT NULL,
-                FOREIGN KEY (employee_id) REFERENCES employees (id)
+                FOREIGN KEY (employee_id) REFERENCES employees (id) ON DELETE CASCADE
             )
         ''')
 
@@ -49,23 +155,377 @@ class Database:
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 action_type TEXT NOT NULL,
                 description TEXT NOT NULL,
-                timestamp TIMESTAMP NOT NULL
+                timestamp EPOCH NOT NULL
+            )
+        ''')
+
+        # Clock-in/clock-out intervals; clock_out stays NULL while on the clock
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS time_entries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                employee_id INTEGER NOT NULL,
+                shift_id INTEGER,
+                clock_in EPOCH NOT NULL,
+                clock_out EPOCH,
+                FOREIGN KEY (employee_id) REFERENCES employees (id) ON DELETE CASCADE,
+                FOREIGN KEY (shift_id) REFERENCES shifts (id) ON DELETE SET NULL,
+                CHECK (clock_out IS NULL OR clock_out >= clock_in)
+            )
+        ''')
+
+        # Duration and reclaimed space of each idle-time maintenance step
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS maintenance_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                step TEXT NOT NULL,
+                started_at EPOCH NOT NULL,
+                duration_ms REAL NOT NULL,
+                reclaimed_bytes INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL,
+                detail TEXT
+            )
+        ''')
+
+        # One row describing this site: its id in change keys, whether
+        # writes are currently recorded in sync_log, and the digest of the
+        # rows that existed when recording started (see create_sync_state)
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sync_state (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                site_id TEXT NOT NULL,
+                capture BOOLEAN NOT NULL DEFAULT 1,
+                baseline TEXT
+            )
+        ''')
+
+        # Latest change of every replicated row. A row keeps its key for
+        # life; each change replaces its entry under a new, higher seq, and
+        # deleted rows leave a 'delete' entry behind. The triggers insert
+        # the new entry before removing the old one, since an upsert's
+        # conflict policy would override INSERT OR REPLACE inside them.
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sync_log (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                table_name TEXT NOT NULL,
+                row_id INTEGER,
+                key TEXT NOT NULL,
+                op TEXT NOT NULL CHECK (op IN ('upsert', 'delete')),
+                changed_at INTEGER NOT NULL,
+                origin TEXT NOT NULL
             )
         ''')
 
+        # Keys of other sites that were merged into an existing local row
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sync_aliases (
+                table_name TEXT NOT NULL,
+                key TEXT NOT NULL,
+                row_id INTEGER NOT NULL,
+                PRIMARY KEY (table_name, key)
+            )
+        ''')
+
+        # Highest seq of each other site applied here
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sync_peers (
+                site_id TEXT PRIMARY KEY,
+                last_seq INTEGER NOT NULL,
+                synced_at EPOCH NOT NULL
+            )
+        ''')
+
+        # Indexes backing the analytics GROUP BY queries
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_employees_department
+            ON employees (department)
+        ''')
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_attendance_date
+            ON attendance (date, employee_id, present)
+        ''')
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_shifts_assigned_date
+            ON shifts (assigned_date, shift_type, employee_id)
+        ''')
+
+        # Prefix search of the employee picker, paged by (name, id)
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_employees_name
+            ON employees (name COLLATE NOCASE, id)
+        ''')
+
+        # Time entry range scans, covering every column the timesheet loads
+        # so a month of entries is read in index order without table
+        # lookups, and at most one open entry per employee
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_time_entries_range
+            ON time_entries (clock_in, employee_id, shift_id, clock_out)
+        ''')
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_time_entries_employee
+            ON time_entries (employee_id, clock_in)
+        ''')
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_time_entries_shift
+            ON time_entries (shift_id)
+        ''')
+        self.cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_time_entries_open
+            ON time_entries (employee_id) WHERE clock_out IS NULL
+        ''')
+
+        # Keyset pagination of the shift history
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_shifts_date_id
+            ON shifts (assigned_date, id)
+        ''')
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_shifts_employee
+            ON shifts (employee_id, assigned_date)
+        ''')
+
+        # Change log lookups by row and by key; delta scans use the seq
+        # primary key, as every index here slows down each logged write
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_sync_log_row
+            ON sync_log (table_name, row_id)
+        ''')
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_sync_log_key
+            ON sync_log (table_name, key)
+        ''')
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_sync_aliases_row
+            ON sync_aliases (table_name, row_id)
+        ''')
+
+        self.create_sync_state()
+        if triggers:
+            self.create_sync_triggers()
+
+        if commit:
+            self.conn.commit()
+
+    def create_sync_state(self):
+        # A new site gets a random id. Rows that already exist are logged
+        # under the shared prefix '0:', which is only right for sites that
+        # started as copies of the same file. Their digest is kept, and
+        # Synchronizer refuses deltas from a site whose digest differs.
+        self.cursor.execute('''
+            INSERT OR IGNORE INTO sync_state (id, site_id)
+            VALUES (1, lower(hex(randomblob(8))))
+        ''')
+        if not self.cursor.rowcount:
+            return
+        self.cursor.execute('UPDATE sync_state SET baseline = ?', (self.sync_baseline(),))
+        for table in SYNC_TABLES:
+            self.cursor.execute(f'''
+                INSERT INTO sync_log (table_name, row_id, key, op, changed_at, origin)
+                SELECT '{table}', id, '0:' || id, 'upsert', 0, '0' FROM {table}
+            ''')
+
+    def sync_baseline(self) -> Optional[str]:
+        """Digest of every replicated row, None when there are none
+
+        Legacy TEXT dates are read converted, so a copy of the file that was
+        already upgraded gives the same digest.
+        """
+        digest = hashlib.sha256()
+        rows = 0
+        cursor = self.conn.cursor()
+        for table, columns in SYNC_TABLES.items():
+            values = ', '.join(converted_column(table, column) for column in ('id',) + columns)
+            # Expressions have no declared type, so values arrive unconverted
+            cursor.execute(f'SELECT {values} FROM {table} ORDER BY id')
+            digest.update(table.encode())
+            while True:
+                chunk = cursor.fetchmany(BASELINE_FETCH_SIZE)
+                if not chunk:
+                    break
+                rows += len(chunk)
+                digest.update(''.join(f'{row!r}\n' for row in chunk).encode())
+        cursor.close()
+        return digest.hexdigest() if rows else None
+
+    def create_sync_triggers(self):
+        """Record inserts, real updates and deletes of the replicated tables"""
+        for table, columns in SYNC_TABLES.items():
+            for event, row, op in (('INSERT', 'NEW', 'upsert'), ('UPDATE', 'NEW', 'upsert'),
+                                   ('DELETE', 'OLD', 'delete')):
+                condition = '(SELECT capture FROM sync_state)'
+                if event == 'UPDATE':
+                    old = ', '.join(f'OLD.{column}' for column in columns)
+                    new = ', '.join(f'NEW.{column}' for column in columns)
+                    condition += f' AND ({old}) IS NOT ({new})'
+                if event == 'INSERT':
+                    # AUTOINCREMENT never reuses an id, so a new row has no
+                    # entry to look up or replace; skipping both keeps bulk
+                    # inserts such as badge ingest fast
+                    key = f"site_id || ':' || {row}.id"
+                    replace = ''
+                else:
+                    key = f'''COALESCE((SELECT key FROM sync_log
+                                         WHERE table_name = '{table}'
+                                         AND row_id = {row}.id),
+                                        site_id || ':' || {row}.id)'''
+                    replace = f'''DELETE FROM sync_log
+                        WHERE table_name = '{table}' AND row_id = {row}.id
+                        AND seq < (SELECT MAX(seq) FROM sync_log);'''
+                self.cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS sync_{table}_{event.lower()}
+                    AFTER {event} ON {table}
+                    WHEN {condition}
+                    BEGIN
+                        INSERT INTO sync_log
+                            (table_name, row_id, key, op, changed_at, origin)
+                        SELECT '{table}', {row}.id, {key},
+                               '{op}', {SYNC_CLOCK_MS}, site_id
+                        FROM sync_state;
+                        {replace}
+                    END
+                ''')
+
+    def set_change_capture(self, enabled: bool):
+        """Turn change logging on or off inside the current transaction
+
+        Used for writes that are local housekeeping rather than changes to
+        share with other sites, such as archiving.
+        """
+        self.cursor.execute('UPDATE sync_state SET capture = ?', (enabled,))
+
+    def migrate_schema(self):
+        """Upgrade database files created by older versions of the application"""
+        if self.needs_rebuild():
+            self.rebuild_tables()
+        self.migrate_unique_attendance()
+        self.migrate_sync_capture()
+        # Replaced by the covering idx_time_entries_range
+        self.cursor.execute('DROP INDEX IF EXISTS idx_time_entries_clock_in')
+
+    def needs_migration(self) -> bool:
+        """Whether migrate_schema still has work to do on this file
+
+        Read-only connections skip the migration, and on an old file their
+        date filters and upserts would silently match nothing.
+        """
+        self.cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'index')")
+        names = {row[0] for row in self.cursor.fetchall()}
+        return not names.issuperset(SCHEMA_OBJECTS) or self.needs_rebuild()
+
+    def needs_rebuild(self) -> bool:
+        # Shifts and attendance used to reference employees without ON DELETE
+        # CASCADE, and dates and times used to be stored as TEXT
+        self.cursor.execute('PRAGMA foreign_key_list(shifts)')
+        if not all(fk[6] == 'CASCADE' for fk in self.cursor.fetchall()):
+            return True
+        for table, column in LEGACY_CONVERSIONS:
+            self.cursor.execute(f'PRAGMA table_info({table})')
+            if any(col[1] == column and col[2] not in ('DAYNUM', 'EPOCH')
+                   for col in self.cursor.fetchall()):
+                return True
+        return False
+
+    def rebuild_tables(self):
+        """Recreate every table with the current schema and copy the rows over
+
+        SQLite cannot alter a constraint or a column type, so old tables are
+        renamed, recreated by create_tables and refilled, converting TEXT
+        dates and times to day numbers and epoch seconds on the way.
+        """
+        tables = ('employees', 'shifts', 'attendance', 'activity_log', 'time_entries')
+        self.cursor.execute('BEGIN')
+        try:
+            for table in tables:
+                self.cursor.execute(f'ALTER TABLE {table} RENAME TO _{table}_old')
+                self.cursor.execute('''
+                    SELECT type, name FROM sqlite_master
+                    WHERE type IN ('index', 'trigger') AND tbl_name = ?
+                    AND sql IS NOT NULL
+                ''', (f'_{table}_old',))
+                for kind, name in self.cursor.fetchall():
+                    self.cursor.execute(f'DROP {kind.upper()} {name}')
+
+            # Copying keeps the ids, so the change log stays valid; the
+            # triggers are added afterwards so the copy is not logged
+            self.create_tables(commit=False, triggers=False)
+
+            for table in tables:
+                self.cursor.execute(f'PRAGMA table_info(_{table}_old)')
+                columns = [col[1] for col in self.cursor.fetchall()]
+                values = [converted_column(table, column) for column in columns]
+                self.cursor.execute(f'''
+                    INSERT INTO {table} ({', '.join(columns)})
+                    SELECT {', '.join(values)} FROM _{table}_old
+                ''')
+            # Children first, so no foreign key points at a dropped table
+            for table in reversed(tables):
+                self.cursor.execute(f'DROP TABLE _{table}_old')
+            self.create_sync_triggers()
+            self.conn.commit()
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+
+    def migrate_unique_attendance(self):
+        # One attendance row per employee and day, so upserts replace the earlier mark instead of adding a duplicate.
+        self.cursor.execute('''
+            SELECT 1 FROM sqlite_master
+            WHERE type = 'index' AND name = 'idx_attendance_employee_date'
+        ''')
+        if self.cursor.fetchone():
+            return
+        try:
+            self.cursor.execute('''
+                DELETE FROM attendance
+                WHERE id NOT IN (
+                    SELECT MAX(id) FROM attendance GROUP BY employee_id, date
+                )
+            ''')
+            self.cursor.execute('''
+                CREATE UNIQUE INDEX idx_attendance_employee_date
+                ON attendance (employee_id, date)
+            ''')
+            self.conn.commit()
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+
+    def migrate_sync_capture(self):
+        # Files that started logging changes before the baseline digest
+        # have none, and are not checked against other sites
+        self.cursor.execute('PRAGMA table_info(sync_state)')
+        if 'baseline' not in {col[1] for col in self.cursor.fetchall()}:
+            self.cursor.execute('ALTER TABLE sync_state ADD COLUMN baseline TEXT')
+        # Insert triggers used to look up and replace a log entry that a new
+        # row never has
+        self.cursor.execute('''
+            SELECT name FROM sqlite_master
+            WHERE type = 'trigger' AND name LIKE 'sync%insert'
+            AND sql LIKE '%DELETE FROM sync_log%'
+        ''')
+        outdated = [row[0] for row in self.cursor.fetchall()]
+        for name in outdated:
+            self.cursor.execute(f'DROP TRIGGER {name}')
+        if outdated:
+            self.create_sync_triggers()
+        self.cursor.execute('DROP INDEX IF EXISTS idx_sync_log_table_seq')
         self.conn.commit()
 
     def close(self):
         self.conn.close()
 
-    def log_activity(self, action_type: str, description: str):
+    def history(self, table: str) -> str:
+        """Name to read dated rows of a table from, archived rows included"""
+        return self.history_views.get(table, table)
+
+    def log_activity(self, action_type: str, description: str, commit: bool = True):
         """Log an activity for real-time updates"""
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         self.cursor.execute('''
             INSERT INTO activity_log (action_type, description, timestamp)
             VALUES (?, ?, ?)
-        ''', (action_type, description, current_time))
-        self.conn.commit()
+        ''', (action_type, description, datetime.now()))
+        if commit:
+            self.conn.commit()
 
     # Employee Management Methods
     def add_employee(self, name: str, gender: str, email: str, department: str) -> bool:
@@ -80,6 +540,28 @@ class Database:
         except sqlite3.IntegrityError:
             return False
 
+    def add_employees(self, employees: List[Tuple[str, str, str, str]]) -> int:
+        """Add (name, gender, email, department) rows in one transaction
+
+        Rows with a duplicate email or an invalid gender are skipped. Returns
+        the number of employees added.
+        """
+        try:
+            self.cursor.executemany('''
+                INSERT OR IGNORE INTO employees (name, gender, email, department)
+                VALUES (?, ?, ?, ?)
+            ''', employees)
+            # rowcount leaves out the change log rows written by triggers
+            added = self.cursor.rowcount
+            if added:
+                self.log_activity('employee_added', f'{added} employees imported',
+                                  commit=False)
+            self.conn.commit()
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+        return added
+
     def get_all_employees(self) -> List[tuple]:
         self.cursor.execute('SELECT * FROM employees')
         return self.cursor.fetchall()
@@ -88,6 +570,40 @@ class Database:
         self.cursor.execute('SELECT * FROM employees WHERE id = ?', (employee_id,))
         return self.cursor.fetchone()
 
+    def search_employees(self, prefix: str = '', after: Optional[tuple] = None,
+                         through: Optional[tuple] = None,
+                         limit: Optional[int] = 50) -> List[tuple]:
+        """Get (id, name, department) of employees whose name starts with prefix
+
+        Matching ignores ASCII case and rows are ordered by name, then id. To
+        page, pass the (name, id) of the last row returned as `after`;
+        `through` stops at an inclusive (name, id) instead of a row count.
+        """
+        conditions = []
+        params = []
+        if prefix:
+            # A half-open range on the NOCASE index instead of LIKE 'x%';
+            # NOCASE only folds ASCII letters, so lower only those
+            prefix = ''.join(c.lower() if c.isascii() else c for c in prefix)
+            conditions.append('name >= ? COLLATE NOCASE AND name < ? COLLATE NOCASE')
+            params.extend([prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)])
+        if after is not None:
+            conditions.append('(name COLLATE NOCASE, id) > (?, ?)')
+            params.extend(after)
+        if through is not None:
+            conditions.append('(name COLLATE NOCASE, id) <= (?, ?)')
+            params.extend(through)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+        self.cursor.execute(f'''
+            SELECT id, name, department
+            FROM employees
+            {where}
+            ORDER BY name COLLATE NOCASE, id
+            LIMIT ?
+        ''', params + [-1 if limit is None else limit])
+        return self.cursor.fetchall()
+
     def update_employee(self, id: int, name: str, gender: str, email: str, department: str) -> bool:
         try:
             self.cursor.execute('''
@@ -101,15 +617,107 @@ class Database:
         except sqlite3.IntegrityError:
             return False
 
+    def update_employees_bulk(self, updates: List[Dict[str, Any]]) -> Tuple[int, Dict[int, str]]:
+        """Apply several employee updates in one executemany transaction
+
+        Each update is a dict with an 'id' and any of 'name', 'gender', 'email'
+        and 'department'; fields that are left out keep their current value.
+        Rows that would violate the unique email constraint (or carry an
+        invalid gender) are skipped and reported. Returns the number of rows
+        updated and a dict of employee id -> conflict reason.
+        """
+        conflicts = {}
+        for update in updates:
+            unknown = set(update) - set(EMPLOYEE_FIELDS) - {'id'}
+            if unknown:
+                raise ValueError(f'Unknown employee fields: {", ".join(sorted(unknown))}')
+            if update.get('gender') not in (None, 'Male', 'Female'):
+                conflicts[update['id']] = f"Invalid gender: {update['gender']}"
+
+        # Emails must be unique within the batch and against other employees
+        claimed = {}
+        for update in updates:
+            email = update.get('email')
+            if email is None or update['id'] in conflicts:
+                continue
+            if email in claimed and claimed[email] != update['id']:
+                conflicts[update['id']] = f'Email {email} is also assigned to employee {claimed[email]}'
+            else:
+                claimed[email] = update['id']
+        emails = list(claimed)
+        for i in range(0, len(emails), 500):
+            chunk = emails[i:i + 500]
+            self.cursor.execute(f'''
+                SELECT id, email FROM employees
+                WHERE email IN ({', '.join('?' * len(chunk))})
+            ''', chunk)
+            for owner_id, email in self.cursor.fetchall():
+                if claimed[email] != owner_id:
+                    conflicts[claimed[email]] = f'Email {email} already belongs to employee {owner_id}'
+
+        rows = [tuple(update.get(field) for field in EMPLOYEE_FIELDS) + (update['id'],)
+                for update in updates if update['id'] not in conflicts]
+        if not rows:
+            return 0, conflicts
+
+        try:
+            self.cursor.executemany('''
+                UPDATE employees
+                SET name = COALESCE(?, name),
+                    gender = COALESCE(?, gender),
+                    email = COALESCE(?, email),
+                    department = COALESCE(?, department)
+                WHERE id = ?
+            ''', rows)
+            updated = self.cursor.rowcount
+            changed = sorted({field for update in updates for field in update if field != 'id'})
+            self.log_activity('employee_updated',
+                              f'{updated} employees updated ({", ".join(changed)})',
+                              commit=False)
+            self.conn.commit()
+        except sqlite3.IntegrityError as e:
+            self.conn.rollback()
+            return 0, {**conflicts, **{row[-1]: str(e) for row in rows}}
+        return updated, conflicts
+
     def delete_employee(self, id: int):
-        employee = self.get_employee_by_id(id)
-        if employee:
-            # First delete related records to maintain referential integrity
-            self.cursor.execute('DELETE FROM attendance WHERE employee_id=?', (id,))
-            self.cursor.execute('DELETE FROM shifts WHERE employee_id=?', (id,))
-            self.cursor.execute('DELETE FROM employees WHERE id=?', (id,))
+        self.delete_employees([id])
+
+    def delete_employees(self, ids: List[int]) -> int:
+        """Delete employees with their shifts and attendance in one transaction
+
+        Related rows are removed by the ON DELETE CASCADE foreign keys. Returns
+        the number of employees deleted.
+        """
+        self.cursor.execute('CREATE TEMP TABLE IF NOT EXISTS delete_ids (id INTEGER PRIMARY KEY)')
+        try:
+            self.cursor.execute('DELETE FROM delete_ids')
+            self.cursor.executemany('INSERT OR IGNORE INTO delete_ids (id) VALUES (?)',
+                                    ((id,) for id in ids))
+            self.cursor.execute('''
+                SELECT name FROM employees
+                WHERE id IN (SELECT id FROM delete_ids)
+                ORDER BY name
+            ''')
+            names = [name for (name,) in self.cursor.fetchall()]
+            if not names:
+                self.conn.rollback()
+                return 0
+
+            self.cursor.execute('DELETE FROM employees WHERE id IN (SELECT id FROM delete_ids)')
+            self.cursor.execute('DELETE FROM delete_ids')
+            if len(names) == 1:
+                description = f'Employee deleted: {names[0]}'
+            else:
+                shown = ', '.join(names[:5])
+                more = f' and {len(names) - 5} more' if len(names) > 5 else ''
+                description = f'{len(names)} employees deleted: {shown}{more}'
+            self.log_activity('employee_deleted', description, commit=False)
             self.conn.commit()
-            self.log_activity('employee_deleted', f'Employee deleted: {employee[1]}')
+            return len(names)
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
 
     def get_gender_stats(self) -> Dict[str, float]:
         """Get gender distribution statistics"""
@@ -144,49 +752,193 @@ class Database:
         ''')
         return self.cursor.fetchall()
 
+    def get_shifts(self, start: Optional[date] = None, end: Optional[date] = None,
+                   employee_id: Optional[int] = None, shift_type: Optional[str] = None,
+                   after: Optional[tuple] = None, limit: int = 100) -> List[tuple]:
+        """Get one page of shifts, newest first
+
+        Rows have the same shape as get_all_shifts. To fetch the next page pass
+        the (assigned_date, id) of the last row returned as `after`.
+        """
+        conditions = []
+        params = []
+        if start is not None:
+            conditions.append('s.assigned_date >= ?')
+            params.append(to_date(start))
+        if end is not None:
+            conditions.append('s.assigned_date <= ?')
+            params.append(to_date(end))
+        if employee_id is not None:
+            conditions.append('s.employee_id = ?')
+            params.append(employee_id)
+        if shift_type is not None:
+            conditions.append('s.shift_type = ?')
+            params.append(shift_type)
+        if after is not None:
+            conditions.append('(s.assigned_date, s.id) < (?, ?)')
+            params.extend(after)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+        self.cursor.execute(f'''
+            SELECT s.id, e.name, s.shift_type, s.assigned_date
+            FROM {self.history('shifts')} s
+            JOIN employees e ON s.employee_id = e.id
+            {where}
+            ORDER BY s.assigned_date DESC, s.id DESC
+            LIMIT ?
+        ''', params + [limit])
+        return self.cursor.fetchall()
+
     # Attendance Management Methods
     def mark_attendance(self, employee_id: int, date: str, present: bool):
         employee = self.get_employee_by_id(employee_id)
         if employee:
             self.cursor.execute('''
-                INSERT OR REPLACE INTO attendance (employee_id, date, present)
+                INSERT INTO attendance (employee_id, date, present)
                 VALUES (?, ?, ?)
-            ''', (employee_id, date, present))
+                ON CONFLICT (employee_id, date) DO UPDATE SET present = excluded.present
+            ''', (employee_id, to_date(date), present))
             self.conn.commit()
             status = "present" if present else "absent"
             self.log_activity('attendance_marked', 
                             f'Marked {employee[1]} as {status}')
 
+    def mark_attendance_bulk(self, date: str, changes: Dict[int, bool]) -> int:
+        """Mark several employees present/absent on one day in one transaction"""
+        if not changes:
+            return 0
+        day = to_date(date)
+        try:
+            self.cursor.executemany('''
+                INSERT INTO attendance (employee_id, date, present)
+                SELECT ?, ?, ?
+                WHERE EXISTS (SELECT 1 FROM employees WHERE id = ?)
+                ON CONFLICT (employee_id, date) DO UPDATE SET present = excluded.present
+            ''', ((employee_id, day, present, employee_id)
+                  for employee_id, present in changes.items()))
+            marked = self.cursor.rowcount
+            present_count = sum(1 for present in changes.values() if present)
+            self.log_activity('attendance_marked',
+                              f'Attendance updated for {day}: {present_count} present, '
+                              f'{len(changes) - present_count} absent',
+                              commit=False)
+            self.conn.commit()
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+        return marked
+
     def get_attendance_by_date(self, date: str) -> List[tuple]:
         self.cursor.execute('''
             SELECT a.id, e.id, e.name, a.present
             FROM attendance a 
             JOIN employees e ON a.employee_id = e.id 
             WHERE a.date=?
-        ''', (date,))
+        ''', (to_date(date),))
+        return self.cursor.fetchall()
+
+    # Time Tracking Methods
+    def clock_in(self, employee_id: int, when: Optional[datetime] = None,
+                 shift_id: Optional[int] = None) -> Optional[int]:
+        """Open a time entry; returns its id, or None if the employee is
+        unknown or already clocked in
+
+        Without a shift_id the entry is linked to the latest shift assigned
+        to the employee on the day of `when`, if there is one.
+        """
+        employee = self.get_employee_by_id(employee_id)
+        if not employee:
+            return None
+        when = when or datetime.now()
+        if shift_id is None:
+            self.cursor.execute('''
+                SELECT id FROM shifts
+                WHERE employee_id = ? AND assigned_date = ?
+                ORDER BY id DESC
+                LIMIT 1
+            ''', (employee_id, when.date()))
+            row = self.cursor.fetchone()
+            shift_id = row[0] if row else None
+        try:
+            self.cursor.execute('''
+                INSERT INTO time_entries (employee_id, shift_id, clock_in)
+                VALUES (?, ?, ?)
+            ''', (employee_id, shift_id, when))
+            entry_id = self.cursor.lastrowid
+            self.log_activity('clocked_in', f'{employee[1]} clocked in', commit=False)
+            self.conn.commit()
+            return entry_id
+        except sqlite3.IntegrityError:
+            self.conn.rollback()
+            return None
+
+    def clock_out(self, employee_id: int, when: Optional[datetime] = None) -> bool:
+        """Close the employee's open time entry; False if there is none"""
+        try:
+            self.cursor.execute('''
+                UPDATE time_entries SET clock_out = ?
+                WHERE employee_id = ? AND clock_out IS NULL
+            ''', (when or datetime.now(), employee_id))
+            if not self.cursor.rowcount:
+                self.conn.rollback()
+                return False
+            employee = self.get_employee_by_id(employee_id)
+            self.log_activity('clocked_out', f'{employee[1]} clocked out', commit=False)
+            self.conn.commit()
+            return True
+        except sqlite3.IntegrityError:
+            # clock_out before clock_in
+            self.conn.rollback()
+            return False
+
+    def get_time_entries(self, start: date, end: date,
+                         employee_id: Optional[int] = None) -> List[tuple]:
+        """Get time entries that began between start and end (inclusive)
+
+        Rows are (id, employee_id, employee name, shift_id, shift_type,
+        clock_in, clock_out); clock_out is None while the entry is open.
+        """
+        params = [datetime.combine(to_date(start), datetime.min.time()),
+                  datetime.combine(to_date(end) + timedelta(days=1), datetime.min.time())]
+        employee_filter = ''
+        if employee_id is not None:
+            employee_filter = 'AND t.employee_id = ?'
+            params.append(employee_id)
+        self.cursor.execute(f'''
+            SELECT t.id, t.employee_id, e.name, t.shift_id, s.shift_type,
+                   t.clock_in, t.clock_out
+            FROM {self.history('time_entries')} t
+            JOIN employees e ON e.id = t.employee_id
+            LEFT JOIN {self.history('shifts')} s ON s.id = t.shift_id
+            WHERE t.clock_in >= ? AND t.clock_in < ? {employee_filter}
+            ORDER BY t.clock_in, t.id
+        ''', params)
         return self.cursor.fetchall()
 
     def get_attendance_stats(self) -> List[tuple]:
         """Get attendance statistics with proper employee count"""
+        today = datetime.now().date()
         self.cursor.execute('''
-            WITH RECURSIVE dates(date) AS (
-                SELECT date('now', '-29 days')
+            WITH RECURSIVE days(day) AS (
+                SELECT ?
                 UNION ALL
-                SELECT date(date, '+1 day')
-                FROM dates
-                WHERE date < date('now')
+                SELECT day + 1
+                FROM days
+                WHERE day < ?
             )
             SELECT 
-                dates.date,
+                days.day,
                 COUNT(DISTINCT e.id) as total_employees,
                 COUNT(DISTINCT CASE WHEN a.present THEN a.employee_id END) as present_count
-            FROM dates
+            FROM days
             CROSS JOIN employees e
-            LEFT JOIN attendance a ON a.employee_id = e.id AND a.date = dates.date
-            GROUP BY dates.date
-            ORDER BY dates.date DESC
-        ''')
-        return self.cursor.fetchall()
+            LEFT JOIN attendance a ON a.employee_id = e.id AND a.date = days.day
+            GROUP BY days.day
+            ORDER BY days.day DESC
+        ''', (today - timedelta(days=29), today))
+        # Day numbers computed in SQL carry no column type, so convert here
+        return [(EPOCH_DATE + timedelta(days=day), total, present)
+                for day, total, present in self.cursor.fetchall()]
 
     def get_dashboard_stats(self) -> Dict[str, Any]:
         # Get total employees
@@ -221,7 +973,126 @@ class Database:
         self.cursor.execute('''
             SELECT action_type, description, timestamp
             FROM activity_log
-            ORDER BY timestamp DESC
+            ORDER BY id DESC
             LIMIT ?
         ''', (limit,))
-        return self.cursor.fetchall() 
\ No newline at end of file
+        return self.cursor.fetchall()
+
+    def get_activities_since(self, last_id: int, limit: int = 10) -> List[tuple]:
+        """Get up to `limit` activities newer than last_id, newest first
+
+        Rows are (id, action_type, description, timestamp). The filter is a
+        range on the primary key, so when nothing is new it costs one probe.
+        """
+        self.cursor.execute('''
+            SELECT id, action_type, description, timestamp
+            FROM activity_log
+            WHERE id > ?
+            ORDER BY id DESC
+            LIMIT ?
+        ''', (last_id, limit))
+        return self.cursor.fetchall()
+
+    # Analytics Methods
+    def get_departments(self) -> List[str]:
+        self.cursor.execute('SELECT DISTINCT department FROM employees ORDER BY department')
+        return [department for (department,) in self.cursor.fetchall()]
+
+    def get_employee_attendance(self, start: date, end: date,
+                                department: Optional[str] = None) -> List[tuple]:
+        """Get (id, name, department, days present, days marked absent) per employee"""
+        dept_filter = 'WHERE e.department = ?' if department else ''
+        params = (department,) if department else ()
+        self.cursor.execute(f'''
+            SELECT e.id, e.name, e.department,
+                   COUNT(CASE WHEN a.present THEN 1 END),
+                   COUNT(CASE WHEN NOT a.present THEN 1 END)
+            FROM employees e
+            LEFT JOIN {self.history('attendance')} a
+                ON a.employee_id = e.id AND a.date BETWEEN ? AND ?
+            {dept_filter}
+            GROUP BY e.id
+            ORDER BY e.name, e.id
+        ''', (start, end) + params)
+        return self.cursor.fetchall()
+
+    def get_daily_present_counts(self, start: date, end: date,
+                                 department: Optional[str] = None) -> List[tuple]:
+        """Get (date, employees present) for the days that have attendance"""
+        dept_filter = 'AND e.department = ?' if department else ''
+        params = (department,) if department else ()
+        self.cursor.execute(f'''
+            SELECT a.date, COUNT(*)
+            FROM {self.history('attendance')} a
+            JOIN employees e ON e.id = a.employee_id
+            WHERE a.date BETWEEN ? AND ? AND a.present {dept_filter}
+            GROUP BY a.date
+            ORDER BY a.date
+        ''', (start, end) + params)
+        return self.cursor.fetchall()
+
+    def get_headcount_trend(self, start: date, end: date,
+                            department: Optional[str] = None) -> List[tuple]:
+        """Get the number of employees on the books for each day of a range"""
+        dept_filter = 'WHERE department = ?' if department else ''
+        params = (department,) if department else ()
+        self.cursor.execute(f'''
+            SELECT CAST(julianday(created_at, 'unixepoch', 'localtime') - 2440587.5 AS INTEGER) AS day,
+                   COUNT(*)
+            FROM employees
+            {dept_filter}
+            GROUP BY day
+            ORDER BY day
+        ''', params)
+        joined = self.cursor.fetchall()
+
+        trend = []
+        headcount = 0
+        i = 0
+        for offset in range((end - start).days + 1):
+            day = start + timedelta(days=offset)
+            day_number = adapt_date(day)
+            while i < len(joined) and (joined[i][0] or 0) <= day_number:
+                headcount += joined[i][1]
+                i += 1
+            trend.append((day, headcount))
+        return trend
+
+    def get_shift_coverage(self, start: date, end: date,
+                           department: Optional[str] = None) -> List[tuple]:
+        """Get the number of assigned shifts per day and shift type"""
+        if department:
+            self.cursor.execute(f'''
+                SELECT s.assigned_date, s.shift_type, COUNT(*)
+                FROM {self.history('shifts')} s
+                JOIN employees e ON e.id = s.employee_id
+                WHERE s.assigned_date BETWEEN ? AND ? AND e.department = ?
+                GROUP BY s.assigned_date, s.shift_type
+                ORDER BY s.assigned_date, s.shift_type
+            ''', (start, end, department))
+        else:
+            self.cursor.execute(f'''
+                SELECT assigned_date, shift_type, COUNT(*)
+                FROM {self.history('shifts')}
+                WHERE assigned_date BETWEEN ? AND ?
+                GROUP BY assigned_date, shift_type
+                ORDER BY assigned_date, shift_type
+            ''', (start, end))
+        return self.cursor.fetchall()
+
+
+def open_readonly(db_path: str) -> Database:
+    """Open a read-only connection, upgrading an old file read-write first
+
+    Raises sqlite3.Error if the file needs upgrading but cannot be written.
+    """
+    db = Database(db_path, readonly=True)
+    try:
+        if not db.needs_migration():
+            return db
+    except sqlite3.Error:
+        db.close()
+        raise
+    db.close()
+    Database(db_path).close()
+    return Database(db_path, readonly=True)
@@ -0,0 +1,312 @@
+import argparse
+import queue
+import socketserver
+import sys
+import threading
+import time
+from collections import deque
+from datetime import date, datetime
+from typing import Dict, Iterable, Optional
+
+from src.database.database import Database
+
+# Events written per transaction at most
+BATCH_SIZE = 500
+
+# Seconds the writer waits for more events before committing a partial batch
+FLUSH_INTERVAL = 0.05
+
+# Events that may wait for the writer before submit() blocks
+QUEUE_SIZE = 10000
+
+# Ingest latencies kept for the percentile stats
+LATENCY_SAMPLES = 100000
+
+# Seconds between checks for a failed writer while waiting for queue room
+WRITER_CHECK_INTERVAL = 0.1
+
+_STOP = object()
+
+
+class AttendanceIngestor:
+    """Group-commit ingestion of badge check-ins into the attendance table
+
+    submit() dedupes check-ins per employee and day in memory and hands new
+    ones to a single writer thread through a bounded queue; when the writer
+    falls behind, submit() blocks (backpressure). The writer commits events
+    in batches of up to BATCH_SIZE with one executemany per transaction.
+
+    If the writer fails, `error` holds the exception, events still queued
+    are dropped, and submit() and flush() raise RuntimeError from then on.
+    """
+
+    def __init__(self, db_path: str = 'employee_management.db', batch_size: int = BATCH_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL, queue_size: int = QUEUE_SIZE):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(queue_size)
+        self.lock = threading.Lock()
+        self.seen = set()  # (employee_id, day) already queued or written
+        self.seen_day = None
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.counts = {'submitted': 0, 'duplicates': 0, 'written': 0,
+                       'unknown_employee': 0, 'batches': 0, 'dropped': 0}
+        self.writer = None
+        self.error = None
+
+    def start(self):
+        self.writer = threading.Thread(target=self.run_writer, name='attendance-ingest',
+                                       daemon=True)
+        self.writer.start()
+
+    def stop(self):
+        """Write everything still queued and stop the writer thread
+
+        Returns once the writer has exited, also when it had already failed;
+        check `error` to tell whether everything was written.
+        """
+        if self.writer is None:
+            return
+        # A failed writer takes nothing from the queue, so never wait on it
+        while self.error is None and self.writer.is_alive():
+            try:
+                self.queue.put(_STOP, timeout=WRITER_CHECK_INTERVAL)
+                break
+            except queue.Full:
+                pass
+        self.writer.join()
+        self.writer = None
+        if self.error is not None:
+            self.discard_queued()
+
+    def submit(self, employee_id: int, timestamp: Optional[datetime] = None,
+               timeout: Optional[float] = None) -> bool:
+        """Queue a check-in; returns False if it duplicates an earlier one
+
+        Blocks while the queue is full. Raises queue.Full if `timeout` seconds
+        pass without room becoming available, and RuntimeError if the writer
+        has failed.
+        """
+        self.check_writer()
+        day = (timestamp or datetime.now()).date()
+        key = (employee_id, day)
+        with self.lock:
+            self.counts['submitted'] += 1
+            # Only today's and yesterday's keys are kept once the day changes
+            today = date.today()
+            if self.seen_day != today:
+                self.seen = {k for k in self.seen if (today - k[1]).days <= 1}
+                self.seen_day = today
+            if key in self.seen:
+                self.counts['duplicates'] += 1
+                return False
+            self.seen.add(key)
+        event = (employee_id, day, time.perf_counter())
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            # Wait in short slices so a writer failing meanwhile is noticed
+            while True:
+                self.check_writer()
+                wait = WRITER_CHECK_INTERVAL
+                if deadline is not None:
+                    wait = min(wait, max(deadline - time.monotonic(), 0))
+                try:
+                    self.queue.put(event, timeout=wait)
+                    break
+                except queue.Full:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        raise
+        except (queue.Full, RuntimeError):
+            with self.lock:
+                self.seen.discard(key)
+            raise
+        if self.error is not None:
+            # The writer failed after its last drain; nobody else will
+            # take this event off the queue
+            self.discard_queued()
+            raise RuntimeError('attendance writer stopped') from self.error
+        return True
+
+    def submit_many(self, employee_ids: Iterable[int]) -> int:
+        """Queue several check-ins stamped now; returns how many were new"""
+        return sum(self.submit(employee_id) for employee_id in employee_ids)
+
+    def flush(self):
+        """Block until every queued check-in has been committed
+
+        Raises RuntimeError if the writer failed; what was still queued then
+        has been dropped rather than written.
+        """
+        self.queue.join()
+        self.check_writer()
+
+    def check_writer(self):
+        if self.error is not None:
+            raise RuntimeError('attendance writer stopped') from self.error
+
+    def discard_queued(self):
+        """Drop every queued event so nothing waits on a writer that is gone"""
+        while True:
+            try:
+                event = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            if event is not _STOP:
+                with self.lock:
+                    self.counts['dropped'] += 1
+            self.queue.task_done()
+
+    def run_writer(self):
+        db = None
+        try:
+            db = Database(self.db_path)
+            stopping = False
+            while not stopping:
+                # Block for the first event, then gather more until the batch
+                # is full or FLUSH_INTERVAL has passed
+                batch = []
+                timeout = None
+                deadline = None
+                while len(batch) < self.batch_size:
+                    try:
+                        event = self.queue.get(timeout=timeout)
+                    except queue.Empty:
+                        break
+                    if event is _STOP:
+                        self.queue.task_done()
+                        stopping = True
+                        break
+                    batch.append(event)
+                    if deadline is None:
+                        deadline = time.perf_counter() + self.flush_interval
+                    timeout = max(deadline - time.perf_counter(), 0)
+                try:
+                    self.write_batch(db, batch)
+                finally:
+                    for _ in batch:
+                        self.queue.task_done()
+        except Exception as e:
+            self.error = e
+            self.discard_queued()
+            raise
+        finally:
+            if db is not None:
+                db.close()
+
+    def write_batch(self, db: Database, batch: list):
+        if not batch:
+            return
+        try:
+            db.cursor.executemany('''
+                INSERT INTO attendance (employee_id, date, present)
+                SELECT ?, ?, 1
+                WHERE EXISTS (SELECT 1 FROM employees WHERE id = ?)
+                ON CONFLICT (employee_id, date) DO UPDATE SET present = 1
+            ''', ((employee_id, day, employee_id) for employee_id, day, _ in batch))
+            written = db.cursor.rowcount
+            db.log_activity('attendance_marked',
+                            f'Badge check-in: {written} employees marked as present',
+                            commit=False)
+            db.conn.commit()
+        except Exception:
+            db.conn.rollback()
+            with self.lock:
+                self.counts['dropped'] += len(batch)
+            raise
+
+        done = time.perf_counter()
+        with self.lock:
+            self.counts['written'] += written
+            self.counts['unknown_employee'] += len(batch) - written
+            self.counts['batches'] += 1
+            self.latencies.extend(done - queued for _, _, queued in batch)
+
+    def stats(self) -> Dict[str, float]:
+        """Event counters plus p50/p99 ingest latency in milliseconds"""
+        with self.lock:
+            stats = dict(self.counts)
+            latencies = sorted(self.latencies)
+        for name, fraction in (('p50_ms', 0.50), ('p99_ms', 0.99)):
+            stats[name] = (latencies[min(int(len(latencies) * fraction), len(latencies) - 1)]
+                           * 1000 if latencies else 0.0)
+        return stats
+
+
+# Reply to a check-in that cannot be written because the writer failed
+WRITE_FAILED = 'ERR write failed'
+
+
+def ingest_line(ingestor: AttendanceIngestor, line: str) -> str:
+    """Submit one ``employee_id[,ISO timestamp]`` line; returns OK, DUP or ERR"""
+    employee_id, _, timestamp = line.strip().partition(',')
+    try:
+        accepted = ingestor.submit(
+            int(employee_id),
+            datetime.fromisoformat(timestamp.strip()) if timestamp.strip() else None)
+    except ValueError:
+        return 'ERR invalid'
+    except RuntimeError:
+        return WRITE_FAILED
+    return 'OK' if accepted else 'DUP'
+
+
+class CheckInHandler(socketserver.StreamRequestHandler):
+    """Reads one check-in per line and answers each with OK, DUP or ERR"""
+    def handle(self):
+        for line in self.rfile:
+            reply = ingest_line(self.server.ingestor, line.decode('utf-8', 'replace'))
+            self.wfile.write(reply.encode() + b'\n')
+
+
+class CheckInServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, ingestor: AttendanceIngestor):
+        super().__init__(address, CheckInHandler)
+        self.ingestor = ingestor
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ingest badge check-ins into attendance')
+    parser.add_argument('--db', default='employee_management.db', help='database file')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    listen = subparsers.add_parser('listen', help='accept check-ins over TCP, one per line')
+    listen.add_argument('--host', default='127.0.0.1')
+    listen.add_argument('--port', type=int, default=9100)
+    load = subparsers.add_parser('load', help='read check-ins from a file or stdin')
+    load.add_argument('file', nargs='?', default='-')
+    args = parser.parse_args()
+
+    ingestor = AttendanceIngestor(args.db)
+    ingestor.start()
+    try:
+        if args.command == 'listen':
+            with CheckInServer((args.host, args.port), ingestor) as server:
+                print(f'Listening for check-ins on {args.host}:{server.server_address[1]}')
+                try:
+                    server.serve_forever()
+                except KeyboardInterrupt:
+                    pass
+        else:
+            stream = sys.stdin if args.file == '-' else open(args.file)
+            with stream:
+                for line in stream:
+                    if not line.strip():
+                        continue
+                    reply = ingest_line(ingestor, line)
+                    if reply == WRITE_FAILED:
+                        break
+                    if reply.startswith('ERR'):
+                        print(f'Skipped invalid line: {line.strip()}', file=sys.stderr)
+    finally:
+        ingestor.stop()
+    print(ingestor.stats())
+    if ingestor.error is not None:
+        print(f'Writer failed: {ingestor.error}', file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+import argparse
+import os
+import sqlite3
+import time
+from datetime import datetime
+from typing import Callable, List, NamedTuple, Optional
+
+from src.database.database import Database
+
+# Steps of one maintenance round, in the order they run
+MAINTENANCE_STEPS = ('checkpoint', 'incremental_vacuum', 'optimize', 'integrity_check')
+
+# Seconds a single step may run before it is interrupted
+STEP_BUDGET = 0.5
+
+# Pages returned to the file system per PRAGMA incremental_vacuum call
+VACUUM_PAGES = 256
+
+# Rows sampled per index by ANALYZE, keeping statistics cheap to gather
+ANALYSIS_LIMIT = 400
+
+# SQLite virtual machine instructions between deadline checks
+PROGRESS_INTERVAL = 1000
+
+
+class StepResult(NamedTuple):
+    step: str
+    started_at: datetime
+    duration_ms: float
+    reclaimed_bytes: int
+    status: str  # 'ok', 'skipped', 'interrupted', 'failed' or 'corrupt'
+    detail: str
+
+
+class Maintenance:
+    """Run database housekeeping in small, time-boxed steps
+
+    Each step gets its own deadline, enforced by an SQLite progress handler
+    that aborts the running statement once the deadline passes or
+    `should_stop` returns True. Every step is recorded in maintenance_log.
+    Use a dedicated read-write connection, never the GUI's.
+    """
+
+    def __init__(self, db: Database, budget: float = STEP_BUDGET,
+                 should_stop: Optional[Callable[[], bool]] = None):
+        self.db = db
+        self.budget = budget
+        self.should_stop = should_stop or (lambda: False)
+        self.deadline = None
+
+    def pragma(self, name: str) -> int:
+        self.db.cursor.execute(f'PRAGMA {name}')
+        return self.db.cursor.fetchone()[0]
+
+    def wal_size(self) -> int:
+        wal_path = f'{self.db.db_path}-wal'
+        return os.path.getsize(wal_path) if os.path.exists(wal_path) else 0
+
+    def interrupt(self) -> bool:
+        return time.perf_counter() > self.deadline or self.should_stop()
+
+    def run_step(self, step: str) -> StepResult:
+        started_at = datetime.now()
+        start = time.perf_counter()
+        self.deadline = start + self.budget
+        # Lock waits count against the budget too
+        self.db.cursor.execute(f'PRAGMA busy_timeout = {int(self.budget * 1000)}')
+        self.db.conn.set_progress_handler(self.interrupt, PROGRESS_INTERVAL)
+        try:
+            reclaimed, status, detail = getattr(self, step)()
+        except sqlite3.OperationalError as e:
+            self.db.conn.rollback()
+            reclaimed = 0
+            status = 'interrupted' if 'interrupted' in str(e) or 'locked' in str(e) else 'failed'
+            detail = str(e)
+        finally:
+            self.db.conn.set_progress_handler(None, 0)
+        result = StepResult(step, started_at, (time.perf_counter() - start) * 1000,
+                            reclaimed, status, detail)
+        self.record(result)
+        return result
+
+    def run(self, steps=MAINTENANCE_STEPS) -> List[StepResult]:
+        """Run steps in order until one is stopped by should_stop"""
+        results = []
+        for step in steps:
+            if self.should_stop():
+                break
+            results.append(self.run_step(step))
+        return results
+
+    def record(self, result: StepResult):
+        self.db.cursor.execute('''
+            INSERT INTO maintenance_log
+                (step, started_at, duration_ms, reclaimed_bytes, status, detail)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', result)
+        self.db.conn.commit()
+
+    def checkpoint(self):
+        """Copy the WAL into the database file and truncate it"""
+        before = self.wal_size()
+        self.db.cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        busy, _, _ = self.db.cursor.fetchone()
+        if not busy:
+            return before - self.wal_size(), 'ok', 'WAL truncated'
+        # A reader still needs the WAL; copy what is possible and move on
+        self.db.cursor.execute('PRAGMA wal_checkpoint(PASSIVE)')
+        _, log_frames, checkpointed = self.db.cursor.fetchone()
+        status = 'ok' if checkpointed == log_frames else 'interrupted'
+        return 0, status, f'{checkpointed} of {log_frames} frames checkpointed'
+
+    def incremental_vacuum(self):
+        """Return free pages left behind by deletes to the file system"""
+        page_size = self.pragma('page_size')
+        free_pages = self.pragma('freelist_count')
+        if not free_pages:
+            return 0, 'skipped', 'no free pages'
+        if self.pragma('auto_vacuum') != 2:
+            # Switching needs a full VACUUM, which rewrites the file and holds
+            # the write lock throughout; that is left to convert_auto_vacuum
+            return 0, 'skipped', 'auto-vacuum is off; run maintenance with --convert'
+        before = self.pragma('page_count')
+        while self.pragma('freelist_count') and not self.interrupt():
+            self.db.cursor.execute(f'PRAGMA incremental_vacuum({VACUUM_PAGES})')
+            self.db.cursor.fetchall()
+        detail = f'{self.pragma("freelist_count")} free pages left'
+        reclaimed = (before - self.pragma('page_count')) * page_size
+        status = 'ok' if not self.pragma('freelist_count') else 'interrupted'
+        return reclaimed, status, detail
+
+    def convert_auto_vacuum(self) -> StepResult:
+        """Switch a file created before incremental auto-vacuum with one full VACUUM
+
+        The file is rewritten in one go with no time limit, and other writers
+        wait until it is done, so this only runs when asked for explicitly.
+        """
+        started_at = datetime.now()
+        start = time.perf_counter()
+        page_size = self.pragma('page_size')
+        before = self.pragma('page_count')
+        if self.pragma('auto_vacuum') == 2:
+            status, detail = 'skipped', 'already incremental'
+        else:
+            self.db.cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            self.db.cursor.execute('VACUUM')
+            status, detail = 'ok', 'converted to incremental auto-vacuum'
+        result = StepResult('convert_auto_vacuum', started_at,
+                            (time.perf_counter() - start) * 1000,
+                            (before - self.pragma('page_count')) * page_size, status, detail)
+        self.record(result)
+        return result
+
+    def optimize(self):
+        """Refresh the statistics the query planner uses"""
+        self.db.cursor.execute(f'PRAGMA analysis_limit = {ANALYSIS_LIMIT}')
+        self.db.cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+        if self.db.cursor.fetchone() is None:
+            # PRAGMA optimize only re-analyzes tables that already have stats
+            self.db.cursor.execute('ANALYZE')
+            self.db.conn.commit()
+            return 0, 'ok', 'initial ANALYZE'
+        self.db.cursor.execute('PRAGMA optimize')
+        self.db.conn.commit()
+        return 0, 'ok', 'PRAGMA optimize'
+
+    def integrity_check(self):
+        """Check one table and its indexes; later rounds check the next one"""
+        self.db.cursor.execute('''
+            SELECT name FROM sqlite_master
+            WHERE type = 'table' AND name NOT LIKE 'sqlite_%'
+            ORDER BY name
+        ''')
+        tables = [row[0] for row in self.db.cursor.fetchall()]
+        # Continue after the table the previous round checked or skipped
+        self.db.cursor.execute('''
+            SELECT detail FROM maintenance_log
+            WHERE step = 'integrity_check' AND status IN ('ok', 'corrupt', 'skipped')
+            ORDER BY id DESC
+            LIMIT 1
+        ''')
+        row = self.db.cursor.fetchone()
+        last = row[0].split(':')[0] if row else None
+        table = tables[(tables.index(last) + 1) % len(tables) if last in tables else 0]
+        try:
+            self.db.cursor.execute(f'PRAGMA quick_check({table})')
+            problems = [row[0] for row in self.db.cursor.fetchall()]
+        except sqlite3.OperationalError as e:
+            if 'interrupted' not in str(e) or self.should_stop():
+                raise
+            # Retrying would hit the deadline again and hold up every table
+            # after it, so the table is logged as skipped and the next round
+            # moves on
+            return 0, 'skipped', f'{table}: too large to check in {self.budget:g} s'
+        if problems == ['ok']:
+            return 0, 'ok', table
+        return 0, 'corrupt', f'{table}: {"; ".join(problems[:5])}'
+
+    def history(self, limit: int = 20) -> List[tuple]:
+        self.db.cursor.execute('''
+            SELECT step, started_at, duration_ms, reclaimed_bytes, status, detail
+            FROM maintenance_log
+            ORDER BY id DESC
+            LIMIT ?
+        ''', (limit,))
+        return self.db.cursor.fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run database maintenance once')
+    parser.add_argument('--db', default='employee_management.db', help='database file')
+    parser.add_argument('--budget', type=float, default=STEP_BUDGET,
+                        help='seconds each step may take')
+    parser.add_argument('--convert', action='store_true',
+                        help='switch an older file to incremental auto-vacuum with one '
+                             'full VACUUM; other writers wait until it finishes')
+    args = parser.parse_args()
+
+    db = Database(args.db)
+    try:
+        maintenance = Maintenance(db, args.budget)
+        results = [maintenance.convert_auto_vacuum()] if args.convert else maintenance.run()
+        for result in results:
+            print(f'{result.step:<20} {result.status:<12} {result.duration_ms:8.1f} ms '
+                  f'{result.reclaimed_bytes:>10} bytes  {result.detail}')
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,415 @@
+import argparse
+import gzip
+import json
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from src.database.database import Database, SYNC_TABLES
+
+# Version of the delta file layout
+DELTA_FORMAT = 2
+
+# gzip level of delta files; higher levels take far longer for little gain
+DELTA_COMPRESSION = 6
+
+# Changes applied per transaction
+BATCH_SIZE = 1000
+
+# Columns holding a row id of another replicated table; in delta files they
+# carry that row's key instead, as ids differ between sites
+REFERENCES = {
+    'shifts': {'employee_id': 'employees'},
+    'attendance': {'employee_id': 'employees'},
+}
+
+# Unique columns by which two sites can create the same row independently
+NATURAL_KEYS = {
+    'employees': ('email',),
+    'attendance': ('employee_id', 'date'),
+}
+
+# Column types stored as integers but converted to date/datetime on read
+CONVERTED_TYPES = ('DAYNUM', 'EPOCH')
+
+
+class LogEntry(NamedTuple):
+    row_id: Optional[int]
+    key: str
+    op: str
+    changed_at: int
+    origin: str
+
+    @property
+    def version(self) -> Tuple[int, str]:
+        return (self.changed_at, self.origin)
+
+
+class ApplyResult(NamedTuple):
+    site: str
+    applied: int
+    stale: int     # not newer than the local version
+    merged: int    # matched a row the local site created itself
+    rejected: int  # missing employee or constraint violation
+    until: int     # last seq of the sender now applied here
+
+
+class Synchronizer:
+    """Exchange row changes between sites through compact delta files
+
+    Triggers record the latest change of every employee, shift and
+    attendance row in sync_log under a key that is the same on every site.
+    A delta holds the current values of the rows changed after a given
+    seq, so its size follows the changes, not the database. Conflicts go
+    to the newest change, ties to the higher site id, which makes every
+    site settle on the same values whatever order deltas arrive in.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+        self.parents = {}  # (table, key) -> local row id, during one apply
+
+    @property
+    def site_id(self) -> str:
+        self.db.cursor.execute('SELECT site_id FROM sync_state')
+        return self.db.cursor.fetchone()[0]
+
+    @property
+    def baseline(self) -> Optional[str]:
+        """Digest of the rows this site had before it started logging changes"""
+        self.db.cursor.execute('SELECT baseline FROM sync_state')
+        return self.db.cursor.fetchone()[0]
+
+    def last_seq(self) -> int:
+        self.db.cursor.execute('SELECT COALESCE(MAX(seq), 0) FROM sync_log')
+        return self.db.cursor.fetchone()[0]
+
+    def peer_seq(self, site: str) -> int:
+        """Highest seq of another site applied here, 0 if none yet"""
+        self.db.cursor.execute('SELECT last_seq FROM sync_peers WHERE site_id = ?', (site,))
+        row = self.db.cursor.fetchone()
+        return row[0] if row else 0
+
+    def peers(self) -> List[tuple]:
+        self.db.cursor.execute('''
+            SELECT site_id, last_seq, synced_at FROM sync_peers ORDER BY site_id
+        ''')
+        return self.db.cursor.fetchall()
+
+    def new_site_id(self) -> str:
+        """Give a copied database file an id of its own"""
+        self.db.cursor.execute('UPDATE sync_state SET site_id = lower(hex(randomblob(8)))')
+        self.db.conn.commit()
+        return self.site_id
+
+    def export_changes(self, since: int = 0, peer: Optional[str] = None) -> Dict[str, Any]:
+        """Collect the latest change of every row logged after seq `since`
+
+        Changes made by `peer`, the receiving site, are left out: it holds
+        them or newer ones already. Merged rows are sent regardless, so the
+        peer learns the key this site knows them by.
+        """
+        self.db.conn.commit()
+        cursor = self.db.conn.cursor()
+        # One read transaction, so `until` matches the rows read
+        cursor.execute('BEGIN')
+        try:
+            site = self.site_id
+            baseline = self.baseline
+            cursor.execute('SELECT COALESCE(MAX(seq), 0) FROM sync_log')
+            until = cursor.fetchone()[0]
+            tables = {}
+            for table, columns in SYNC_TABLES.items():
+                cursor.execute(f'PRAGMA table_info({table})')
+                types = {col[1]: col[2] for col in cursor.fetchall()}
+                references = REFERENCES.get(table, {})
+                values = []
+                for column in columns:
+                    if column in references:
+                        values.append(f'''(SELECT key FROM sync_log
+                                           WHERE table_name = '{references[column]}'
+                                           AND row_id = t.{column})''')
+                    elif types[column] in CONVERTED_TYPES:
+                        # Raw day numbers and epoch seconds, not date objects
+                        values.append(f't.{column} + 0')
+                    else:
+                        values.append(f't.{column}')
+                # Upserts of rows gone without a delete (archived) are left out
+                cursor.execute(f'''
+                    SELECT l.key, l.op, l.changed_at, l.origin, {', '.join(values)}
+                    FROM sync_log l
+                    LEFT JOIN {table} t ON l.op = 'upsert' AND t.id = l.row_id
+                    WHERE l.table_name = ? AND l.seq > ? AND l.seq <= ?
+                    AND (l.op = 'delete' OR t.id IS NOT NULL)
+                    AND (l.origin IS NOT ? OR EXISTS (
+                        SELECT 1 FROM sync_aliases a
+                        WHERE a.table_name = l.table_name AND a.row_id = l.row_id))
+                    ORDER BY l.seq
+                ''', (table, since, until, peer))
+                changes = [list(row[:4]) if row[1] == 'delete' else list(row)
+                           for row in cursor.fetchall()]
+                tables[table] = {'columns': list(columns), 'changes': changes}
+        finally:
+            self.db.conn.commit()
+            cursor.close()
+        return {'format': DELTA_FORMAT, 'site': site, 'baseline': baseline,
+                'since': since, 'until': until, 'tables': tables}
+
+    def find(self, table: str, key: str) -> Optional[LogEntry]:
+        """Local change log entry of the row with a key, following aliases"""
+        self.db.cursor.execute('''
+            SELECT row_id, key, op, changed_at, origin FROM sync_log
+            WHERE table_name = ? AND key = ?
+        ''', (table, key))
+        row = self.db.cursor.fetchone()
+        if row is None:
+            self.db.cursor.execute('''
+                SELECT l.row_id, l.key, l.op, l.changed_at, l.origin
+                FROM sync_aliases a
+                JOIN sync_log l ON l.table_name = a.table_name AND l.row_id = a.row_id
+                WHERE a.table_name = ? AND a.key = ?
+            ''', (table, key))
+            row = self.db.cursor.fetchone()
+        return LogEntry(*row) if row else None
+
+    def stamp(self, table: str, row_id: int, op: str, version: Tuple[int, str]):
+        # Writes made here were logged as local changes; keep the sender's version
+        self.db.cursor.execute('''
+            UPDATE sync_log SET op = ?, changed_at = ?, origin = ?
+            WHERE table_name = ? AND row_id = ?
+        ''', (op, *version, table, row_id))
+
+    def update_row(self, table: str, row_id: int, values: Dict[str, Any]) -> bool:
+        assignments = ', '.join(f'{column} = ?' for column in values)
+        self.db.cursor.execute(f'UPDATE {table} SET {assignments} WHERE id = ?',
+                               (*values.values(), row_id))
+        return self.db.cursor.rowcount > 0
+
+    def apply_change(self, table: str, columns: List[str], change: list) -> str:
+        """Apply one change; returns 'applied', 'stale', 'merged' or 'rejected'"""
+        key, op, changed_at, origin = change[:4]
+        version = (changed_at, origin)
+        local = self.find(table, key)
+        if local and local.version >= version:
+            return 'stale'
+
+        if op == 'delete':
+            if local and local.op == 'upsert':
+                self.db.cursor.execute(f'DELETE FROM {table} WHERE id = ?', (local.row_id,))
+                self.stamp(table, local.row_id, 'delete', version)
+            elif local is None:
+                # Keep the tombstone so a late, older upsert cannot revive the row
+                self.db.cursor.execute('''
+                    INSERT INTO sync_log (table_name, row_id, key, op, changed_at, origin)
+                    VALUES (?, NULL, ?, 'delete', ?, ?)
+                ''', (table, key, *version))
+            else:
+                self.stamp(table, local.row_id, 'delete', version)
+            return 'applied'
+
+        values = dict(zip(columns, change[4:]))
+        for column, parent_table in REFERENCES.get(table, {}).items():
+            parent_key = (parent_table, values[column])
+            if parent_key not in self.parents:
+                parent = self.find(parent_table, values[column])
+                self.parents[parent_key] = parent.row_id if parent and parent.op == 'upsert' \
+                    else None
+            if self.parents[parent_key] is None:
+                return 'rejected'
+            values[column] = self.parents[parent_key]
+
+        if local and local.op == 'upsert':
+            try:
+                if not self.update_row(table, local.row_id, values):
+                    # Archived here; the archive keeps the older copy
+                    return 'stale'
+            except sqlite3.IntegrityError:
+                return 'rejected'
+            self.stamp(table, local.row_id, 'upsert', version)
+            return 'applied'
+
+        try:
+            self.db.cursor.execute(f'''
+                INSERT INTO {table} ({', '.join(values)})
+                VALUES ({', '.join('?' * len(values))})
+            ''', tuple(values.values()))
+        except sqlite3.IntegrityError:
+            return self.merge(table, key, values, version)
+        row_id = self.db.cursor.lastrowid
+        # The trigger logged the new row under a local key; it takes the
+        # sender's key, replacing the tombstone of a row deleted earlier
+        if local is not None:
+            self.db.cursor.execute('DELETE FROM sync_log WHERE table_name = ? AND key = ?',
+                                   (table, key))
+            self.db.cursor.execute('DELETE FROM sync_aliases WHERE table_name = ? AND key = ?',
+                                   (table, key))
+        self.db.cursor.execute('''
+            UPDATE sync_log SET key = ?, changed_at = ?, origin = ?
+            WHERE table_name = ? AND row_id = ?
+        ''', (key, *version, table, row_id))
+        return 'applied'
+
+    def merge(self, table: str, key: str, values: Dict[str, Any],
+              version: Tuple[int, str]) -> str:
+        """Join a row created on two sites; the newer values win on both"""
+        natural = NATURAL_KEYS.get(table)
+        if not natural:
+            return 'rejected'
+        conditions = ' AND '.join(f't.{column} = ?' for column in natural)
+        self.db.cursor.execute(f'''
+            SELECT l.row_id, l.key, l.op, l.changed_at, l.origin
+            FROM {table} t
+            JOIN sync_log l ON l.table_name = ? AND l.row_id = t.id
+            WHERE {conditions}
+        ''', (table, *(values[column] for column in natural)))
+        row = self.db.cursor.fetchone()
+        if row is None:
+            return 'rejected'
+        local = LogEntry(*row)
+        self.db.cursor.execute('''
+            INSERT OR REPLACE INTO sync_aliases (table_name, key, row_id) VALUES (?, ?, ?)
+        ''', (table, key, local.row_id))
+        if version > local.version:
+            try:
+                self.update_row(table, local.row_id, values)
+            except sqlite3.IntegrityError:
+                return 'rejected'
+            self.stamp(table, local.row_id, 'upsert', version)
+        return 'merged'
+
+    def apply_changes(self, delta: Dict[str, Any], batch_size: int = BATCH_SIZE) -> ApplyResult:
+        """Apply a delta from another site in transactions of batch_size changes
+
+        Parents are written before children and deleted after them. Applying
+        a delta twice, or deltas that overlap, changes nothing the second time.
+        """
+        if delta.get('format') != DELTA_FORMAT:
+            raise ValueError(f"unsupported delta format: {delta.get('format')}")
+        site = delta['site']
+        if site == self.site_id:
+            raise ValueError('delta comes from this site; copied database files '
+                             'need a new site id first')
+        # Rows both sites had before logging changes share their keys, which
+        # only matches the same row when both started from the same data
+        baseline = self.baseline
+        if delta['baseline'] and baseline and delta['baseline'] != baseline:
+            raise ValueError(f'site {site} held different rows than this site when it '
+                             'started logging changes; rows created before then cannot '
+                             'be matched between the two')
+        applied_until = self.peer_seq(site)
+        if delta['since'] > applied_until:
+            raise ValueError(f"delta starts after seq {delta['since']} of site {site}, "
+                             f'but only {applied_until} is applied here; '
+                             f'export again with --since {applied_until}')
+
+        passes = [(table, 'upsert') for table in SYNC_TABLES]
+        passes += [(table, 'delete') for table in reversed(list(SYNC_TABLES))]
+        counts = {'applied': 0, 'stale': 0, 'merged': 0, 'rejected': 0}
+        pending = 0
+        # Parents are only looked up once all of them are written and
+        # before any is deleted, so the lookups stay valid for the apply
+        self.parents = {}
+        try:
+            for table, op in passes:
+                section = delta['tables'].get(table)
+                if not section:
+                    continue
+                for change in section['changes']:
+                    if change[1] != op:
+                        continue
+                    counts[self.apply_change(table, section['columns'], change)] += 1
+                    pending += 1
+                    if pending >= batch_size:
+                        self.db.conn.commit()
+                        pending = 0
+
+            self.db.cursor.execute('''
+                INSERT INTO sync_peers (site_id, last_seq, synced_at) VALUES (?, ?, ?)
+                ON CONFLICT (site_id) DO UPDATE
+                SET last_seq = MAX(last_seq, excluded.last_seq), synced_at = excluded.synced_at
+            ''', (site, delta['until'], datetime.now()))
+            if counts['applied'] or counts['merged']:
+                self.db.log_activity('sync_applied',
+                                     f"Synchronized with site {site}: "
+                                     f"{counts['applied'] + counts['merged']} changes",
+                                     commit=False)
+            self.db.conn.commit()
+        except sqlite3.Error:
+            self.db.conn.rollback()
+            raise
+        return ApplyResult(site, counts['applied'], counts['stale'], counts['merged'],
+                           counts['rejected'], delta['until'])
+
+    def pull(self, other: Database, batch_size: int = BATCH_SIZE) -> ApplyResult:
+        """Apply the changes of another local database file not yet seen here"""
+        source = Synchronizer(other)
+        delta = source.export_changes(self.peer_seq(source.site_id), self.site_id)
+        return self.apply_changes(delta, batch_size)
+
+
+def write_delta(delta: Dict[str, Any], path: str):
+    # Encoding in one piece is much faster than json.dump's many small writes
+    data = json.dumps(delta, separators=(',', ':')).encode('utf-8')
+    with gzip.open(path, 'wb', compresslevel=DELTA_COMPRESSION) as f:
+        f.write(data)
+
+
+def read_delta(path: str) -> Dict[str, Any]:
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def print_result(result: ApplyResult):
+    print(f'site {result.site} through seq {result.until}: {result.applied} applied, '
+          f'{result.merged} merged, {result.stale} stale, {result.rejected} rejected')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Synchronize database files between sites')
+    parser.add_argument('--db', default='employee_management.db', help='database file')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('status', help='show the site id and what was applied from peers')
+    export = commands.add_parser('export', help='write the changes after a seq to a file')
+    export.add_argument('path', help='delta file to write (gzip JSON)')
+    export.add_argument('--since', type=int, default=0,
+                        help='last seq the receiving site has applied')
+    export.add_argument('--peer', help='site id of the receiving site')
+    apply = commands.add_parser('apply', help='apply delta files from other sites')
+    apply.add_argument('paths', nargs='+', help='delta files, oldest first')
+    pull = commands.add_parser('pull', help='apply new changes of another database file')
+    pull.add_argument('other', help='database file of the other site')
+    commands.add_parser('new-site-id', help='give a copied database file its own site id')
+    args = parser.parse_args()
+
+    db = Database(args.db)
+    sync = Synchronizer(db)
+    try:
+        if args.command == 'status':
+            print(f'site {sync.site_id}, last seq {sync.last_seq()}')
+            for site, last_seq, synced_at in sync.peers():
+                print(f'  peer {site}: through seq {last_seq}, '
+                      f"{synced_at.strftime('%Y-%m-%d %H:%M:%S')}")
+        elif args.command == 'export':
+            delta = sync.export_changes(args.since, args.peer)
+            write_delta(delta, args.path)
+            count = sum(len(section['changes']) for section in delta['tables'].values())
+            print(f"{count} changes through seq {delta['until']} written to {args.path}")
+        elif args.command == 'apply':
+            for path in args.paths:
+                print_result(sync.apply_changes(read_delta(path)))
+        elif args.command == 'pull':
+            other = Database(args.other)
+            try:
+                print_result(sync.pull(other))
+            finally:
+                other.close()
+        else:
+            print(f'new site id {sync.new_site_id()}')
+    except ValueError as e:
+        parser.exit(1, f'error: {e}\n')
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
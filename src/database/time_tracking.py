@@ -0,0 +1,184 @@
+import time
+from datetime import date, datetime, timedelta
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# Scheduled start of each shift type, in hours after local midnight
+SHIFT_START_HOURS = {'Morning': 6, 'Evening': 14, 'Night': 22}
+
+# Hours per day and per week beyond which time counts as overtime
+REGULAR_DAILY_HOURS = 8
+REGULAR_WEEKLY_HOURS = 40
+
+# Minutes after the scheduled start before a clock-in counts as late
+LATE_GRACE_MINUTES = 5
+
+# Rows fetched from SQLite per streaming step
+FETCH_SIZE = 65536
+
+SECONDS_PER_DAY = 86400
+
+
+class Intervals(NamedTuple):
+    """Time entries as parallel arrays; times are local seconds since 1970"""
+    rows: np.ndarray       # row of the employee in employee_ids
+    shift_ids: np.ndarray  # linked shift, -1 when none
+    clock_in: np.ndarray
+    clock_out: np.ndarray  # open entries are clipped to the end of the range
+    scheduled: np.ndarray  # scheduled start of the linked shift, -1 when none
+    is_open: np.ndarray    # not clocked out yet; their hours are not counted
+
+
+class Timesheet(NamedTuple):
+    start: date
+    employee_ids: np.ndarray      # sorted, one row per employee
+    days: np.ndarray              # datetime64[D], one column per day
+    daily_hours: np.ndarray       # (employees, days)
+    daily_overtime: np.ndarray    # (employees, days), hours past REGULAR_DAILY_HOURS
+    weeks: np.ndarray             # datetime64[D] Monday of each week column
+    weekly_hours: np.ndarray      # (employees, weeks), only days inside the range
+    weekly_overtime: np.ndarray   # (employees, weeks)
+    late_minutes: np.ndarray      # (employees, days), minutes late for shifts
+    late_count: np.ndarray        # (employees,) late arrivals over the range
+    open_entries: np.ndarray      # (employees,) entries not clocked out, not in the hours
+
+    def row_of(self, employee_id: int) -> Optional[int]:
+        """Return the row of an employee, or None if not loaded"""
+        i = int(np.searchsorted(self.employee_ids, employee_id))
+        if i < len(self.employee_ids) and self.employee_ids[i] == employee_id:
+            return i
+        return None
+
+
+def _to_local(epoch: np.ndarray) -> np.ndarray:
+    """Shift epoch seconds to local wall-clock seconds since 1970
+
+    The result divided by 86400 gives the same day numbers as the DAYNUM
+    columns. UTC offsets are looked up once per hour of the covered span,
+    which is exact wherever daylight saving changes on the hour.
+    """
+    if len(epoch) == 0:
+        return epoch
+    first = int(epoch.min()) // 3600
+    hours = np.arange(first, int(epoch.max()) // 3600 + 1)
+    offsets = np.fromiter((time.localtime(hour * 3600).tm_gmtoff for hour in hours),
+                          dtype=np.int64, count=len(hours))
+    return epoch + offsets[epoch // 3600 - first]
+
+
+def load_intervals(db, start: date, end: date,
+                   now: Optional[datetime] = None) -> Tuple[np.ndarray, Intervals]:
+    """Load entries that began between start and end (inclusive)
+
+    Returns the sorted ids of all employees and their entries as arrays.
+    Entries still open are flagged in `is_open` and end at the end of the
+    range, or at `now` if that is earlier.
+    """
+    if end < start:
+        raise ValueError('end must not be before start')
+    range_end = datetime.combine(end + timedelta(days=1), datetime.min.time())
+    cursor = db.conn.cursor()
+    cursor.execute('SELECT id FROM employees ORDER BY id')
+    employee_ids = np.array([row[0] for row in cursor.fetchall()], dtype=np.int64)
+
+    shift_start = ' '.join(f"WHEN '{shift_type}' THEN {hours * 3600}"
+                           for shift_type, hours in SHIFT_START_HOURS.items())
+    # "+ 0" returns raw epoch seconds, skipping the per-row EPOCH converter
+    cursor.execute(f'''
+        SELECT t.employee_id,
+               COALESCE(t.shift_id, -1),
+               t.clock_in + 0,
+               COALESCE(t.clock_out + 0, -1),
+               COALESCE(s.assigned_date * {SECONDS_PER_DAY} +
+                        CASE s.shift_type {shift_start} END, -1)
+        FROM {db.history('time_entries')} t
+        LEFT JOIN {db.history('shifts')} s ON s.id = t.shift_id
+        WHERE t.clock_in >= ? AND t.clock_in < ?
+    ''', (datetime.combine(start, datetime.min.time()), range_end))
+
+    chunks = []
+    while True:
+        chunk = cursor.fetchmany(FETCH_SIZE)
+        if not chunk:
+            break
+        chunks.append(np.array(chunk, dtype=np.int64).reshape(-1, 5))
+    cursor.close()
+    data = np.concatenate(chunks) if chunks else np.empty((0, 5), dtype=np.int64)
+
+    # Entries of employees missing from the list cannot be placed; drop them
+    rows = np.searchsorted(employee_ids, data[:, 0])
+    rows = np.minimum(rows, max(len(employee_ids) - 1, 0))
+    valid = employee_ids[rows] == data[:, 0] if len(employee_ids) else \
+        np.zeros(len(data), dtype=bool)
+    data, rows = data[valid], rows[valid]
+    is_open = data[:, 3] < 0
+    cutoff = int(min(now or datetime.now(), range_end).timestamp())
+    clock_in = _to_local(data[:, 2])
+    # An entry opened after the cutoff has not lasted any time yet
+    clock_out = np.maximum(_to_local(np.where(is_open, cutoff, data[:, 3])), clock_in)
+    return employee_ids, Intervals(rows, data[:, 1], clock_in, clock_out, data[:, 4],
+                                   is_open)
+
+
+def build_timesheet(start: date, end: date, employee_ids: np.ndarray,
+                    intervals: Intervals) -> Timesheet:
+    """Derive hours, overtime and lateness for every employee at once
+
+    Hours are credited to the day an entry began, so a night shift counts
+    in full on the day it started. Entries still open count towards
+    lateness and open_entries but not towards hours. Weekly overtime is the larger of the
+    hours past REGULAR_WEEKLY_HOURS and the daily overtime of that week, so
+    no hour is paid as overtime twice.
+    """
+    ndays = (end - start).days + 1
+    nemployees = len(employee_ids)
+    first_day = (start - date(1970, 1, 1)).days
+
+    day = intervals.clock_in // SECONDS_PER_DAY - first_day
+    hours = np.where(intervals.is_open, 0.0,
+                     (intervals.clock_out - intervals.clock_in) / 3600.0)
+    cells = intervals.rows * ndays + day
+    daily_hours = np.bincount(cells, weights=hours, minlength=nemployees * ndays)
+    daily_hours = daily_hours.reshape(nemployees, ndays)
+    daily_overtime = np.maximum(daily_hours - REGULAR_DAILY_HOURS, 0)
+
+    # Weeks start on Monday; day number 0 (1970-01-01) was a Thursday
+    week_of_day = (first_day + np.arange(ndays) + 3) // 7
+    week_of_day -= week_of_day[0]
+    nweeks = int(week_of_day[-1]) + 1
+    week_cells = (np.arange(nemployees)[:, None] * nweeks + week_of_day).ravel()
+    size = nemployees * nweeks
+    weekly_hours = np.bincount(week_cells, weights=daily_hours.ravel(),
+                               minlength=size).reshape(nemployees, nweeks)
+    weekly_daily_overtime = np.bincount(week_cells, weights=daily_overtime.ravel(),
+                                        minlength=size).reshape(nemployees, nweeks)
+    weekly_overtime = np.maximum(weekly_hours - REGULAR_WEEKLY_HOURS,
+                                 weekly_daily_overtime)
+
+    # Lateness is judged on the first clock-in of each linked shift
+    linked = np.flatnonzero((intervals.shift_ids >= 0) & (intervals.scheduled >= 0))
+    order = linked[np.lexsort((intervals.clock_in[linked], intervals.shift_ids[linked]))]
+    _, first = np.unique(intervals.shift_ids[order], return_index=True)
+    first = order[first]
+    late = (intervals.clock_in[first] - intervals.scheduled[first]) / 60.0
+    is_late = late > LATE_GRACE_MINUTES
+    first, late = first[is_late], late[is_late]
+    late_minutes = np.bincount(cells[first], weights=late,
+                               minlength=nemployees * ndays).reshape(nemployees, ndays)
+    late_count = np.bincount(intervals.rows[first], minlength=nemployees)
+    open_entries = np.bincount(intervals.rows[intervals.is_open], minlength=nemployees)
+
+    days = np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D') + 1)
+    monday = np.datetime64(start - timedelta(days=start.weekday()), 'D')
+    weeks = monday + np.arange(nweeks) * np.timedelta64(7, 'D')
+    return Timesheet(start, employee_ids, days, daily_hours, daily_overtime, weeks,
+                     weekly_hours, weekly_overtime, late_minutes, late_count,
+                     open_entries)
+
+
+def compute_timesheet(db, start: date, end: date,
+                      now: Optional[datetime] = None) -> Timesheet:
+    """Load and compute the timesheet of every employee between start and end"""
+    employee_ids, intervals = load_intervals(db, start, end, now)
+    return build_timesheet(start, end, employee_ids, intervals)
@@ -10,35 +10,24 @@ from src.ui.dashboard_tab import DashboardTab
 from src.ui.employee_tab import EmployeeTab
 from src.ui.shift_tab import ShiftTab
 from src.ui.attendance_tab import AttendanceTab
+from src.ui.analytics_tab import AnalyticsTab
+from src.ui.maintenance import MaintenanceScheduler
+from src.ui.diagnostics import MemoryMonitor
 from src.utils.ui_utils import create_styled_button, create_styled_label
+from src.utils.theme import install_theme, set_role
 
 class SidebarButton(QPushButton):
     def __init__(self, text, parent=None):
         super().__init__(text, parent)
         self.setMinimumHeight(50)
         self.setCheckable(True)
-        self.setStyleSheet("""
-            QPushButton {
-                background-color: #2c3e50;
-                border-radius: 5px;
-                color: white;
-                font-size: 14px;
-                padding: 10px;
-                text-align: left;
-                border: none;
-            }
-            QPushButton:hover {
-                background-color: #34495e;
-            }
-            QPushButton:checked {
-                background-color: #3498db;
-            }
-        """)
+        set_role(self, 'sidebar-button')
 
 class EmployeeManagementSystem(QMainWindow):
-    def __init__(self):
+    def __init__(self, db_path: str = 'employee_management.db', diagnostics: bool = False):
         super().__init__()
-        self.db = Database()
+        install_theme()
+        self.db = Database(db_path)
         self.initUI()
         
         # Setup auto-refresh timer (every 5 seconds)
@@ -46,6 +35,15 @@ class EmployeeManagementSystem(QMainWindow):
         self.timer.timeout.connect(self.refresh_all)
         self.timer.start(5000)  # 5 seconds
 
+        # Vacuum, optimize, checkpoint and check the database while idle
+        self.maintenance = MaintenanceScheduler(self.db.db_path, self)
+
+        # Memory and per-tab QObject samples, only when asked for
+        self.diagnostics = None
+        if diagnostics:
+            pages = {page_class.__name__: page for page_class, page in self.pages.items()}
+            self.diagnostics = MemoryMonitor(pages, parent=self)
+
     def initUI(self):
         self.setWindowTitle('Employee Management System')
         self.setGeometry(100, 100, 1400, 800)
@@ -58,14 +56,14 @@ class EmployeeManagementSystem(QMainWindow):
 
         # Create sidebar
         sidebar = QFrame()
-        sidebar.setStyleSheet('background-color: #2c3e50;')
+        set_role(sidebar, 'sidebar')
         sidebar.setMaximumWidth(200)
         sidebar.setMinimumWidth(200)
         sidebar_layout = QVBoxLayout()
         
         # Add date/time display to sidebar
         self.datetime_label = create_styled_label('', font_size=12)
-        self.datetime_label.setStyleSheet('color: white; padding: 10px;')
+        set_role(self.datetime_label, 'sidebar-clock')
         self.update_datetime()
         sidebar_layout.addWidget(self.datetime_label)
         
@@ -80,7 +78,8 @@ class EmployeeManagementSystem(QMainWindow):
             ('📊 Dashboard', DashboardTab),
             ('👥 Employees', EmployeeTab),
             ('🕒 Shifts', ShiftTab),
-            ('📋 Attendance', AttendanceTab)
+            ('📋 Attendance', AttendanceTab),
+            ('📈 Analytics', AnalyticsTab)
         ]
 
         for text, widget in pages:
@@ -134,6 +133,18 @@ class EmployeeManagementSystem(QMainWindow):
             if hasattr(page, 'refresh_data'):
                 page.refresh_data()
 
+    def closeEvent(self, event):
+        # No refresh may start new background work while closing
+        self.timer.stop()
+        self.maintenance.stop()
+        if self.diagnostics is not None:
+            self.diagnostics.stop()
+        # A QThread destroyed while still running aborts the application
+        for page in self.pages.values():
+            if hasattr(page, 'stop'):
+                page.stop()
+        super().closeEvent(event)
+
     def on_employee_updated(self):
         """Handle employee updates across all components"""
         # Refresh shift tab employee list
@@ -148,8 +159,12 @@ class EmployeeManagementSystem(QMainWindow):
         if DashboardTab in self.pages:
             self.pages[DashboardTab].refresh_data()
 
+        # Drop cached analytics so the next refresh reloads them
+        if AnalyticsTab in self.pages:
+            self.pages[AnalyticsTab].invalidate()
+
 if __name__ == '__main__':
     app = QApplication(sys.argv)
-    window = EmployeeManagementSystem()
+    window = EmployeeManagementSystem(diagnostics='--diagnostics' in sys.argv[1:])
     window.show()
     sys.exit(app.exec_()) 
\ No newline at end of file
@@ -0,0 +1,209 @@
+import argparse
+import csv
+import multiprocessing
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from src.database.archive import attach_archive
+from src.database.database import Database, open_readonly
+
+# Report files written for every department
+REPORT_FILES = ('attendance.csv', 'daily_attendance.csv', 'shifts.csv',
+                'headcount.csv', 'charts.png')
+
+# Connection of the current pool worker process
+_db = None
+
+
+def _init_worker(db_path: str):
+    """Open one read-only connection per worker process
+
+    generate() has already upgraded a file or archive from an older
+    version, which read-only connections cannot do themselves.
+    """
+    global _db
+    # Workers never show windows; select the headless backend before pyplot
+    # or a Qt backend could be picked up
+    import matplotlib
+    matplotlib.use('Agg')
+    _db = Database(db_path, readonly=True)
+    attach_archive(_db)
+
+
+def _department_dir(out_dir: str, department: str) -> str:
+    safe = ''.join(c if c.isalnum() or c in '-_' else '_' for c in department)
+    return os.path.join(out_dir, safe or 'unnamed')
+
+
+def _write_csv(path: str, header: List[str], rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def build_department_report(department: str, start: date, end: date,
+                            out_dir: str) -> Dict[str, Any]:
+    """Write the CSV files and charts of one department; runs in a worker"""
+    from matplotlib.figure import Figure
+
+    started = time.perf_counter()
+    days = (end - start).days + 1
+    employees = _db.get_employee_attendance(start, end, department)
+    present_by_day = dict(_db.get_daily_present_counts(start, end, department))
+    coverage = _db.get_shift_coverage(start, end, department)
+    headcount = _db.get_headcount_trend(start, end, department)
+
+    target = _department_dir(out_dir, department)
+    os.makedirs(target, exist_ok=True)
+
+    _write_csv(os.path.join(target, 'attendance.csv'),
+               ['employee_id', 'name', 'days_present', 'days_absent', 'attendance_rate'],
+               ((employee_id, name, present, absent, f'{present / days * 100:.1f}')
+                for employee_id, name, _, present, absent in employees))
+
+    # Daily rates share the denominator of the summary rate, the employees
+    # in the report, so they average to it; headcount.csv shows who was on
+    # the books each day
+    daily = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        present = present_by_day.get(day, 0)
+        daily.append((day, len(employees), present,
+                      present / len(employees) * 100 if employees else 0.0))
+    _write_csv(os.path.join(target, 'daily_attendance.csv'),
+               ['date', 'headcount', 'present', 'attendance_rate'],
+               ((day, count, present, f'{rate:.1f}') for day, count, present, rate in daily))
+
+    _write_csv(os.path.join(target, 'shifts.csv'),
+               ['date', 'shift_type', 'shifts'], coverage)
+    _write_csv(os.path.join(target, 'headcount.csv'), ['date', 'headcount'], headcount)
+
+    # Figure without pyplot keeps no global state between reports
+    figure = Figure(figsize=(10, 9))
+    ax = figure.add_subplot(3, 1, 1)
+    ax.plot([row[0] for row in daily], [row[3] for row in daily], color='#3498db')
+    ax.set_title(f'{department}: attendance rate (%)')
+    ax.set_ylim(0, 100)
+
+    ax = figure.add_subplot(3, 1, 2)
+    shift_types = sorted({shift_type for _, shift_type, _ in coverage})
+    counts = {(day, shift_type): count for day, shift_type, count in coverage}
+    day_list = [start + timedelta(days=offset) for offset in range(days)]
+    bottom = [0] * days
+    for shift_type in shift_types:
+        heights = [counts.get((day, shift_type), 0) for day in day_list]
+        ax.bar(day_list, heights, bottom=bottom, label=shift_type)
+        bottom = [b + h for b, h in zip(bottom, heights)]
+    ax.set_title('Shifts assigned per day')
+    if shift_types:
+        ax.legend(loc='upper left')
+
+    ax = figure.add_subplot(3, 1, 3)
+    ax.plot([day for day, _ in headcount], [count for _, count in headcount],
+            color='#2c3e50')
+    ax.set_title('Headcount')
+    for ax in figure.axes:
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+    figure.autofmt_xdate()
+    figure.tight_layout()
+    figure.savefig(os.path.join(target, 'charts.png'), dpi=100)
+
+    present_days = sum(row[3] for row in employees)
+    return {
+        'department': department,
+        'headcount': len(employees),
+        'attendance_rate': present_days / (len(employees) * days) * 100 if employees else 0.0,
+        'shifts': sum(count for _, _, count in coverage),
+        'directory': target,
+        'seconds': time.perf_counter() - started,
+    }
+
+
+class ReportGenerator:
+    """Build attendance, shift and headcount reports per department in parallel
+
+    Each department is one task for a process pool whose workers hold their
+    own read-only connection, so departments are queried and charted on
+    separate cores. Processes are spawned rather than forked, which keeps
+    the pool safe to start from the GUI.
+    """
+
+    def __init__(self, db_path: str, out_dir: str, workers: Optional[int] = None):
+        self.db_path = db_path
+        self.out_dir = out_dir
+        self.workers = workers or os.cpu_count() or 1
+
+    def generate(self, start: date, end: date, departments: Optional[List[str]] = None,
+                 progress: Optional[Callable[[int, int, str], None]] = None
+                 ) -> List[Dict[str, Any]]:
+        """Write every department's report and a summary.csv; returns the summaries
+
+        `progress(done, total, department)` is called as each report finishes.
+        """
+        if end < start:
+            raise ValueError('end must not be before start')
+        # Upgrades a file and its archive from an older version once, before
+        # the workers open them read-only
+        db = open_readonly(self.db_path)
+        try:
+            attach_archive(db)
+            if departments is None:
+                departments = db.get_departments()
+        finally:
+            db.close()
+        os.makedirs(self.out_dir, exist_ok=True)
+
+        results = []
+        if departments:
+            with ProcessPoolExecutor(min(self.workers, len(departments)),
+                                     mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_init_worker,
+                                     initargs=(self.db_path,)) as pool:
+                futures = {pool.submit(build_department_report, department, start, end,
+                                       self.out_dir): department
+                           for department in departments}
+                for future in as_completed(futures):
+                    results.append(future.result())
+                    if progress is not None:
+                        progress(len(results), len(departments), futures[future])
+
+        results.sort(key=lambda result: result['department'])
+        _write_csv(os.path.join(self.out_dir, 'summary.csv'),
+                   ['department', 'headcount', 'attendance_rate', 'shifts'],
+                   ((r['department'], r['headcount'], f"{r['attendance_rate']:.1f}",
+                     r['shifts']) for r in results))
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate per-department reports')
+    parser.add_argument('--db', default='employee_management.db', help='database file')
+    parser.add_argument('--from', dest='start', type=date.fromisoformat,
+                        default=date.today().replace(day=1), help='first day (YYYY-MM-DD)')
+    parser.add_argument('--to', dest='end', type=date.fromisoformat,
+                        default=date.today(), help='last day (YYYY-MM-DD)')
+    parser.add_argument('--out', default='reports', help='output directory')
+    parser.add_argument('--workers', type=int, help='worker processes (default: CPU count)')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    generator = ReportGenerator(args.db, args.out, args.workers)
+    try:
+        generator.generate(args.start, args.end,
+                           progress=lambda done, total, department:
+                           print(f'[{done}/{total}] {department}'))
+    except sqlite3.Error as e:
+        sys.exit(f'Cannot read {args.db}: {e}. Files from older versions are '
+                 'upgraded on first use, which needs write access.')
+    print(f'Reports written to {args.out} in {time.perf_counter() - started:.1f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,374 @@
+import os
+import time
+from datetime import datetime
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFrame,
+                           QDateEdit, QTableWidgetItem, QProgressBar, QMessageBox)
+from PyQt5.QtCore import QThread, QDate, pyqtSignal
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from src.database.archive import attach_archive
+from src.database.database import Database
+from src.database.attendance_matrix import (load_attendance_matrix, attendance_rates,
+                                            attendance_trend, department_rollup,
+                                            longest_absence_streaks)
+from src.reports.generator import ReportGenerator
+from src.utils.ui_utils import (create_styled_button, create_styled_combo,
+                            create_styled_table, create_styled_label,
+                            setup_table_headers)
+from src.utils.theme import set_role
+
+ALL_DEPARTMENTS = 'All Departments'
+
+# Seconds a cached (range, department) result stays fresh
+CACHE_TTL = 60
+
+# Directory next to the database that receives generated reports
+REPORTS_DIR = 'reports'
+
+# Employees listed in the longest absences table
+ABSENCE_ROWS = 10
+
+
+class AnalyticsWorker(QThread):
+    """Run the analytics queries on a private connection off the GUI thread"""
+    result_ready = pyqtSignal(object, object)  # cache key, result dict
+    load_failed = pyqtSignal(object, str)  # cache key, error message
+
+    def __init__(self, db_path, key, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.key = key
+
+    def run(self):
+        try:
+            result = self.compute()
+        except Exception as e:
+            self.load_failed.emit(self.key, str(e))
+            return
+        self.result_ready.emit(self.key, result)
+
+    def compute(self):
+        start, end, department = self.key
+        db = Database(self.db_path, readonly=True)
+        try:
+            attach_archive(db)
+            # Attendance is read once into a bitset; rates, trends and
+            # streaks are then computed on it instead of per-query
+            matrix = load_attendance_matrix(db, start, end)
+            if department:
+                matrix = matrix.select(department)
+            departments = {dept: stats for dept, stats in department_rollup(matrix).items()
+                           if stats['headcount']}
+            for dept, stats in departments.items():
+                stats['trend'] = attendance_trend(matrix, dept).slope
+
+            streaks = longest_absence_streaks(matrix)
+            rates = attendance_rates(matrix)
+            absences = []
+            # Names come with the matrix, so employees deleted meanwhile
+            # cannot leave a gap
+            for i in np.argsort(-streaks, kind='stable')[:ABSENCE_ROWS]:
+                absences.append((matrix.names[i],
+                                 matrix.departments[matrix.department_codes[i]],
+                                 float(rates[i]), int(streaks[i])))
+
+            return {
+                'departments': departments,
+                'absences': absences,
+                'headcount': db.get_headcount_trend(start, end, department),
+                'coverage': db.get_shift_coverage(start, end, department)
+            }
+        finally:
+            db.close()
+
+
+class ReportWorker(QThread):
+    """Drive the report process pool without blocking the GUI thread"""
+    progress = pyqtSignal(int, int, str)  # done, total, department
+    report_ready = pyqtSignal(object)  # list of summaries
+    report_failed = pyqtSignal(str)
+
+    def __init__(self, db_path, out_dir, start, end, departments, parent=None):
+        super().__init__(parent)
+        self.generator = ReportGenerator(db_path, out_dir)
+        self.start_date = start
+        self.end_date = end
+        self.departments = departments
+
+    def run(self):
+        try:
+            results = self.generator.generate(self.start_date, self.end_date,
+                                              self.departments, self.progress.emit)
+        except Exception as e:
+            self.report_failed.emit(str(e))
+            return
+        self.report_ready.emit(results)
+
+
+class AnalyticsTab(QWidget):
+    def __init__(self, db):
+        super().__init__()
+        self.db = db
+        self.cache = {}  # (start, end, department) -> (loaded_at, result)
+        self.worker = None
+        self.pending_key = None
+        self.report_worker = None
+        self.shown = None  # Result currently in the tables and chart
+        self.initUI()
+
+    def initUI(self):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(15)
+
+        # Filters
+        filter_layout = QHBoxLayout()
+        today = QDate.currentDate()
+
+        filter_layout.addWidget(create_styled_label('From:', font_size=12))
+        self.start_input = QDateEdit(today.addDays(-29))
+        self.start_input.setCalendarPopup(True)
+        filter_layout.addWidget(self.start_input)
+
+        filter_layout.addWidget(create_styled_label('To:', font_size=12))
+        self.end_input = QDateEdit(today)
+        self.end_input.setCalendarPopup(True)
+        filter_layout.addWidget(self.end_input)
+
+        filter_layout.addWidget(create_styled_label('Department:', font_size=12))
+        self.dept_combo = create_styled_combo()
+        self.refresh_departments()
+        filter_layout.addWidget(self.dept_combo)
+
+        load_btn = create_styled_button('Load')
+        load_btn.clicked.connect(lambda: self.load(force=True))
+        filter_layout.addWidget(load_btn)
+
+        self.report_btn = create_styled_button('Generate Reports')
+        self.report_btn.clicked.connect(self.generate_reports)
+        filter_layout.addWidget(self.report_btn)
+
+        self.report_progress = QProgressBar()
+        self.report_progress.setMaximumWidth(150)
+        self.report_progress.hide()
+        filter_layout.addWidget(self.report_progress)
+
+        self.status_label = create_styled_label('', font_size=12)
+        filter_layout.addWidget(self.status_label)
+        filter_layout.addStretch()
+        layout.addLayout(filter_layout)
+
+        # Department rates, longest absences and shift coverage side by side
+        tables_layout = QHBoxLayout()
+        self.dept_table = create_styled_table(['Department', 'Headcount',
+                                               'Attendance Rate', 'Trend'])
+        setup_table_headers(self.dept_table)
+        tables_layout.addWidget(self.dept_table)
+
+        self.absence_table = create_styled_table(['Employee', 'Department',
+                                                  'Attendance Rate', 'Longest Absence'])
+        setup_table_headers(self.absence_table)
+        tables_layout.addWidget(self.absence_table)
+
+        self.coverage_table = create_styled_table(['Shift Type', 'Shifts',
+                                                   'Days Covered'])
+        setup_table_headers(self.coverage_table)
+        tables_layout.addWidget(self.coverage_table)
+        layout.addLayout(tables_layout)
+
+        # Headcount trend chart
+        chart_frame = QFrame()
+        set_role(chart_frame, 'card')
+        chart_layout = QVBoxLayout(chart_frame)
+        chart_title = create_styled_label('Headcount Trend', font_size=14)
+        set_role(chart_title, 'section-title')
+        chart_layout.addWidget(chart_title)
+
+        self.figure = plt.figure(figsize=(8, 3))
+        self.canvas = FigureCanvas(self.figure)
+        chart_layout.addWidget(self.canvas)
+        layout.addWidget(chart_frame)
+
+        self.setLayout(layout)
+        self.load()
+
+    def current_key(self):
+        start = self.start_input.date().toPyDate()
+        end = self.end_input.date().toPyDate()
+        department = self.dept_combo.currentText()
+        if department == ALL_DEPARTMENTS:
+            department = None
+        return (start, end, department)
+
+    def refresh_data(self):
+        """Called by the auto-refresh timer; only reloads expired results"""
+        self.load()
+
+    def load(self, force=False):
+        key = self.current_key()
+        if key[1] < key[0]:
+            self.status_label.setText('Invalid date range')
+            return
+
+        now = time.monotonic()
+        # Expired results are reloaded anyway; drop them so old ranges go too
+        for stale in [k for k, (loaded_at, _) in self.cache.items()
+                      if now - loaded_at >= CACHE_TTL and k != key]:
+            del self.cache[stale]
+
+        cached = self.cache.get(key)
+        if cached and not force and now - cached[0] < CACHE_TTL:
+            # The timer asks every few seconds; only redraw a different result
+            if cached[1] is not self.shown:
+                self.show_result(cached[1])
+            return
+
+        # One query at a time; the newest request runs when the current one ends
+        if self.worker is not None and self.worker.isRunning():
+            self.pending_key = key
+            return
+
+        self.status_label.setText('Loading...')
+        worker = AnalyticsWorker(self.db.db_path, key, self)
+        worker.result_ready.connect(self.on_result_ready)
+        worker.load_failed.connect(self.on_load_failed)
+        worker.finished.connect(lambda: self.on_worker_finished(worker))
+        self.worker = worker
+        worker.start()
+
+    def on_result_ready(self, key, result):
+        self.cache[key] = (time.monotonic(), result)
+        if key == self.current_key():
+            self.show_result(result)
+            self.status_label.setText(
+                f"Updated {datetime.now().strftime('%H:%M:%S')}")
+
+    def on_load_failed(self, key, message):
+        # Not cached, so the next timer tick tries again
+        if key == self.current_key():
+            self.status_label.setText(f'Loading failed: {message}')
+
+    def on_worker_finished(self, worker):
+        worker.deleteLater()
+        if self.worker is worker:
+            self.worker = None
+        if self.pending_key is not None:
+            self.pending_key = None
+            self.load(force=True)
+
+    def stop(self):
+        """Wait for the running load and report, starting no queued load"""
+        self.pending_key = None
+        if self.worker is not None:
+            self.worker.wait()
+        # Let report files being written finish rather than leave them half done
+        if self.report_worker is not None:
+            self.report_worker.wait()
+
+    def generate_reports(self):
+        """Write the report files of the selected range and department"""
+        start, end, department = self.current_key()
+        if end < start:
+            self.status_label.setText('Invalid date range')
+            return
+        if self.report_worker is not None:
+            return
+
+        out_dir = os.path.join(os.path.dirname(os.path.abspath(self.db.db_path)),
+                               REPORTS_DIR, f'{start}_{end}')
+        departments = [department] if department else None
+        worker = ReportWorker(self.db.db_path, out_dir, start, end, departments, self)
+        worker.progress.connect(self.on_report_progress)
+        worker.report_ready.connect(lambda results: self.on_report_ready(out_dir, results))
+        worker.report_failed.connect(self.on_report_failed)
+        worker.finished.connect(lambda: self.on_report_finished(worker))
+        self.report_worker = worker
+        self.report_btn.setEnabled(False)
+        self.report_progress.setRange(0, 0)
+        self.report_progress.show()
+        self.status_label.setText('Generating reports...')
+        worker.start()
+
+    def on_report_progress(self, done, total, department):
+        self.report_progress.setRange(0, total)
+        self.report_progress.setValue(done)
+        self.status_label.setText(f'Report {done}/{total}: {department}')
+
+    def on_report_ready(self, out_dir, results):
+        self.status_label.setText(f'{len(results)} reports written')
+        QMessageBox.information(self, 'Reports',
+                                f'{len(results)} department reports written to\n{out_dir}')
+
+    def on_report_failed(self, message):
+        self.status_label.setText('Report generation failed')
+        QMessageBox.warning(self, 'Error', f'Could not generate reports: {message}')
+
+    def on_report_finished(self, worker):
+        worker.deleteLater()
+        if self.report_worker is worker:
+            self.report_worker = None
+        self.report_btn.setEnabled(True)
+        self.report_progress.hide()
+
+    def refresh_departments(self):
+        """List the departments employees currently belong to, keeping the selection"""
+        selected = self.dept_combo.currentText() or ALL_DEPARTMENTS
+        departments = [ALL_DEPARTMENTS] + self.db.get_departments()
+        if selected not in departments:
+            # Keep a department that has just lost its last employee selectable
+            departments.append(selected)
+        self.dept_combo.clear()
+        self.dept_combo.addItems(departments)
+        self.dept_combo.setCurrentText(selected)
+
+    def invalidate(self):
+        """Drop cached results after employee or shift changes"""
+        self.cache.clear()
+        self.refresh_departments()
+
+    def show_result(self, result):
+        self.shown = result
+        departments = result['departments']
+        self.dept_table.setRowCount(len(departments))
+        for i, (dept, stats) in enumerate(departments.items()):
+            self.dept_table.setItem(i, 0, QTableWidgetItem(dept))
+            self.dept_table.setItem(i, 1, QTableWidgetItem(str(stats['headcount'])))
+            self.dept_table.setItem(i, 2, QTableWidgetItem(
+                f"{stats['attendance_rate']:.1f}%"))
+            self.dept_table.setItem(i, 3, QTableWidgetItem(
+                f"{stats['trend']:+.2f} pts/day"))
+
+        absences = result['absences']
+        self.absence_table.setRowCount(len(absences))
+        for i, (name, dept, rate, streak) in enumerate(absences):
+            self.absence_table.setItem(i, 0, QTableWidgetItem(name))
+            self.absence_table.setItem(i, 1, QTableWidgetItem(dept))
+            self.absence_table.setItem(i, 2, QTableWidgetItem(f'{rate:.1f}%'))
+            self.absence_table.setItem(i, 3, QTableWidgetItem(f'{streak} days'))
+
+        totals = {}
+        for day, shift_type, count in result['coverage']:
+            shifts, days = totals.get(shift_type, (0, set()))
+            days.add(day)
+            totals[shift_type] = (shifts + count, days)
+        self.coverage_table.setRowCount(len(totals))
+        for i, (shift_type, (shifts, days)) in enumerate(sorted(totals.items())):
+            self.coverage_table.setItem(i, 0, QTableWidgetItem(shift_type))
+            self.coverage_table.setItem(i, 1, QTableWidgetItem(str(shifts)))
+            self.coverage_table.setItem(i, 2, QTableWidgetItem(str(len(days))))
+
+        self.update_chart(result['headcount'])
+
+    def update_chart(self, headcount):
+        self.figure.clear()
+        ax = self.figure.add_subplot(111)
+        if headcount:
+            dates = [day for day, _ in headcount]
+            ax.plot(dates, [count for _, count in headcount], color='#3498db')
+            ax.set_ylabel('Employees')
+            ax.spines['top'].set_visible(False)
+            ax.spines['right'].set_visible(False)
+            self.figure.autofmt_xdate()
+        self.figure.tight_layout()
+        self.canvas.draw()
@@ -1,16 +1,49 @@
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                           QMessageBox, QCheckBox, QTableWidgetItem)
-from PyQt5.QtCore import pyqtSignal, Qt
-from datetime import datetime
-from src.utils.ui_utils import (create_styled_button, create_styled_input, 
-                            create_styled_combo, create_styled_table, 
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout,
+                           QMessageBox, QCheckBox, QTableWidgetItem, QDateEdit)
+from PyQt5.QtCore import pyqtSignal, Qt, QThread, QDate
+from src.database.database import Database
+from src.utils.ui_utils import (create_styled_button, create_styled_table,
                             create_styled_label, setup_table_headers)
+from src.utils.theme import set_role
+
+# Days kept in the attendance cache
+CACHE_SIZE = 15
+
+# Days on either side of the selected date loaded in the background
+PREFETCH_DAYS = 2
+
+class AttendancePrefetcher(QThread):
+    """Load attendance for a few days on a private read-only connection"""
+    day_loaded = pyqtSignal(object, object)  # date, {employee_id: present}
+
+    def __init__(self, db_path, days, generation, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.days = days
+        self.generation = generation  # Cache generation the days were asked for
+
+    def run(self):
+        db = Database(self.db_path, readonly=True)
+        try:
+            for day in self.days:
+                attendance = db.get_attendance_by_date(day)
+                self.day_loaded.emit(day, {a[1]: bool(a[3]) for a in attendance})
+        finally:
+            db.close()
 
 class AttendanceTab(QWidget):
     def __init__(self, db):
         super().__init__()
         self.db = db
-        self.attendance_states = {}  # Store attendance states
+        self.current_date = datetime.now().date()
+        self.cache = OrderedDict()  # date -> {employee_id: present}, LRU order
+        self.cache_generation = 0  # Bumped whenever the cache is emptied
+        self.attendance_states = {}  # Saved states for the selected date
+        self.changes = {}  # Unsaved edits for the selected date
+        self.row_ids = []  # Employee id shown in each table row
+        self.prefetcher = None
         self.initUI()
 
     def initUI(self):
@@ -18,22 +51,39 @@ class AttendanceTab(QWidget):
         layout.setContentsMargins(15, 15, 15, 15)  # Reduced margins
         layout.setSpacing(15)  # Reduced spacing
 
-        # Date Display
+        # Date Navigation
         date_layout = QHBoxLayout()
-        today = datetime.now().strftime('%Y-%m-%d')
-        date_label = create_styled_label(f'Date: {today}', font_size=12)
-        date_layout.addWidget(date_label)
-        
+        date_layout.addWidget(create_styled_label('Date:', font_size=12))
+
+        prev_btn = create_styled_button('◀')
+        prev_btn.clicked.connect(lambda: self.set_date(self.current_date - timedelta(days=1)))
+        date_layout.addWidget(prev_btn)
+
+        self.date_input = QDateEdit(QDate(self.current_date))
+        self.date_input.setCalendarPopup(True)
+        self.date_input.setDisplayFormat('yyyy-MM-dd')
+        self.date_input.dateChanged.connect(
+            lambda qdate: self.set_date(qdate.toPyDate()))
+        date_layout.addWidget(self.date_input)
+
+        next_btn = create_styled_button('▶')
+        next_btn.clicked.connect(lambda: self.set_date(self.current_date + timedelta(days=1)))
+        date_layout.addWidget(next_btn)
+
+        today_btn = create_styled_button('Today')
+        today_btn.clicked.connect(lambda: self.set_date(datetime.now().date()))
+        date_layout.addWidget(today_btn)
+
         save_btn = create_styled_button('Save Attendance')
         save_btn.clicked.connect(self.save_attendance)
         date_layout.addWidget(save_btn)
         date_layout.addStretch()
-        
+
         layout.addLayout(date_layout)
 
         # Attendance List
         list_label = create_styled_label('Daily Attendance List', font_size=14)
-        list_label.setStyleSheet('font-weight: bold;')
+        set_role(list_label, 'section-title')
         layout.addWidget(list_label)
 
         self.table = create_styled_table(['ID', 'Employee Name', 'Present?'])
@@ -43,59 +93,153 @@ class AttendanceTab(QWidget):
         self.setLayout(layout)
         self.refresh_table()
 
+    def set_date(self, day):
+        """Switch the table to another date, keeping or saving pending edits"""
+        if day == self.current_date:
+            return
+        if self.changes:
+            reply = QMessageBox.question(
+                self, 'Unsaved Changes',
+                f'Save attendance changes for {self.current_date}?',
+                QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel)
+            if reply == QMessageBox.Cancel:
+                self.date_input.blockSignals(True)
+                self.date_input.setDate(QDate(self.current_date))
+                self.date_input.blockSignals(False)
+                return
+            if reply == QMessageBox.Yes:
+                self.save_attendance()
+            self.changes = {}
+
+        self.current_date = day
+        self.date_input.blockSignals(True)
+        self.date_input.setDate(QDate(day))
+        self.date_input.blockSignals(False)
+
+        # Show cached data at once; the database is consulted only on a miss
+        if day in self.cache:
+            self.cache.move_to_end(day)
+            states = self.cache[day]
+        else:
+            states = self.load_day(day)
+        self.attendance_states = dict(states)
+        self.populate_table(self.db.get_all_employees())
+        self.prefetch()
+
+    def load_day(self, day):
+        """Read attendance for one day and store it in the cache"""
+        attendance = self.db.get_attendance_by_date(day)
+        states = {a[1]: bool(a[3]) for a in attendance}
+        self.store(day, states)
+        return states
+
+    def store(self, day, states):
+        self.cache[day] = states
+        self.cache.move_to_end(day)
+        while len(self.cache) > CACHE_SIZE:
+            self.cache.popitem(last=False)
+
+    def prefetch(self):
+        """Load the neighbouring days in the background"""
+        if self.prefetcher is not None and self.prefetcher.isRunning():
+            return
+        days = [self.current_date + timedelta(days=offset)
+                for distance in range(1, PREFETCH_DAYS + 1)
+                for offset in (-distance, distance)]
+        days = [day for day in days if day not in self.cache]
+        if not days:
+            return
+        prefetcher = AttendancePrefetcher(self.db.db_path, days,
+                                          self.cache_generation, self)
+        prefetcher.day_loaded.connect(self.on_day_prefetched)
+        prefetcher.finished.connect(lambda: self.on_prefetch_finished(prefetcher))
+        self.prefetcher = prefetcher
+        prefetcher.start()
+
+    def on_day_prefetched(self, day, states):
+        # Days read before the cache was emptied may be stale, and what the
+        # tab itself loaded for the selected date is never overwritten
+        if self.sender().generation == self.cache_generation and \
+                day != self.current_date:
+            self.store(day, states)
+
+    def on_prefetch_finished(self, prefetcher):
+        prefetcher.deleteLater()
+        if self.prefetcher is prefetcher:
+            self.prefetcher = None
+
+    def stop(self):
+        """Wait for a running prefetch to finish"""
+        if self.prefetcher is not None:
+            self.prefetcher.wait()
+
+    def invalidate_cache(self):
+        """Forget every cached day, including any still being prefetched"""
+        self.cache.clear()
+        self.cache_generation += 1
+
     def refresh_table(self):
-        """Refresh the attendance table with current employees"""
-        employees = self.db.get_all_employees()
+        """Reload the selected date from the database and redraw the table
+
+        Other days may have changed too (saves, the API, check-ins), so the
+        cache is emptied and the neighbouring days are prefetched again.
+        """
+        self.invalidate_cache()
+        self.attendance_states = dict(self.load_day(self.current_date))
+        self.populate_table(self.db.get_all_employees())
+        self.prefetch()
+
+    def populate_table(self, employees):
+        # Rows, items and checkboxes are reused across refreshes; the timer
+        # repopulates every few seconds and new widgets each time add up
+        self.row_ids = [emp[0] for emp in employees]
         self.table.setRowCount(len(employees))
-        
-        today = datetime.now().date()
-        attendance = self.db.get_attendance_by_date(today)
-        
-        # Update attendance states from database
-        for a in attendance:
-            self.attendance_states[a[1]] = a[3]  # employee_id -> present status
 
         for i, emp in enumerate(employees):
-            # ID
-            self.table.setItem(i, 0, QTableWidgetItem(str(emp[0])))
-            # Name
-            self.table.setItem(i, 1, QTableWidgetItem(emp[1]))
-            
-            # Checkbox
-            checkbox = QCheckBox()
-            checkbox.setStyleSheet("""
-                QCheckBox {
-                    font-size: 12px;
-                }
-                QCheckBox::indicator {
-                    width: 16px;
-                    height: 16px;
-                }
-            """)
-            
-            # Set initial state from our stored states
-            is_checked = self.attendance_states.get(emp[0], False)
+            # ID and name
+            for column, text in ((0, str(emp[0])), (1, emp[1])):
+                item = self.table.item(i, column)
+                if item is None:
+                    self.table.setItem(i, column, QTableWidgetItem(text))
+                else:
+                    item.setText(text)
+
+            # Checkbox, connected once; the row's employee is looked up when it fires
+            checkbox = self.table.cellWidget(i, 2)
+            if checkbox is None:
+                checkbox = QCheckBox()
+                set_role(checkbox, 'check')
+                checkbox.stateChanged.connect(
+                    lambda state, row=i: self.on_checkbox_changed(self.row_ids[row], state)
+                )
+                self.table.setCellWidget(i, 2, checkbox)
+
+            # Unsaved edits take precedence over the stored state
+            is_checked = self.changes.get(emp[0], self.attendance_states.get(emp[0], False))
+            checkbox.blockSignals(True)
             checkbox.setChecked(is_checked)
-            
-            # Connect state change signal
-            checkbox.stateChanged.connect(
-                lambda state, emp_id=emp[0]: self.on_checkbox_changed(emp_id, state)
-            )
-            
-            self.table.setCellWidget(i, 2, checkbox)
+            checkbox.blockSignals(False)
 
     def on_checkbox_changed(self, employee_id, state):
-        """Handle checkbox state changes"""
-        self.attendance_states[employee_id] = (state == Qt.Checked)
+        """Track the edit only while it differs from the saved state"""
+        is_present = (state == Qt.Checked)
+        if is_present == self.attendance_states.get(employee_id, False) and \
+                employee_id in self.attendance_states:
+            self.changes.pop(employee_id, None)
+        else:
+            self.changes[employee_id] = is_present
 
     def save_attendance(self):
-        today = datetime.now().date()
-        saved_count = 0
+        if not self.changes:
+            QMessageBox.information(self, 'Success', 'No attendance changes to save.')
+            return
 
-        for employee_id, is_present in self.attendance_states.items():
-            self.db.mark_attendance(employee_id, today, is_present)
-            if is_present:
-                saved_count += 1
+        self.db.mark_attendance_bulk(self.current_date, self.changes)
+        saved_count = sum(1 for is_present in self.changes.values() if is_present)
+        changed_count = len(self.changes)
+        self.changes = {}
+        self.refresh_table()
 
-        QMessageBox.information(self, 'Success', 
-                               f'Attendance saved successfully!\n{saved_count} employees marked as present.') 
\ No newline at end of file
+        QMessageBox.information(self, 'Success',
+                               f'Attendance saved for {self.current_date}!\n'
+                               f'{changed_count} rows updated, {saved_count} marked as present.')
@@ -4,14 +4,25 @@ from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.dates import DateFormatter
+from collections import deque
 from datetime import datetime
 from src.utils.ui_utils import (create_styled_label, create_styled_table, 
                             setup_table_headers)
+from src.utils.theme import set_role
+
+# Activities shown in the Recent Activities feed
+ACTIVITY_LIMIT = 10
 
 class DashboardTab(QWidget):
     def __init__(self, db):
         super().__init__()
         self.db = db
+        # Newest first: [id, timestamp, description, formatted time]
+        self.activities = deque(maxlen=ACTIVITY_LIMIT)
+        self.last_activity_id = 0
+        self.activities_day = None  # Day the cached time strings were formatted on
+        self.chart_stats = None  # Attendance stats the chart was last drawn from
         self.initUI()
         
         # Setup auto-refresh timer (every 5 seconds)
@@ -26,7 +37,7 @@ class DashboardTab(QWidget):
 
         # Top section - Stats
         stats_frame = QFrame()
-        stats_frame.setStyleSheet('background-color: white; border-radius: 8px;')
+        set_role(stats_frame, 'card')
         stats_layout = QHBoxLayout(stats_frame)
         stats_layout.setSpacing(15)
 
@@ -42,12 +53,12 @@ class DashboardTab(QWidget):
 
         # Middle section - Chart
         chart_frame = QFrame()
-        chart_frame.setStyleSheet('background-color: white; border-radius: 8px;')
+        set_role(chart_frame, 'card')
         chart_layout = QVBoxLayout(chart_frame)
         chart_layout.setContentsMargins(10, 10, 10, 10)
 
         chart_title = create_styled_label('Attendance Overview', font_size=14)
-        chart_title.setStyleSheet('font-weight: bold;')
+        set_role(chart_title, 'section-title')
         chart_layout.addWidget(chart_title)
 
         self.figure = plt.figure(figsize=(8, 3))  # Reduced figure size
@@ -57,12 +68,12 @@ class DashboardTab(QWidget):
 
         # Bottom section - Activities
         activities_frame = QFrame()
-        activities_frame.setStyleSheet('background-color: white; border-radius: 8px;')
+        set_role(activities_frame, 'card')
         activities_layout = QVBoxLayout(activities_frame)
         activities_layout.setContentsMargins(10, 10, 10, 10)
 
         activities_title = create_styled_label('Recent Activities', font_size=14)
-        activities_title.setStyleSheet('font-weight: bold;')
+        set_role(activities_title, 'section-title')
         activities_layout.addWidget(activities_title)
 
         self.activities_table = create_styled_table(['Time', 'Activity'])
@@ -80,24 +91,18 @@ class DashboardTab(QWidget):
 
     def create_stat_widget(self, title: str, value: str) -> QFrame:
         widget = QFrame()
-        widget.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border-radius: 8px;
-                padding: 15px;
-            }
-        """)
+        set_role(widget, 'stat-card')
         layout = QVBoxLayout(widget)
         layout.setSpacing(5)
         
         # Title
         title_label = create_styled_label(title, font_size=12)
-        title_label.setStyleSheet('color: #7f8c8d;')
+        set_role(title_label, 'stat-title')
         layout.addWidget(title_label)
         
         # Value
         value_label = create_styled_label(value, font_size=18)  # Reduced font size
-        value_label.setStyleSheet('font-weight: bold; color: #2c3e50;')
+        set_role(value_label, 'stat-value')
         value_label.setObjectName('value_label')
         layout.addWidget(value_label)
         
@@ -128,41 +133,39 @@ class DashboardTab(QWidget):
         self.update_activities()
 
     def update_chart(self):
+        # Get attendance data
+        stats = self.db.get_attendance_stats()
+
+        # Redrawing is the costliest part of a refresh; skip it when the data
+        # is unchanged instead of rebuilding every artist each tick
+        if stats == self.chart_stats:
+            return
+        self.chart_stats = stats
+
         self.figure.clear()
         ax = self.figure.add_subplot(111)
 
-        # Get attendance data
-        stats = self.db.get_attendance_stats()
-        
         if not stats:
             # If no data, show empty chart
             ax.text(0.5, 0.5, 'No attendance data available', 
                    horizontalalignment='center', verticalalignment='center')
-            plt.tight_layout()
+            self.figure.tight_layout()
             self.canvas.draw()
             return
 
-        # Convert dates to datetime objects and rates to float
+        # Dates arrive as date objects; convert the counts to rates
         dates = []
         rates = []
-        for stat in stats:
-            try:
-                date_str = stat[0]
-                if date_str:  # Only process if date is not None
-                    date = datetime.strptime(date_str, '%Y-%m-%d')
-                    total = float(stat[1])
-                    present = float(stat[2])
-                    rate = (present / total * 100) if total > 0 else 0
-                    dates.append(date)
-                    rates.append(rate)
-            except (ValueError, TypeError) as e:
-                print(f"Error processing date {date_str}: {e}")
-                continue
+        for day, total, present in stats:
+            if day:  # Only process if date is not None
+                rate = (present / total * 100) if total > 0 else 0
+                dates.append(day)
+                rates.append(rate)
 
         if not dates:  # If no valid dates after processing
             ax.text(0.5, 0.5, 'No valid attendance data available', 
                    horizontalalignment='center', verticalalignment='center')
-            plt.tight_layout()
+            self.figure.tight_layout()
             self.canvas.draw()
             return
 
@@ -178,32 +181,42 @@ class DashboardTab(QWidget):
         ax.spines['right'].set_visible(False)
         
         # Format date labels
-        plt.gcf().autofmt_xdate()  # Rotate and align the tick labels
-        ax.xaxis.set_major_formatter(plt.matplotlib.dates.DateFormatter('%Y-%m-%d'))
+        self.figure.autofmt_xdate()  # Rotate and align the tick labels
+        ax.xaxis.set_major_formatter(DateFormatter('%Y-%m-%d'))
         
-        plt.tight_layout()
+        self.figure.tight_layout()
         self.canvas.draw()
 
+    def format_activity_time(self, activity_time, today):
+        # Activities from today show only the time
+        if activity_time.date() == today:
+            return activity_time.strftime('%I:%M %p')  # 12-hour format with AM/PM
+        return activity_time.strftime('%Y-%m-%d %I:%M %p')
+
     def update_activities(self):
-        activities = self.db.get_recent_activities()
-        self.activities_table.setRowCount(len(activities))
-        
-        for i, (_, description, timestamp) in enumerate(activities):
-            # Convert timestamp to datetime and format it
-            activity_time = datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S')
-            now = datetime.now()
-            
-            # If activity is from today, show only time
-            if activity_time.date() == now.date():
-                time_str = activity_time.strftime('%I:%M %p')  # 12-hour format with AM/PM
-            else:
-                # If activity is from a different day, show date and time
-                time_str = activity_time.strftime('%Y-%m-%d %I:%M %p')
-            
-            time_item = QTableWidgetItem(time_str)
-            activity_item = QTableWidgetItem(description)
-            
+        """Add activities logged since the last refresh to the top of the feed"""
+        new_activities = self.db.get_activities_since(self.last_activity_id, ACTIVITY_LIMIT)
+        today = datetime.now().date()
+        if not new_activities and today == self.activities_day:
+            return
+
+        if today != self.activities_day:
+            # "Today" moved on, so times cached without a date need one now
+            for i, activity in enumerate(self.activities):
+                activity[3] = self.format_activity_time(activity[1], today)
+                self.activities_table.item(i, 0).setText(activity[3])
+            self.activities_day = today
+
+        # Rows arrive newest first; prepend oldest first to keep that order
+        for activity_id, _, description, activity_time in reversed(new_activities):
+            self.activities.appendleft(
+                [activity_id, activity_time, description,
+                 self.format_activity_time(activity_time, today)])
+            self.activities_table.insertRow(0)
+            time_item = QTableWidgetItem(self.activities[0][3])
             time_item.setTextAlignment(Qt.AlignCenter)
-            
-            self.activities_table.setItem(i, 0, time_item)
-            self.activities_table.setItem(i, 1, activity_item) 
\ No newline at end of file
+            self.activities_table.setItem(0, 0, time_item)
+            self.activities_table.setItem(0, 1, QTableWidgetItem(description))
+        if new_activities:
+            self.last_activity_id = new_activities[0][0]
+        self.activities_table.setRowCount(len(self.activities))
@@ -0,0 +1,68 @@
+import csv
+import sys
+from typing import Dict
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from src.utils.memory import MemoryTracker
+
+# How often memory is sampled in diagnostics mode, in milliseconds
+SAMPLE_INTERVAL_MS = 60 * 1000
+
+# File the samples are appended to, one CSV row each
+DIAGNOSTICS_LOG = 'memory_diagnostics.csv'
+
+
+def count_qobjects(root: QObject) -> int:
+    """Live QObjects owned by root, root included"""
+    return len(root.findChildren(QObject)) + 1
+
+
+class MemoryMonitor(QObject):
+    """Sample RSS, the Python heap and QObject counts per tab over time
+
+    Every sample is appended to a CSV log. When a series starts growing
+    steadily (see MemoryTracker), a warning naming it and the source lines
+    with the most new allocations goes to stderr and growth_detected fires.
+    """
+    growth_detected = pyqtSignal(object)  # {series: rise over the window}
+
+    def __init__(self, pages: Dict[str, QObject], log_path: str = DIAGNOSTICS_LOG,
+                 interval_ms: int = SAMPLE_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self.pages = pages
+        self.tracker = MemoryTracker()
+        self.flagged = set()
+
+        self.log = open(log_path, 'a', newline='')
+        self.writer = csv.writer(self.log)
+        if self.log.tell() == 0:
+            self.writer.writerow(['elapsed_s', 'rss_bytes', 'heap_bytes',
+                                  *(f'qobjects_{name}' for name in pages), 'growing'])
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.sample)
+        self.timer.start(interval_ms)
+        self.sample()
+
+    def sample(self):
+        sample = self.tracker.sample({name: count_qobjects(page)
+                                      for name, page in self.pages.items()})
+        growing = self.tracker.growing()
+        self.writer.writerow([f'{sample.elapsed:.0f}', sample.rss, sample.heap,
+                              *sample.objects.values(), ' '.join(sorted(growing))])
+        self.log.flush()
+
+        # Report each series once when it starts growing
+        new = {name: rise for name, rise in growing.items() if name not in self.flagged}
+        self.flagged = set(growing)
+        if new:
+            print('Memory keeps growing: ' +
+                  ', '.join(f'{name} +{rise:,}' for name, rise in sorted(new.items())),
+                  file=sys.stderr)
+            for line in self.tracker.top_allocations():
+                print(f'  {line}', file=sys.stderr)
+            self.growth_detected.emit(new)
+
+    def stop(self):
+        self.timer.stop()
+        self.log.close()
+        self.tracker.close()
@@ -0,0 +1,182 @@
+from PyQt5.QtWidgets import QLineEdit, QListView
+from PyQt5.QtCore import (Qt, QAbstractListModel, QModelIndex, QPoint, QTimer,
+                          QEvent, pyqtSignal)
+from src.utils.theme import set_role
+
+# Employees fetched per page while the list is scrolled
+PICKER_PAGE_SIZE = 50
+
+# Milliseconds of typing pause before the search runs
+SEARCH_DELAY_MS = 150
+
+# Height of the match list in pixels
+POPUP_HEIGHT = 250
+
+class EmployeePickerModel(QAbstractListModel):
+    """Employees whose name starts with a prefix, loaded a page at a time
+
+    Views ask for more rows through canFetchMore/fetchMore as they scroll.
+    refresh() re-reads only the range already loaded and applies the
+    difference as row inserts and removals, so open views keep their place.
+    """
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.prefix = ''
+        self.rows = []  # (id, name, department), ordered like the index
+        self.has_more = True
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        employee_id, name, department = self.rows[index.row()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return name
+        if role == Qt.ToolTipRole:
+            return f'{name} ({department}, ID {employee_id})'
+        if role == Qt.UserRole:
+            return employee_id
+        return None
+
+    def last_key(self):
+        return (self.rows[-1][1], self.rows[-1][0]) if self.rows else None
+
+    def set_prefix(self, prefix: str):
+        self.beginResetModel()
+        self.prefix = prefix
+        self.rows = self.db.search_employees(prefix, limit=PICKER_PAGE_SIZE)
+        self.has_more = len(self.rows) == PICKER_PAGE_SIZE
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.has_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        rows = self.db.search_employees(self.prefix, after=self.last_key(),
+                                        limit=PICKER_PAGE_SIZE)
+        self.has_more = len(rows) == PICKER_PAGE_SIZE
+        if rows:
+            first = len(self.rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self.rows.extend(rows)
+            self.endInsertRows()
+
+    def refresh(self):
+        """Apply added, renamed and removed employees to the loaded rows"""
+        if not self.rows:
+            self.set_prefix(self.prefix)
+            return
+        # Once everything is loaded, new names past the last row belong too
+        through = self.last_key() if self.has_more else None
+        current = self.db.search_employees(self.prefix, through=through, limit=None)
+
+        keep = set(current)
+        for i in reversed(range(len(self.rows))):
+            if self.rows[i] not in keep:
+                self.beginRemoveRows(QModelIndex(), i, i)
+                del self.rows[i]
+                self.endRemoveRows()
+        # What is left is in index order too, so walk both lists together
+        for i, row in enumerate(current):
+            if i >= len(self.rows) or self.rows[i] != row:
+                self.beginInsertRows(QModelIndex(), i, i)
+                self.rows.insert(i, row)
+                self.endInsertRows()
+
+class EmployeePicker(QLineEdit):
+    """Type-ahead employee field backed by an indexed prefix search
+
+    Matches are shown in a popup list view over the lazy model. QCompleter
+    is not used because its proxy model fetches every page up front.
+    """
+    employee_selected = pyqtSignal(object)  # employee id, or None when cleared
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        set_role(self, 'input')
+        self.setPlaceholderText('Type a name...')
+        self.employee_id = None
+        self.model = EmployeePickerModel(db, self)
+
+        self.popup = QListView(self)
+        self.popup.setWindowFlags(Qt.Popup)
+        self.popup.setFocusPolicy(Qt.NoFocus)
+        self.popup.setFocusProxy(self)
+        self.popup.setEditTriggers(QListView.NoEditTriggers)
+        self.popup.setModel(self.model)
+        self.popup.clicked.connect(self.pick)
+        self.popup.installEventFilter(self)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.search)
+        self.textEdited.connect(self.on_text_edited)
+        self.model.set_prefix('')
+
+    def on_text_edited(self, text):
+        if self.employee_id is not None:
+            self.employee_id = None
+            self.employee_selected.emit(None)
+        self.search_timer.start()
+
+    def search(self):
+        self.model.set_prefix(self.text().strip())
+        if self.hasFocus():
+            self.show_popup()
+
+    def show_popup(self):
+        if not self.model.rows:
+            self.popup.hide()
+            return
+        self.popup.move(self.mapToGlobal(QPoint(0, self.height())))
+        self.popup.resize(self.width(), POPUP_HEIGHT)
+        self.popup.setCurrentIndex(self.model.index(0))
+        self.popup.show()
+
+    def pick(self, index):
+        self.popup.hide()
+        self.setText(index.data(Qt.DisplayRole))
+        self.employee_id = index.data(Qt.UserRole)
+        self.employee_selected.emit(self.employee_id)
+
+    def current_employee_id(self):
+        """The chosen employee, or None while the text is not a pick"""
+        return self.employee_id
+
+    def eventFilter(self, obj, event):
+        if obj is not self.popup or event.type() != QEvent.KeyPress:
+            return False
+        # The popup owns the keyboard: it keeps the arrow keys and forwards
+        # the rest to the line edit, as QCompleter does
+        if event.key() in (Qt.Key_Return, Qt.Key_Enter, Qt.Key_Tab):
+            if self.popup.currentIndex().isValid():
+                self.pick(self.popup.currentIndex())
+            return True
+        if event.key() == Qt.Key_Escape:
+            self.popup.hide()
+            return True
+        if event.key() in (Qt.Key_Up, Qt.Key_Down, Qt.Key_PageUp, Qt.Key_PageDown):
+            return False
+        self.event(event)
+        return True
+
+    def mousePressEvent(self, event):
+        super().mousePressEvent(event)
+        # Clicking the field lists the matches, like opening a combo box
+        self.show_popup()
+
+    def refresh(self):
+        """Pick up employee changes without rebuilding the list"""
+        self.model.refresh()
+        if self.employee_id is not None and \
+                self.model.db.get_employee_by_id(self.employee_id) is None:
+            self.clear()
+            self.employee_id = None
+            self.employee_selected.emit(None)
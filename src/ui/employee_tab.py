@@ -1,10 +1,45 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                           QRadioButton, QButtonGroup, QMessageBox, QTableWidgetItem)
+                           QRadioButton, QButtonGroup, QMessageBox, QTableWidgetItem,
+                           QAbstractItemView, QDialog, QCheckBox, QDialogButtonBox)
 from PyQt5.QtCore import pyqtSignal, QRegExp
 from PyQt5.QtGui import QRegExpValidator
 from src.utils.ui_utils import (create_styled_button, create_styled_input, 
                             create_styled_combo, create_styled_table, 
                             create_styled_label, setup_table_headers)
+from src.utils.theme import set_role
+
+DEPARTMENTS = ['HR', 'Finance', 'IT', 'Marketing', 'Operations']
+
+class BulkEditDialog(QDialog):
+    """Pick the fields to change on every selected employee"""
+    def __init__(self, count, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f'Edit {count} Employees')
+        layout = QVBoxLayout(self)
+
+        self.fields = {}
+        for field, label, choices in [('department', 'Department', DEPARTMENTS),
+                                      ('gender', 'Gender', ['Male', 'Female'])]:
+            row = QHBoxLayout()
+            checkbox = QCheckBox(f'Change {label.lower()}:')
+            combo = create_styled_combo()
+            combo.addItems(choices)
+            combo.setEnabled(False)
+            checkbox.toggled.connect(combo.setEnabled)
+            row.addWidget(checkbox)
+            row.addWidget(combo)
+            layout.addLayout(row)
+            self.fields[field] = (checkbox, combo)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def changes(self):
+        return {field: combo.currentText()
+                for field, (checkbox, combo) in self.fields.items()
+                if checkbox.isChecked()}
 
 class EmployeeTab(QWidget):
     # Signal to notify other components of employee changes
@@ -58,16 +93,7 @@ class EmployeeTab(QWidget):
         
         # Style radio buttons
         for radio in [male_radio, female_radio]:
-            radio.setStyleSheet("""
-                QRadioButton {
-                    font-size: 12px;
-                    padding: 3px;
-                }
-                QRadioButton::indicator {
-                    width: 16px;
-                    height: 16px;
-                }
-            """)
+            set_role(radio, 'radio')
         
         self.gender_group.addButton(male_radio, 1)
         self.gender_group.addButton(female_radio, 2)
@@ -87,7 +113,7 @@ class EmployeeTab(QWidget):
         dept_layout = QHBoxLayout()
         dept_layout.addWidget(create_styled_label('Department:', font_size=12))
         self.dept_input = create_styled_combo()
-        self.dept_input.addItems(['HR', 'Finance', 'IT', 'Marketing', 'Operations'])
+        self.dept_input.addItems(DEPARTMENTS)
         dept_layout.addWidget(self.dept_input)
         form_layout.addLayout(dept_layout)
 
@@ -105,23 +131,28 @@ class EmployeeTab(QWidget):
 
         # Employee List
         list_label = create_styled_label('Employee List', font_size=14)
-        list_label.setStyleSheet('font-weight: bold;')
+        set_role(list_label, 'section-title')
         layout.addWidget(list_label)
 
         self.table = create_styled_table(['ID', 'Name', 'Gender', 'Email', 'Department'])
         setup_table_headers(self.table)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
         layout.addWidget(self.table)
 
         # Action Buttons
         action_layout = QHBoxLayout()
         edit_btn = create_styled_button('Edit Selected')
         edit_btn.clicked.connect(self.edit_selected)
+        bulk_edit_btn = create_styled_button('Bulk Edit Selected')
+        bulk_edit_btn.clicked.connect(self.bulk_edit_selected)
         delete_btn = create_styled_button('Delete Selected')
         delete_btn.clicked.connect(self.delete_selected)
         refresh_btn = create_styled_button('Refresh List')
         refresh_btn.clicked.connect(self.refresh_table)
         
         action_layout.addWidget(edit_btn)
+        action_layout.addWidget(bulk_edit_btn)
         action_layout.addWidget(delete_btn)
         action_layout.addWidget(refresh_btn)
         layout.addLayout(action_layout)
@@ -184,9 +215,14 @@ class EmployeeTab(QWidget):
     def refresh_table(self):
         employees = self.db.get_all_employees()
         self.table.setRowCount(len(employees))
+        # Items are reused; the refresh timer runs this every few seconds
         for i, emp in enumerate(employees):
             for j, value in enumerate(emp):
-                self.table.setItem(i, j, QTableWidgetItem(str(value)))
+                item = self.table.item(i, j)
+                if item is None:
+                    self.table.setItem(i, j, QTableWidgetItem(str(value)))
+                elif item.text() != str(value):
+                    item.setText(str(value))
 
     def edit_selected(self):
         current_row = self.table.currentRow()
@@ -203,19 +239,54 @@ class EmployeeTab(QWidget):
         self.email_input.setText(self.table.item(current_row, 3).text())
         self.dept_input.setCurrentText(self.table.item(current_row, 4).text())
 
+    def selected_employee_ids(self):
+        """Return the IDs of all selected rows"""
+        rows = sorted(index.row() for index in self.table.selectionModel().selectedRows())
+        return [int(self.table.item(row, 0).text()) for row in rows]
+
+    def bulk_edit_selected(self):
+        employee_ids = self.selected_employee_ids()
+        if not employee_ids:
+            QMessageBox.warning(self, 'Error', 'Please select employees to edit!')
+            return
+
+        dialog = BulkEditDialog(len(employee_ids), self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        changes = dialog.changes()
+        if not changes:
+            return
+
+        updated, conflicts = self.db.update_employees_bulk(
+            [dict(changes, id=employee_id) for employee_id in employee_ids])
+        self.refresh_table()
+        self.employee_updated.emit()  # Notify other components
+
+        message = f'{updated} employee(s) updated successfully!'
+        if conflicts:
+            details = '\n'.join(f'ID {employee_id}: {reason}'
+                                for employee_id, reason in sorted(conflicts.items()))
+            QMessageBox.warning(self, 'Partially Updated',
+                                f'{message}\n\nSkipped:\n{details}')
+        else:
+            QMessageBox.information(self, 'Success', message)
+
     def delete_selected(self):
-        current_row = self.table.currentRow()
-        if current_row < 0:
+        employee_ids = self.selected_employee_ids()
+        if not employee_ids:
             QMessageBox.warning(self, 'Error', 'Please select an employee to delete!')
             return
 
-        employee_id = int(self.table.item(current_row, 0).text())
-        reply = QMessageBox.question(self, 'Confirm Delete',
-                                   'Are you sure you want to delete this employee?',
+        if len(employee_ids) == 1:
+            question = 'Are you sure you want to delete this employee?'
+        else:
+            question = f'Are you sure you want to delete {len(employee_ids)} employees?'
+        reply = QMessageBox.question(self, 'Confirm Delete', question,
                                    QMessageBox.Yes | QMessageBox.No)
         
         if reply == QMessageBox.Yes:
-            self.db.delete_employee(employee_id)
+            deleted = self.db.delete_employees(employee_ids)
             self.refresh_table()
             self.employee_updated.emit()  # Notify other components
-            QMessageBox.information(self, 'Success', 'Employee deleted successfully!') 
\ No newline at end of file
+            QMessageBox.information(self, 'Success',
+                                   f'{deleted} employee(s) deleted successfully!')
@@ -0,0 +1,115 @@
+import time
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QObject, QThread, QTimer, QEvent, pyqtSignal
+from src.database.database import Database
+from src.database.maintenance import MAINTENANCE_STEPS, Maintenance
+
+# Seconds without keyboard or mouse input before the user counts as idle
+IDLE_SECONDS = 60
+
+# Seconds between the start of completed maintenance rounds
+MAINTENANCE_INTERVAL = 15 * 60
+
+# How often the scheduler checks for idleness, in milliseconds
+CHECK_INTERVAL_MS = 5000
+
+# Events that end an idle period
+USER_INPUT_EVENTS = {QEvent.KeyPress, QEvent.MouseButtonPress, QEvent.MouseMove,
+                     QEvent.Wheel, QEvent.TouchBegin}
+
+
+class MaintenanceWorker(QThread):
+    """Run maintenance steps on a private connection off the GUI thread"""
+    step_finished = pyqtSignal(object)  # StepResult
+
+    def __init__(self, db_path, steps, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.steps = steps
+
+    def run(self):
+        # The GUI's connection has set up the schema; don't redo it every round
+        db = Database(self.db_path, setup_schema=False)
+        try:
+            maintenance = Maintenance(db, should_stop=self.isInterruptionRequested)
+            for step in self.steps:
+                if self.isInterruptionRequested():
+                    break
+                self.step_finished.emit(maintenance.run_step(step))
+        finally:
+            db.close()
+
+
+class MaintenanceScheduler(QObject):
+    """Run database maintenance while the user is idle
+
+    Watches application-wide input events; once nobody has touched the
+    keyboard or mouse for IDLE_SECONDS, the remaining steps of the current
+    round run on a worker thread. Input interrupts the running step, and
+    the round resumes at that step during the next idle period; a step cut
+    off by its own time budget simply continues in the next round.
+    """
+    step_finished = pyqtSignal(object)  # StepResult
+
+    def __init__(self, db_path, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.last_input = time.monotonic()
+        self.last_round = None  # monotonic time the last complete round ended
+        self.pending = list(MAINTENANCE_STEPS)
+        self.results = []  # StepResults of the current and previous round
+        self.worker = None
+        self.worker_started = None
+
+        QApplication.instance().installEventFilter(self)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.check_idle)
+        self.timer.start(CHECK_INTERVAL_MS)
+
+    def eventFilter(self, obj, event):
+        if event.type() in USER_INPUT_EVENTS:
+            self.last_input = time.monotonic()
+            if self.worker is not None:
+                self.worker.requestInterruption()
+        return False
+
+    def is_idle(self) -> bool:
+        return time.monotonic() - self.last_input >= IDLE_SECONDS
+
+    def check_idle(self):
+        if self.worker is not None or not self.is_idle():
+            return
+        if not self.pending:
+            if time.monotonic() - self.last_round < MAINTENANCE_INTERVAL:
+                return
+            self.pending = list(MAINTENANCE_STEPS)
+            self.results = []
+        worker = MaintenanceWorker(self.db_path, list(self.pending), self)
+        worker.step_finished.connect(self.on_step_finished)
+        worker.finished.connect(lambda: self.on_worker_finished(worker))
+        self.worker = worker
+        self.worker_started = time.monotonic()
+        worker.start()
+
+    def on_step_finished(self, result):
+        self.results.append(result)
+        # Steps the user interrupted are retried in the next idle period
+        by_user = result.status == 'interrupted' and self.last_input > self.worker_started
+        if not by_user and result.step in self.pending:
+            self.pending.remove(result.step)
+        if not self.pending:
+            self.last_round = time.monotonic()
+        self.step_finished.emit(result)
+
+    def on_worker_finished(self, worker):
+        worker.deleteLater()
+        if self.worker is worker:
+            self.worker = None
+
+    def stop(self):
+        """Interrupt any running step and wait for the worker to exit"""
+        self.timer.stop()
+        QApplication.instance().removeEventFilter(self)
+        if self.worker is not None:
+            self.worker.requestInterruption()
+            self.worker.wait()
@@ -1,14 +1,23 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                            QMessageBox, QTableWidgetItem)
 from PyQt5.QtCore import pyqtSignal
+from datetime import datetime, timedelta
 from src.utils.ui_utils import (create_styled_button, create_styled_combo, 
                             create_styled_table, create_styled_label, 
                             setup_table_headers)
+from src.utils.theme import set_role
+from src.ui.employee_picker import EmployeePicker
+
+# Shifts fetched per page of history
+PAGE_SIZE = 100
 
 class ShiftTab(QWidget):
     def __init__(self, db):
         super().__init__()
         self.db = db
+        # Oldest date shown; None once older history has been loaded
+        self.history_start = self.week_start()
+        self.last_key = None  # (assigned_date, id) of the last row shown
         self.initUI()
 
     def initUI(self):
@@ -22,9 +31,9 @@ class ShiftTab(QWidget):
 
         # Employee Selection
         employee_label = create_styled_label('Employee:', font_size=12)
-        self.employee_combo = create_styled_combo()
+        self.employee_picker = EmployeePicker(self.db)
         form_layout.addWidget(employee_label)
-        form_layout.addWidget(self.employee_combo)
+        form_layout.addWidget(self.employee_picker)
 
         # Shift Type Selection
         shift_label = create_styled_label('Shift Type:', font_size=12)
@@ -41,27 +50,29 @@ class ShiftTab(QWidget):
         layout.addLayout(form_layout)
 
         # Shift List
-        list_label = create_styled_label('Assigned Shifts', font_size=14)
-        list_label.setStyleSheet('font-weight: bold;')
-        layout.addWidget(list_label)
+        list_layout = QHBoxLayout()
+        self.list_label = create_styled_label('Assigned Shifts (This Week)', font_size=14)
+        set_role(self.list_label, 'section-title')
+        list_layout.addWidget(self.list_label)
+        list_layout.addStretch()
+        self.older_btn = create_styled_button('Load Older')
+        self.older_btn.clicked.connect(self.load_older)
+        list_layout.addWidget(self.older_btn)
+        layout.addLayout(list_layout)
 
         self.table = create_styled_table(['ID', 'Employee Name', 'Shift Type', 'Date'])
         setup_table_headers(self.table)
         layout.addWidget(self.table)
 
         self.setLayout(layout)
-        self.refresh_employee_list()
         self.refresh_table()
 
     def refresh_employee_list(self):
-        """Refresh the employee dropdown list"""
-        self.employee_combo.clear()
-        employees = self.db.get_all_employees()
-        for emp in employees:
-            self.employee_combo.addItem(emp[1], emp[0])  # name, id
+        """Apply employee changes to the picker"""
+        self.employee_picker.refresh()
 
     def assign_shift(self):
-        employee_id = self.employee_combo.currentData()
+        employee_id = self.employee_picker.current_employee_id()
         shift_type = self.shift_combo.currentText()
 
         if not employee_id:
@@ -72,10 +83,35 @@ class ShiftTab(QWidget):
         self.refresh_table()
         QMessageBox.information(self, 'Success', 'Shift assigned successfully!')
 
+    def week_start(self):
+        today = datetime.now().date()
+        return today - timedelta(days=today.weekday())
+
     def refresh_table(self):
-        """Refresh the shifts table"""
-        shifts = self.db.get_all_shifts()
-        self.table.setRowCount(len(shifts))
-        for i, shift in enumerate(shifts):
+        """Reload the shifts currently shown (this week by default)"""
+        if self.history_start is not None:
+            # The app may have stayed open past Sunday midnight
+            self.history_start = self.week_start()
+        limit = max(PAGE_SIZE, self.table.rowCount())
+        shifts = self.db.get_shifts(start=self.history_start, limit=limit)
+        self.table.setRowCount(0)
+        self.last_key = None
+        self.append_rows(shifts)
+
+    def load_older(self):
+        """Append the next page of shifts, going past the current week"""
+        self.history_start = None
+        self.list_label.setText('Assigned Shifts (History)')
+        shifts = self.db.get_shifts(after=self.last_key, limit=PAGE_SIZE)
+        self.append_rows(shifts)
+        if len(shifts) < PAGE_SIZE:
+            self.older_btn.setEnabled(False)
+
+    def append_rows(self, shifts):
+        first = self.table.rowCount()
+        self.table.setRowCount(first + len(shifts))
+        for i, shift in enumerate(shifts, first):
             for j, value in enumerate(shift):
-                self.table.setItem(i, j, QTableWidgetItem(str(value))) 
\ No newline at end of file
+                self.table.setItem(i, j, QTableWidgetItem(str(value)))
+        if shifts:
+            self.last_key = (shifts[-1][3], shifts[-1][0])
@@ -0,0 +1,139 @@
+import os
+import sys
+import time
+import tracemalloc
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional
+
+# Samples kept in memory; older ones only survive in the diagnostics log
+HISTORY_SIZE = 1000
+
+# Samples looked at when deciding whether a series keeps growing, and the
+# number of consecutive slices they are split into
+GROWTH_WINDOW = 20
+GROWTH_SEGMENTS = 4
+
+# Least total rise across the window that counts as growth, per series kind
+GROWTH_THRESHOLDS = {
+    'rss': 2 * 1024 * 1024,
+    'heap': 512 * 1024,
+    'objects': 1,
+}
+
+# Stack frames stored per traced allocation
+TRACE_FRAMES = 1
+
+
+def rss_bytes() -> int:
+    """Resident set size of this process in bytes
+
+    Where the current size is not available the peak is returned instead.
+    """
+    if sys.platform.startswith('linux'):
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD),
+                        ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t),
+                        ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t),
+                        ('PeakPagefileUsage', ctypes.c_size_t)]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        kernel32, psapi = ctypes.windll.kernel32, ctypes.windll.psapi
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        psapi.GetProcessMemoryInfo.argtypes = [wintypes.HANDLE,
+                                               ctypes.POINTER(ProcessMemoryCounters),
+                                               wintypes.DWORD]
+        psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters),
+                                   counters.cb)
+        return counters.WorkingSetSize
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class MemorySample(NamedTuple):
+    elapsed: float              # seconds since the tracker started
+    rss: int                    # bytes
+    heap: int                   # bytes allocated by Python, 0 when not traced
+    objects: Dict[str, int]     # live objects per named group, e.g. per tab
+
+
+class MemoryTracker:
+    """Keep memory samples and flag series that keep growing
+
+    The series are 'rss', 'heap' and 'objects:<name>' for every group of
+    objects counted by the caller. A series grows when the baseline of its
+    last `window` samples - the minimum of each of GROWTH_SEGMENTS slices -
+    rises from slice to slice and by GROWTH_THRESHOLDS in total. Minima
+    ignore short spikes, such as garbage waiting for the next collection.
+    """
+
+    def __init__(self, window: int = GROWTH_WINDOW, trace_heap: bool = True):
+        self.window = window
+        self.samples = deque(maxlen=HISTORY_SIZE)
+        self.started = time.monotonic()
+        # Only stop tracing on close if it was started here
+        self.owns_tracing = trace_heap and not tracemalloc.is_tracing()
+        if self.owns_tracing:
+            tracemalloc.start(TRACE_FRAMES)
+        self.baseline = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+
+    def sample(self, objects: Optional[Dict[str, int]] = None) -> MemorySample:
+        heap = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        sample = MemorySample(time.monotonic() - self.started, rss_bytes(), heap,
+                              dict(objects or {}))
+        self.samples.append(sample)
+        return sample
+
+    def series(self) -> Dict[str, List[int]]:
+        """Values of every series over the last window of samples"""
+        recent = list(self.samples)[-self.window:]
+        values = {'rss': [s.rss for s in recent]}
+        if tracemalloc.is_tracing():
+            values['heap'] = [s.heap for s in recent]
+        for name in recent[-1].objects if recent else ():
+            values[f'objects:{name}'] = [s.objects.get(name, 0) for s in recent]
+        return values
+
+    def growing(self) -> Dict[str, int]:
+        """Series that kept growing over the window, with their rise"""
+        if len(self.samples) < self.window:
+            return {}
+        size = self.window // GROWTH_SEGMENTS
+        flagged = {}
+        for name, values in self.series().items():
+            baselines = [min(values[i * size:(i + 1) * size])
+                         for i in range(GROWTH_SEGMENTS)]
+            rise = baselines[-1] - baselines[0]
+            if all(b > a for a, b in zip(baselines, baselines[1:])) and \
+                    rise >= GROWTH_THRESHOLDS[name.split(':')[0]]:
+                flagged[name] = rise
+        return flagged
+
+    def top_allocations(self, limit: int = 10) -> List[str]:
+        """Source lines whose allocations grew most since the tracker started"""
+        if self.baseline is None or not tracemalloc.is_tracing():
+            return []
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        snapshot = tracemalloc.take_snapshot().filter_traces(ignore)
+        stats = snapshot.compare_to(self.baseline.filter_traces(ignore), 'lineno')
+        return [str(stat) for stat in stats[:limit] if stat.size_diff > 0]
+
+    def close(self):
+        self.baseline = None
+        if self.owns_tracing:
+            tracemalloc.stop()
+            self.owns_tracing = False
@@ -0,0 +1,28 @@
+"""
+Row shapes and JSON encoding shared by the command line and the JSON API
+
+Imports nothing beyond the standard library, so the CLI stays fast to start.
+"""
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Field names of the rows returned by the Database getters
+EMPLOYEE_COLUMNS = ('id', 'name', 'gender', 'email', 'department', 'created_at')
+SHIFT_COLUMNS = ('id', 'employee_name', 'shift_type', 'assigned_date')
+ATTENDANCE_COLUMNS = ('id', 'employee_id', 'employee_name', 'present')
+ACTIVITY_COLUMNS = ('action_type', 'description', 'timestamp')
+STATS_COLUMNS = ('date', 'total_employees', 'present_count')
+
+# Shift types offered by the GUI, the command line and the API
+SHIFT_TYPES = ('Morning', 'Evening', 'Night')
+
+
+def as_dicts(columns: Tuple[str, ...], rows: Iterable[tuple]) -> List[Dict[str, Any]]:
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def json_default(value):
+    """json.dump default= hook writing dates and times as ISO strings"""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
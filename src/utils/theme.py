@@ -0,0 +1,117 @@
+from PyQt5.QtWidgets import QApplication, QWidget
+
+# Widgets opt into a look by setting the dynamic "role" property (see
+# set_role); one stylesheet installed on the application styles them all, so
+# Qt parses the rules once instead of once per widget.
+APP_STYLESHEET = """
+    QPushButton[role="button"] {
+        background-color: #3498db;
+        color: white;
+        border: none;
+        padding: 10px 20px;
+        font-size: 14px;
+        border-radius: 5px;
+        min-height: 40px;
+    }
+    QPushButton[role="button"]:hover {
+        background-color: #2980b9;
+    }
+    QPushButton[role="button"]:pressed {
+        background-color: #2472a4;
+    }
+
+    QLineEdit[role="input"], QComboBox[role="input"] {
+        padding: 10px;
+        font-size: 14px;
+        border: 1px solid #bdc3c7;
+        border-radius: 5px;
+        min-height: 40px;
+    }
+    QLineEdit[role="input"]:focus, QComboBox[role="input"]:focus {
+        border: 2px solid #3498db;
+    }
+
+    QTableWidget[role="table"] {
+        border: none;
+        gridline-color: #f0f0f0;
+        font-size: 14px;
+    }
+    QTableWidget[role="table"] QHeaderView::section {
+        background-color: #f8f9fa;
+        padding: 10px;
+        border: none;
+        font-weight: bold;
+    }
+    QTableWidget[role="table"]::item {
+        padding: 5px;
+    }
+
+    QFrame[role="sidebar"] {
+        background-color: #2c3e50;
+    }
+    QLabel[role="sidebar-clock"] {
+        color: white;
+        padding: 10px;
+    }
+    QPushButton[role="sidebar-button"] {
+        background-color: #2c3e50;
+        border-radius: 5px;
+        color: white;
+        font-size: 14px;
+        padding: 10px;
+        text-align: left;
+        border: none;
+    }
+    QPushButton[role="sidebar-button"]:hover {
+        background-color: #34495e;
+    }
+    QPushButton[role="sidebar-button"]:checked {
+        background-color: #3498db;
+    }
+
+    QFrame[role="card"] {
+        background-color: white;
+        border-radius: 8px;
+    }
+    QFrame[role="stat-card"], QFrame[role="stat-card"] QLabel {
+        background-color: white;
+        border-radius: 8px;
+        padding: 15px;
+    }
+    QLabel[role="stat-title"] {
+        color: #7f8c8d;
+    }
+    QLabel[role="stat-value"] {
+        font-weight: bold;
+        color: #2c3e50;
+    }
+    QLabel[role="section-title"] {
+        font-weight: bold;
+    }
+
+    QRadioButton[role="radio"] {
+        font-size: 12px;
+        padding: 3px;
+    }
+    QRadioButton[role="radio"]::indicator, QCheckBox[role="check"]::indicator {
+        width: 16px;
+        height: 16px;
+    }
+    QCheckBox[role="check"] {
+        font-size: 12px;
+    }
+"""
+
+
+def set_role(widget: QWidget, role: str) -> QWidget:
+    """Tag a widget with the theme role that styles it"""
+    widget.setProperty('role', role)
+    return widget
+
+
+def install_theme(app: QApplication = None):
+    """Install the application stylesheet once"""
+    app = app or QApplication.instance()
+    if app is not None and app.property('theme_installed') is not True:
+        app.setStyleSheet(APP_STYLESHEET)
+        app.setProperty('theme_installed', True)
@@ -0,0 +1,152 @@
+import asyncio
+import http.client
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from src.api.server import ApiServer
+from src.database.database import Database
+
+
+class ApiServerTest(unittest.TestCase):
+    """Run the API server on a temporary database and talk HTTP to it"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmp.name, 'api.db')
+        db = Database(db_path)
+        db.add_employee('Ada Lovelace', 'Female', 'ada@example.com', 'IT')
+        db.close()
+
+        self.server = ApiServer(db_path, port=0, readers=2)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.run_async(self.server.start())
+
+    def tearDown(self):
+        self.run_async(self.server.stop())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+        self.tmp.cleanup()
+
+    def run_async(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(10)
+
+    def request(self, method, path, body=None, headers=None):
+        """Return (status, headers, decoded JSON body or None)"""
+        conn = http.client.HTTPConnection('127.0.0.1', self.server.port, timeout=10)
+        try:
+            payload = body if isinstance(body, (bytes, type(None))) else json.dumps(body)
+            conn.request(method, path, payload, headers or {})
+            response = conn.getresponse()
+            data = response.read()
+            return (response.status, dict(response.getheaders()),
+                    json.loads(data) if data else None)
+        finally:
+            conn.close()
+
+    def test_stats_etag(self):
+        status, headers, stats = self.request('GET', '/stats')
+        self.assertEqual(status, 200)
+        self.assertEqual(stats['total_employees'], 1)
+        etag = headers['ETag']
+
+        status, headers, body = self.request('GET', '/stats', headers={'If-None-Match': etag})
+        self.assertEqual(status, 304)
+        self.assertIsNone(body)
+        self.assertEqual(headers['ETag'], etag)
+
+        # A write logs an activity, which changes the version
+        status, _, _ = self.request('POST', '/attendance',
+                                    {'employee_id': 1, 'present': True})
+        self.assertEqual(status, 201)
+        status, headers, stats = self.request('GET', '/stats',
+                                              headers={'If-None-Match': etag})
+        self.assertEqual(status, 200)
+        self.assertNotEqual(headers['ETag'], etag)
+        self.assertEqual(stats['attendance_rate'], 100)
+
+    def test_write(self):
+        employee = {'name': 'Alan Turing', 'gender': 'Male',
+                    'email': 'alan@example.com', 'department': 'Research'}
+        status, _, _ = self.request('POST', '/employees', employee)
+        self.assertEqual(status, 201)
+        status, _, _ = self.request('POST', '/employees', employee)
+        self.assertEqual(status, 409)
+
+        status, _, employees = self.request('GET', '/employees')
+        self.assertEqual(status, 200)
+        self.assertEqual([e['email'] for e in employees],
+                         ['ada@example.com', 'alan@example.com'])
+
+        status, _, _ = self.request('POST', '/shifts',
+                                    {'employee_id': '2', 'shift_type': 'Night'})
+        self.assertEqual(status, 201)
+        status, _, shifts = self.request('GET', '/shifts?employee_id=2')
+        self.assertEqual([s['shift_type'] for s in shifts], ['Night'])
+
+    def test_attendance_present_values(self):
+        for present, expected in ((False, False), (0, False), (1, True), (True, True)):
+            status, _, _ = self.request('POST', '/attendance',
+                                        {'employee_id': 1, 'present': present,
+                                         'date': '2024-05-01'})
+            self.assertEqual(status, 201)
+            _, _, rows = self.request('GET', '/attendance?date=2024-05-01')
+            self.assertEqual(bool(rows[0]['present']), expected)
+
+    def test_validation_errors(self):
+        cases = [
+            ('POST', '/attendance', {'employee_id': 1, 'present': 'false'}),
+            ('POST', '/attendance', {'employee_id': 1, 'present': 2}),
+            ('POST', '/attendance', {'employee_id': 'abc', 'present': True}),
+            ('POST', '/attendance', {'employee_id': 1, 'present': True, 'date': 'May 1'}),
+            ('POST', '/attendance', {'employee_id': 1}),
+            ('POST', '/shifts', {'employee_id': 'abc', 'shift_type': 'Morning'}),
+            ('POST', '/shifts', {'employee_id': True, 'shift_type': 'Morning'}),
+            ('POST', '/shifts', {'employee_id': 1.5, 'shift_type': 'Morning'}),
+            ('POST', '/shifts', {'employee_id': 1, 'shift_type': 'Siesta'}),
+            ('POST', '/employees', {'name': 'X', 'gender': 'Other',
+                                    'email': 'x@example.com', 'department': 'IT'}),
+            ('POST', '/employees', b'not json'),
+            ('GET', '/employees/99999999999999999999', None),
+            ('PUT', '/employees/99999999999999999999', {'name': 'X'}),
+            ('GET', '/shifts?employee_id=abc', None),
+            ('GET', '/attendance?date=yesterday', None),
+            ('GET', '/shifts?limit=-1', None),
+            ('GET', '/shifts?limit=0', None),
+            ('GET', '/activities?limit=-1', None),
+            ('GET', '/activities?limit=ten', None),
+        ]
+        for method, path, body in cases:
+            with self.subTest(method=method, path=path, body=body):
+                status, _, payload = self.request(method, path, body)
+                self.assertEqual(status, 400)
+                self.assertIn('error', payload)
+
+        # Nothing was written by the rejected requests
+        _, _, rows = self.request('GET', '/attendance')
+        self.assertEqual(rows, [])
+
+    def test_limit(self):
+        for _ in range(3):
+            self.request('POST', '/attendance', {'employee_id': 1, 'present': True})
+        status, _, activities = self.request('GET', '/activities?limit=2')
+        self.assertEqual(status, 200)
+        self.assertEqual(len(activities), 2)
+        status, _, activities = self.request('GET', '/activities?limit=5000')
+        self.assertEqual(status, 200)
+        self.assertEqual(len(activities), 4)
+
+    def test_unknown_employee(self):
+        status, _, _ = self.request('POST', '/attendance', {'employee_id': 42, 'present': True})
+        self.assertEqual(status, 404)
+        status, _, _ = self.request('GET', '/employees/42')
+        self.assertEqual(status, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
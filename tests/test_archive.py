@@ -0,0 +1,102 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+from src import cli
+from src.database.archive import Archiver, attach_archive
+from src.database.database import Database
+from src.reports.generator import ReportGenerator
+from tests.test_reports import read_csv
+
+START = date(2024, 3, 1)
+CUTOFF = date(2024, 3, 3)
+END = date(2024, 3, 4)
+
+
+class ArchiveTest(unittest.TestCase):
+    """Four days of history, of which the first two are archived"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'hr.db')
+        db = Database(self.db_path)
+        db.add_employee('Ada', 'Female', 'ada@example.com', 'IT')
+        db.add_employee('Bob', 'Male', 'bob@example.com', 'HR')
+        for offset in range(4):
+            db.mark_attendance_bulk(START + timedelta(days=offset), {1: True, 2: offset % 2 == 0})
+        db.cursor.execute("INSERT INTO shifts (employee_id, shift_type, assigned_date) "
+                          "VALUES (1, 'Morning', ?)", (START,))
+        db.conn.commit()
+        for day in (START, END):
+            db.clock_in(1, datetime.combine(day, datetime.min.time()) + timedelta(hours=6))
+            db.clock_out(1, datetime.combine(day, datetime.min.time()) + timedelta(hours=14))
+        db.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def archive(self):
+        db = Database(self.db_path)
+        try:
+            return Archiver(db).archive(CUTOFF)
+        finally:
+            db.close()
+
+    def test_round_trip(self):
+        moved = self.archive()
+        self.assertEqual(moved, {'attendance': 4, 'time_entries': 1, 'shifts': 1,
+                                 'activity_log': 0})
+        # Repeating the run finds nothing left to move
+        self.assertEqual(set(self.archive().values()), {0})
+
+        db = Database(self.db_path, readonly=True)
+        try:
+            self.assertEqual(db.get_employee_attendance(START, END),
+                             [(1, 'Ada', 'IT', 2, 0), (2, 'Bob', 'HR', 1, 1)])
+            self.assertIsNotNone(attach_archive(db))
+            self.assertEqual(db.get_employee_attendance(START, END),
+                             [(1, 'Ada', 'IT', 4, 0), (2, 'Bob', 'HR', 2, 2)])
+            self.assertEqual(db.get_daily_present_counts(START, END),
+                             [(START, 2), (START + timedelta(days=1), 1),
+                              (CUTOFF, 2), (END, 1)])
+            entries = db.get_time_entries(START, END)
+            self.assertEqual([(row[4], row[5].date()) for row in entries],
+                             [('Morning', START), (None, END)])
+            self.assertEqual(db.get_shift_coverage(START, END), [(START, 'Morning', 1)])
+        finally:
+            db.close()
+
+    def test_report_crosses_archive_boundary(self):
+        self.archive()
+        out_dir = os.path.join(self.tmp.name, 'reports')
+        ReportGenerator(self.db_path, out_dir, workers=1).generate(START, END)
+        daily = read_csv(os.path.join(out_dir, 'HR', 'daily_attendance.csv'))
+        self.assertEqual([row['present'] for row in daily], ['1', '0', '1', '0'])
+        summary = {row['department']: row
+                   for row in read_csv(os.path.join(out_dir, 'summary.csv'))}
+        self.assertEqual(summary['IT']['attendance_rate'], '100.0')
+        self.assertEqual(summary['IT']['shifts'], '1')
+
+    def run_cli(self, *argv):
+        out = io.StringIO()
+        with mock.patch.object(sys, 'argv', ['cli', '--db', self.db_path, '--json', *argv]), \
+                contextlib.redirect_stdout(out):
+            self.assertEqual(cli.main(), 0)
+        return json.loads(out.getvalue())
+
+    def test_cli_reads_archived_rows(self):
+        self.archive()
+        self.assertEqual(len(self.run_cli('export', 'attendance', '--format', 'json')), 8)
+        report = self.run_cli('time', 'report', '--from', START.isoformat(),
+                              '--to', END.isoformat())
+        self.assertEqual([(row['name'], row['hours']) for row in report], [('Ada', 16.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import contextlib
+import io
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from src import cli
+from src.database.database import Database
+
+# Schema and rows of a file written before dates were stored as day numbers
+LEGACY_SCHEMA = '''
+    CREATE TABLE employees (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL,
+        gender TEXT NOT NULL CHECK(gender IN ('Male', 'Female')),
+        email TEXT UNIQUE NOT NULL, department TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+    CREATE TABLE shifts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, employee_id INTEGER,
+        shift_type TEXT NOT NULL, assigned_date DATE DEFAULT CURRENT_DATE,
+        FOREIGN KEY (employee_id) REFERENCES employees (id));
+    CREATE TABLE attendance (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, employee_id INTEGER,
+        date DATE NOT NULL, present BOOLEAN NOT NULL,
+        FOREIGN KEY (employee_id) REFERENCES employees (id));
+    CREATE TABLE activity_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, action_type TEXT NOT NULL,
+        description TEXT NOT NULL, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP);
+    INSERT INTO employees (name, gender, email, department, created_at) VALUES
+        ('Carol', 'Female', 'carol@example.com', 'IT', '2024-01-02 09:00:00'),
+        ('Dave', 'Male', 'dave@example.com', 'HR', '2024-01-02 09:00:00');
+    INSERT INTO attendance (employee_id, date, present) VALUES
+        (1, '2024-05-01', 1), (2, '2024-05-01', 0);
+'''
+
+
+class CliTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'legacy.db')
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(LEGACY_SCHEMA)
+        conn.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_cli(self, *argv):
+        """Return (exit code, stdout, stderr)"""
+        out, err = io.StringIO(), io.StringIO()
+        with mock.patch.object(sys, 'argv', ['cli', '--db', self.db_path, *argv]), \
+                contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            code = cli.main()
+        return code, out.getvalue(), err.getvalue()
+
+    def test_read_upgrades_legacy_file(self):
+        code, out, _ = self.run_cli('--json', 'attendance', 'list', '--date', '2024-05-01')
+        self.assertEqual(code, 0)
+        rows = json.loads(out)
+        self.assertEqual([(r['employee_name'], r['present']) for r in rows],
+                         [('Carol', True), ('Dave', False)])
+
+        db = Database(self.db_path, readonly=True)
+        try:
+            self.assertFalse(db.needs_migration())
+        finally:
+            db.close()
+
+    def test_read_refuses_legacy_file_it_cannot_upgrade(self):
+        def readonly_only(self, db_path, readonly=False, setup_schema=True):
+            if not readonly:
+                raise sqlite3.OperationalError('attempt to write a readonly database')
+            original(self, db_path, readonly, setup_schema)
+
+        original = Database.__init__
+        with mock.patch.object(Database, '__init__', readonly_only):
+            code, out, err = self.run_cli('attendance', 'list', '--date', '2024-05-01')
+        self.assertEqual(code, 1)
+        self.assertEqual(out, '')
+        self.assertIn('upgraded', err)
+
+
+if __name__ == '__main__':
+    unittest.main()
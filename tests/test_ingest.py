@@ -0,0 +1,67 @@
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from src.database.database import Database
+from src.database.ingest import WRITE_FAILED, AttendanceIngestor, CheckInServer
+
+
+class CheckInServerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'ingest.db')
+        db = Database(self.db_path)
+        db.add_employee('Ada Lovelace', 'Female', 'ada@example.com', 'IT')
+        db.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def exchange(self, ingestor, lines):
+        """Send check-in lines to a server over TCP; return the reply lines"""
+        with CheckInServer(('127.0.0.1', 0), ingestor) as server:
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                with socket.create_connection(server.server_address, timeout=10) as conn:
+                    conn.sendall(''.join(f'{line}\n' for line in lines).encode())
+                    conn.shutdown(socket.SHUT_WR)
+                    with conn.makefile() as replies:
+                        return [reply.strip() for reply in replies]
+            finally:
+                server.shutdown()
+                thread.join()
+
+    def test_replies(self):
+        ingestor = AttendanceIngestor(self.db_path)
+        ingestor.start()
+        try:
+            replies = self.exchange(ingestor, ['1', '1', 'abc'])
+        finally:
+            ingestor.stop()
+        self.assertEqual(replies, ['OK', 'DUP', 'ERR invalid'])
+
+    def test_writer_failure_is_answered(self):
+        def fail(db, batch):
+            raise sqlite3.OperationalError('disk I/O error')
+
+        ingestor = AttendanceIngestor(self.db_path, flush_interval=0)
+        ingestor.write_batch = fail
+        # The writer thread re-raises its error once it is recorded
+        with mock.patch.object(threading, 'excepthook', lambda args: None):
+            ingestor.start()
+            try:
+                ingestor.submit(1)
+                ingestor.writer.join(10)
+                replies = self.exchange(ingestor, ['2', '3'])
+            finally:
+                ingestor.stop()
+        self.assertEqual(replies, [WRITE_FAILED, WRITE_FAILED])
+
+
+if __name__ == '__main__':
+    unittest.main()
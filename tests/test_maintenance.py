@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+
+from src.database.database import Database
+from src.database.maintenance import Maintenance
+
+
+class IntegrityCheckTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.tmp.name, 'hr.db'))
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def tables(self):
+        self.db.cursor.execute('''
+            SELECT name FROM sqlite_master
+            WHERE type = 'table' AND name NOT LIKE 'sqlite_%'
+            ORDER BY name
+        ''')
+        return [row[0] for row in self.db.cursor.fetchall()]
+
+    def test_rounds_cycle_through_tables(self):
+        tables = self.tables()
+        maintenance = Maintenance(self.db)
+        results = [maintenance.run_step('integrity_check') for _ in range(len(tables) + 1)]
+        self.assertEqual([result.detail for result in results], tables + tables[:1])
+        self.assertEqual({result.status for result in results}, {'ok'})
+
+    def test_table_too_big_for_budget_is_skipped(self):
+        for i in range(50000):
+            self.db.log_activity('test', f'entry {i}', commit=False)
+        self.db.conn.commit()
+        tables = self.tables()
+        maintenance = Maintenance(self.db)
+        # Check every table before activity_log, then leave no time at all
+        for _ in range(tables.index('activity_log')):
+            maintenance.run_step('integrity_check')
+        maintenance.budget = 0
+        skipped = maintenance.run_step('integrity_check')
+        self.assertEqual(skipped.status, 'skipped')
+        self.assertTrue(skipped.detail.startswith('activity_log:'))
+
+        # The next round moves on instead of retrying activity_log
+        maintenance.budget = 10
+        result = maintenance.run_step('integrity_check')
+        self.assertEqual((result.status, result.detail),
+                         ('ok', tables[tables.index('activity_log') + 1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import csv
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import date
+
+from src.reports.generator import ReportGenerator
+from tests.test_cli import LEGACY_SCHEMA
+
+
+def read_csv(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+class ReportGeneratorTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'legacy.db')
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(LEGACY_SCHEMA)
+        # Attendance from before the employee's record was created
+        conn.execute('''
+            INSERT INTO employees (name, gender, email, department, created_at)
+            VALUES ('Erin', 'Female', 'erin@example.com', 'IT', '2024-06-01 09:00:00')
+        ''')
+        conn.execute("INSERT INTO attendance (employee_id, date, present) "
+                     "VALUES (3, '2024-05-02', 1)")
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_legacy_file_and_rates(self):
+        out_dir = os.path.join(self.tmp.name, 'reports')
+        results = ReportGenerator(self.db_path, out_dir, workers=1).generate(
+            date(2024, 5, 1), date(2024, 5, 3))
+        self.assertEqual([r['department'] for r in results], ['HR', 'IT'])
+
+        summary = {row['department']: row
+                   for row in read_csv(os.path.join(out_dir, 'summary.csv'))}
+        daily = read_csv(os.path.join(out_dir, 'IT', 'daily_attendance.csv'))
+        self.assertEqual([row['present'] for row in daily], ['1', '1', '0'])
+        self.assertEqual([row['attendance_rate'] for row in daily], ['50.0', '50.0', '0.0'])
+        # The daily rates average to the department's rate in summary.csv
+        average = sum(float(row['attendance_rate']) for row in daily) / len(daily)
+        self.assertEqual(f'{average:.1f}', summary['IT']['attendance_rate'])
+
+
+if __name__ == '__main__':
+    unittest.main()
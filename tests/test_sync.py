@@ -0,0 +1,161 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import date
+
+from src.database.database import Database
+from src.database.sync import Synchronizer
+from tests.test_cli import LEGACY_SCHEMA
+
+DAY = date(2024, 5, 1)
+
+
+class SyncBaselineTest(unittest.TestCase):
+    """Sites upgraded from copies of one legacy file"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.legacy = os.path.join(self.tmp.name, 'legacy.db')
+        conn = sqlite3.connect(self.legacy)
+        conn.executescript(LEGACY_SCHEMA)
+        conn.close()
+        self.opened = []
+
+    def tearDown(self):
+        for db in self.opened:
+            db.close()
+        self.tmp.cleanup()
+
+    def site(self, name, new_employee=None):
+        """Copy the legacy file, optionally add an employee, and open it"""
+        path = os.path.join(self.tmp.name, f'{name}.db')
+        shutil.copy(self.legacy, path)
+        if new_employee:
+            conn = sqlite3.connect(path)
+            conn.execute('''
+                INSERT INTO employees (name, gender, email, department)
+                VALUES (?, 'Female', ?, 'IT')
+            ''', (new_employee, f'{new_employee.lower()}@example.com'))
+            conn.commit()
+            conn.close()
+        db = Database(path)
+        self.opened.append(db)
+        return db
+
+    def test_identical_copies_sync(self):
+        a, b = self.site('a'), self.site('b')
+        a.update_employees_bulk([{'id': 1, 'name': 'Carol Jones'}])
+        result = Synchronizer(b).pull(a)
+        self.assertEqual(result.applied, 1)
+        self.assertEqual(b.get_employee_by_id(1)[1], 'Carol Jones')
+
+    def test_diverged_copies_refused(self):
+        # Both added a different employee as id 3 before logging changes
+        a, b = self.site('a', 'Erin'), self.site('b', 'Frank')
+        a.update_employees_bulk([{'id': 3, 'name': 'Erin Smith'}])
+        with self.assertRaises(ValueError):
+            Synchronizer(b).pull(a)
+        self.assertEqual(b.get_employee_by_id(3)[1], 'Frank')
+
+    def test_new_site_syncs_with_legacy_copy(self):
+        a = self.site('a')
+        fresh = Database(os.path.join(self.tmp.name, 'fresh.db'))
+        self.opened.append(fresh)
+        result = Synchronizer(fresh).pull(a)
+        self.assertEqual(result.rejected, 0)
+        self.assertEqual(sorted(row[3] for row in fresh.get_all_employees()),
+                         ['carol@example.com', 'dave@example.com'])
+
+
+class SyncTest(unittest.TestCase):
+    """Two new sites, b having pulled the employees a created"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.a = Database(os.path.join(self.tmp.name, 'a.db'))
+        self.b = Database(os.path.join(self.tmp.name, 'b.db'))
+        self.a.add_employee('Ada', 'Female', 'ada@example.com', 'IT')
+        self.a.add_employee('Bob', 'Male', 'bob@example.com', 'HR')
+        Synchronizer(self.b).pull(self.a)
+
+    def tearDown(self):
+        self.a.close()
+        self.b.close()
+        self.tmp.cleanup()
+
+    def employee_id(self, db, email):
+        db.cursor.execute('SELECT id FROM employees WHERE email = ?', (email,))
+        return db.cursor.fetchone()[0]
+
+    def postdate(self, db, table, row_id, milliseconds):
+        """Make the logged change of a row look that much newer"""
+        db.cursor.execute('''
+            UPDATE sync_log SET changed_at = changed_at + ?
+            WHERE table_name = ? AND row_id = ?
+        ''', (milliseconds, table, row_id))
+        db.conn.commit()
+
+    def exchange(self):
+        return Synchronizer(self.a).pull(self.b), Synchronizer(self.b).pull(self.a)
+
+    def test_newest_change_wins(self):
+        ada_a = self.employee_id(self.a, 'ada@example.com')
+        ada_b = self.employee_id(self.b, 'ada@example.com')
+        self.a.update_employees_bulk([{'id': ada_a, 'name': 'Ada Byron'}])
+        self.b.update_employees_bulk([{'id': ada_b, 'name': 'Ada Lovelace'}])
+        self.postdate(self.b, 'employees', ada_b, 60000)
+
+        # b holds the newer change already; a takes it
+        self.assertEqual(Synchronizer(self.b).pull(self.a).stale, 1)
+        self.assertEqual(Synchronizer(self.a).pull(self.b).applied, 1)
+        self.assertEqual(self.a.get_employee_by_id(ada_a)[1], 'Ada Lovelace')
+        self.assertEqual(self.b.get_employee_by_id(ada_b)[1], 'Ada Lovelace')
+
+    def test_delete_propagates(self):
+        earlier = Synchronizer(self.a).export_changes()
+        self.a.mark_attendance_bulk(DAY, {self.employee_id(self.a, 'bob@example.com'): True})
+        Synchronizer(self.b).pull(self.a)
+        self.a.delete_employees([self.employee_id(self.a, 'bob@example.com')])
+
+        Synchronizer(self.b).pull(self.a)
+        self.assertEqual([row[3] for row in self.b.get_all_employees()], ['ada@example.com'])
+        self.assertEqual(self.b.get_attendance_by_date(DAY), [])
+        # An older delta arriving late does not bring the employee back
+        result = Synchronizer(self.b).apply_changes(earlier)
+        self.assertEqual(result.applied, 0)
+        self.assertEqual(len(self.b.get_all_employees()), 1)
+
+    def test_attendance_merge(self):
+        # Both sites mark the same employee and day before hearing of each other
+        self.a.mark_attendance_bulk(DAY, {self.employee_id(self.a, 'ada@example.com'): False})
+        ada_b = self.employee_id(self.b, 'ada@example.com')
+        self.b.mark_attendance_bulk(DAY, {ada_b: True})
+        self.b.cursor.execute('SELECT id FROM attendance')
+        self.postdate(self.b, 'attendance', self.b.cursor.fetchone()[0], 60000)
+
+        into_a, into_b = self.exchange()
+        self.assertEqual((into_a.merged, into_b.merged), (1, 1))
+        for db in (self.a, self.b):
+            self.assertEqual([(row[2], row[3]) for row in db.get_attendance_by_date(DAY)],
+                             [('Ada', True)])
+
+    def test_repeated_pulls_change_nothing(self):
+        self.a.mark_attendance_bulk(DAY, {self.employee_id(self.a, 'ada@example.com'): True})
+        first = Synchronizer(self.b).pull(self.a)
+        self.assertEqual(first.applied, 1)
+        again = Synchronizer(self.b).pull(self.a)
+        self.assertEqual((again.applied, again.stale, again.merged, again.rejected),
+                         (0, 0, 0, 0))
+
+        # Reapplying everything a ever logged is stale throughout
+        everything = Synchronizer(self.a).export_changes()
+        result = Synchronizer(self.b).apply_changes(everything)
+        self.assertEqual((result.applied, result.stale), (0, 3))
+        self.assertEqual(len(self.b.get_all_employees()), 2)
+        self.assertEqual(len(self.b.get_attendance_by_date(DAY)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
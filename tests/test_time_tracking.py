@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, time, timedelta
+
+from src.database.database import Database
+from src.database.time_tracking import compute_timesheet
+
+# A week without daylight saving changes, Monday to Sunday
+MONDAY = date(2024, 6, 3)
+SUNDAY = date(2024, 6, 9)
+
+
+def at(day: date, hour: int, minute: int = 0) -> datetime:
+    return datetime.combine(day, time(hour, minute))
+
+
+class TimesheetTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.tmp.name, 'hr.db'))
+        for name in ('Ada', 'Bob', 'Carol', 'Dan'):
+            self.db.add_employee(name, 'Female', f'{name.lower()}@example.com', 'IT')
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def work(self, employee_id: int, clock_in: datetime, clock_out: datetime = None):
+        self.assertIsNotNone(self.db.clock_in(employee_id, clock_in))
+        if clock_out is not None:
+            self.assertTrue(self.db.clock_out(employee_id, clock_out))
+
+    def assign(self, employee_id: int, shift_type: str, day: date):
+        self.db.cursor.execute('''
+            INSERT INTO shifts (employee_id, shift_type, assigned_date) VALUES (?, ?, ?)
+        ''', (employee_id, shift_type, day))
+        self.db.conn.commit()
+
+    def timesheet(self, now: datetime = None):
+        return compute_timesheet(self.db, MONDAY, SUNDAY, now or at(SUNDAY, 23))
+
+    def test_overtime(self):
+        # Nine hours on six days: 6 hours past the daily limit, 14 past the weekly one
+        for offset in range(6):
+            day = MONDAY + timedelta(days=offset)
+            self.work(1, at(day, 8), at(day, 17))
+        timesheet = self.timesheet()
+        row = timesheet.row_of(1)
+        self.assertEqual(list(timesheet.daily_hours[row]), [9.0] * 6 + [0.0])
+        self.assertEqual(timesheet.daily_overtime[row].sum(), 6.0)
+        self.assertEqual(list(timesheet.weekly_hours[row]), [54.0])
+        self.assertEqual(list(timesheet.weekly_overtime[row]), [14.0])
+
+    def test_lateness(self):
+        tuesday = MONDAY + timedelta(days=1)
+        self.assign(2, 'Morning', MONDAY)
+        self.assign(2, 'Morning', tuesday)
+        # Twenty minutes late; clocking in again for the same shift is not late again
+        self.work(2, at(MONDAY, 6, 20), at(MONDAY, 10))
+        self.work(2, at(MONDAY, 11), at(MONDAY, 14))
+        # Within the grace period
+        self.work(2, at(tuesday, 6, 4), at(tuesday, 14))
+        timesheet = self.timesheet()
+        row = timesheet.row_of(2)
+        self.assertEqual(timesheet.late_count[row], 1)
+        self.assertAlmostEqual(timesheet.late_minutes[row, 0], 20.0)
+        self.assertEqual(timesheet.late_minutes[row, 1:].sum(), 0.0)
+
+    def test_open_entry_is_not_counted(self):
+        wednesday = MONDAY + timedelta(days=2)
+        self.work(3, at(wednesday, 9))
+        timesheet = self.timesheet(now=at(wednesday, 12))
+        row = timesheet.row_of(3)
+        self.assertEqual(timesheet.open_entries[row], 1)
+        self.assertEqual(timesheet.daily_hours[row].sum(), 0.0)
+
+    def test_midnight_spanning_entry_counts_on_its_first_day(self):
+        thursday = MONDAY + timedelta(days=3)
+        self.assign(4, 'Night', thursday)
+        self.work(4, at(thursday, 22), at(thursday + timedelta(days=1), 6, 30))
+        timesheet = self.timesheet()
+        row = timesheet.row_of(4)
+        self.assertEqual(list(timesheet.daily_hours[row]), [0.0] * 3 + [8.5] + [0.0] * 3)
+        self.assertEqual(timesheet.daily_overtime[row, 3], 0.5)
+        self.assertEqual(timesheet.late_count[row], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()